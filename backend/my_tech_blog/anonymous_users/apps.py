@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AnonymousUsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'anonymous_users'
+
+    def ready(self):
+        # 访客删除时清除指纹缓存
+        from anonymous_users import signals  # noqa: F401
@@ -0,0 +1,100 @@
+import threading
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from anonymous_users.models import AnonymousUser
+from utils.lru import LRUCache, MISSING
+
+# 默认配置，可在 settings.VISITOR_RESOLVER 中覆盖
+DEFAULT_CONFIG = {
+    # 缓存的指纹数
+    'MAX_ENTRIES': 10000,
+    # 已注册访客的缓存秒数
+    'TTL': 600,
+    # 未注册指纹的缓存秒数（其他进程注册后最多这么久才能识别）
+    'NEGATIVE_TTL': 30,
+}
+
+
+class VisitorResolver:
+    """浏览器指纹到访客 id 的解析服务，进程内 LRU 缓存，未注册的指纹也会短暂缓存"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self._cache = LRUCache(config['MAX_ENTRIES'], config['TTL'])
+        self._stats_lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def _count(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] += 1
+
+    def resolve(self, fingerprint: Optional[str]) -> Optional[int]:
+        """
+        解析访客 id
+        :param fingerprint: 浏览器指纹
+        :return: 访客 id，未注册时返回 None
+        """
+        if not fingerprint:
+            return None
+
+        visitor_id = self._cache.get(fingerprint)
+        if visitor_id is not MISSING:
+            self._count('hits')
+            return visitor_id
+
+        self._count('misses')
+        visitor_id = AnonymousUser.objects.filter(
+            browser_fingerprint=fingerprint
+        ).values_list('id', flat=True).first()
+        ttl = self.config['TTL'] if visitor_id else self.config['NEGATIVE_TTL']
+        self._cache.set(fingerprint, visitor_id, ttl)
+        return visitor_id
+
+    def invalidate(self, fingerprint: str) -> None:
+        """
+        访客注册或删除后清除缓存
+        :param fingerprint: 浏览器指纹
+        :return: None
+        """
+        self._cache.delete(fingerprint)
+        self._count('invalidations')
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        当前进程的命中统计
+        :return: dict
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hitRate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['entries'] = len(self._cache)
+        return stats
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_visitor_resolver() -> VisitorResolver:
+    """
+    获取按 settings.VISITOR_RESOLVER 创建的全局实例
+    :return: VisitorResolver
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = VisitorResolver({**DEFAULT_CONFIG, **getattr(settings, 'VISITOR_RESOLVER', {})})
+    return _instance
+
+
+def resolve_visitor_id(request) -> Optional[int]:
+    """
+    按请求头 X-Fingerprint 解析访客 id
+    :param request: Request
+    :return: 访客 id，缺少指纹或未注册时返回 None
+    """
+    return get_visitor_resolver().resolve(request.headers.get('X-Fingerprint', None))
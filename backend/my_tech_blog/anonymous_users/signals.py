@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from anonymous_users.models import AnonymousUser
+from anonymous_users.resolver import get_visitor_resolver
+
+
+@receiver(post_delete, sender=AnonymousUser)
+def forget_deleted_visitor(sender, instance: AnonymousUser, **kwargs):
+    """访客被删除后清除指纹缓存，避免继续用已删除的 id 写记录"""
+    get_visitor_resolver().invalidate(instance.browser_fingerprint)
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from anonymous_users.models import AnonymousUser
+from anonymous_users.resolver import get_visitor_resolver
 
 
 class RegisterAnonymousView(APIView):
@@ -35,6 +36,8 @@ class RegisterAnonymousView(APIView):
         # 创建访客
         anonymous_user = AnonymousUser.objects.create(browser_fingerprint=fingerprint, nickname=nickname)
         anonymous_user.save()
+        # 清除该指纹“未注册”的缓存
+        get_visitor_resolver().invalidate(fingerprint)
         return Response({'detail': '创建成功！'}, status=status.HTTP_200_OK)
 
 
@@ -42,6 +45,8 @@ class GetAnonymousUserView(APIView):
     """获取访客信息视图"""
 
     permission_classes = [permissions.AllowAny]
+    # 访客注册后立即查询，读主库避免从库延迟
+    use_replica = False
 
     def get(self, request, *args, **kwargs):
         """
@@ -0,0 +1,184 @@
+"""
+同步（WSGI）与异步（ASGI）公共读接口的吞吐量对比
+
+在进程内直接调用项目的 WSGI / ASGI application，不经过网络和 HTTP 服务器，只比较请求处理模型：
+- WSGI：固定数量的工作线程（相当于 gunicorn 的 --threads），其余并发请求等待工作线程
+- ASGI：所有请求都是事件循环中的协程，数据库查询在线程中执行，并发数受 ASYNC_VIEWS 限制
+
+本机数据库的查询延迟远小于线上 MySQL，可以用 --db-latency 给每条 SQL 加上固定延迟模拟网络往返。
+
+用法（在 backend/my_tech_blog 目录下）：
+    python benchmarks/async_read_path.py --concurrency 200 --requests 2000 --db-latency 5
+    python benchmarks/async_read_path.py --sync-path /api/posts/hot/ --async-path /api/async/posts/hot/
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_tech_blog.settings')
+
+
+def _split(path: str) -> Tuple[str, str]:
+    """拆分路径和查询字符串"""
+    path, _, query = path.partition('?')
+    return path, query
+
+
+def run_wsgi(application, path: str, total: int, concurrency: int, threads: int) -> Tuple[float, List[float], int]:
+    """
+    concurrency 个客户端调用 WSGI application，同时只有 threads 个请求在处理，其余等待工作线程
+    :return: (总耗时, 每个请求的延迟, 非 200 响应数)
+    """
+    path, query = _split(path)
+    workers = threading.Semaphore(threads)
+
+    def request(_) -> Tuple[float, bool]:
+        started = time.perf_counter()
+        environ = {
+            'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+            'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(), 'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True, 'wsgi.multiprocess': False, 'wsgi.run_once': False,
+        }
+        status = []
+        with workers:
+            body = application(environ, lambda s, headers, exc_info=None: status.append(s))
+            b''.join(body)
+            if hasattr(body, 'close'):
+                body.close()
+        # 延迟包含等待工作线程的时间
+        return time.perf_counter() - started, status[0].startswith('200')
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(request, range(total)))
+    elapsed = time.perf_counter() - started
+    return elapsed, [latency for latency, _ in results], sum(1 for _, ok in results if not ok)
+
+
+def run_asgi(application, path: str, total: int, concurrency: int) -> Tuple[float, List[float], int]:
+    """
+    用 concurrency 个协程调用 ASGI application
+    :return: (总耗时, 每个请求的延迟, 非 200 响应数)
+    """
+    path, query = _split(path)
+
+    async def request() -> Tuple[float, bool]:
+        started = time.perf_counter()
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': query.encode(),
+            'headers': [(b'host', b'localhost')], 'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+        }
+        messages = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+        status = []
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            # 客户端不断开，直到响应发送完毕后被取消
+            await asyncio.Future()
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+
+        await application(scope, receive, send)
+        return time.perf_counter() - started, status[0] == 200
+
+    async def main() -> List[Tuple[float, bool]]:
+        queue = list(range(total))
+        results = []
+
+        async def worker():
+            while queue:
+                queue.pop()
+                results.append(await request())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return results
+
+    started = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - started
+    return elapsed, [latency for latency, _ in results], sum(1 for _, ok in results if not ok)
+
+
+def summary(name: str, elapsed: float, latencies: List[float], errors: int) -> Dict[str, str]:
+    """汇总一组结果"""
+    latencies = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        return latencies[min(int(len(latencies) * p), len(latencies) - 1)] * 1000
+
+    return {
+        'mode': name,
+        'req/s': f'{len(latencies) / elapsed:.1f}',
+        'mean ms': f'{statistics.mean(latencies) * 1000:.1f}',
+        'p50 ms': f'{percentile(0.5):.1f}',
+        'p99 ms': f'{percentile(0.99):.1f}',
+        'errors': str(errors),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sync-path', default='/api/posts/list/?page=1&size=10&status=published')
+    parser.add_argument('--async-path', default='/api/async/posts/list/?page=1&size=10&status=published')
+    parser.add_argument('--requests', type=int, default=1000, help='每种模式的请求总数')
+    parser.add_argument('--concurrency', type=int, default=200, help='并发客户端数')
+    parser.add_argument('--threads', type=int, default=8, help='WSGI 工作线程数')
+    parser.add_argument('--db-latency', type=float, default=0.0, help='每条 SQL 额外的延迟（毫秒）')
+    parser.add_argument('--cache', action='store_true', help='启用响应缓存（默认关闭，测量数据库路径）')
+    args = parser.parse_args()
+
+    import django
+    from django.conf import settings
+
+    if not args.cache:
+        settings.RESPONSE_CACHE = {**getattr(settings, 'RESPONSE_CACHE', {}), 'BACKEND': 'none'}
+    settings.ALLOWED_HOSTS = ['*']
+    django.setup()
+
+    from django.core.asgi import get_asgi_application
+    from django.core.wsgi import get_wsgi_application
+    from django.db.backends.signals import connection_created
+
+    if args.db_latency > 0:
+        delay = args.db_latency / 1000
+
+        def slow_execute(execute, sql, params, many, context):
+            time.sleep(delay)
+            return execute(sql, params, many, context)
+
+        def install(sender, connection, **kwargs):
+            connection.execute_wrappers.append(slow_execute)
+
+        connection_created.connect(install, weak=False)
+
+    rows = [
+        summary(f'wsgi ({args.threads} threads)', *run_wsgi(
+            get_wsgi_application(), args.sync_path, args.requests, args.concurrency, args.threads
+        )),
+        summary(f'asgi ({args.concurrency} tasks)', *run_asgi(
+            get_asgi_application(), args.async_path, args.requests, args.concurrency
+        )),
+    ]
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(row[column]) for row in rows)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(row[column].ljust(widths[column]) for column in columns))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+响应编码的微基准：DRF 原生 JSONRenderer（改造前的 ApiRenderer）、基于 orjson 的 ApiRenderer 与 MessagePackRenderer
+
+负载按接口的实际返回构造，不访问数据库：
+- list：文章列表一页（序列化器的输出，时间已是字符串）
+- dashboard：仪表盘统计、流量统计与 30 天 / 12 周 / 12 个月图表数据，包含 datetime 与 Decimal
+
+用法（在 backend/my_tech_blog 目录下）：
+    python benchmarks/renderers.py
+    python benchmarks/renderers.py --page-size 100 --number 2000
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'my_tech_blog.settings')
+
+
+def list_payload(size: int) -> Dict[str, Any]:
+    """文章列表接口的返回数据"""
+    now = datetime(2025, 6, 1, 8, 30, tzinfo=timezone.utc)
+    return {
+        'total': 1000,
+        'pages': 1000 // size,
+        'list': [
+            {
+                'id': 1000 - i,
+                'title': f'MySQL 索引优化实践（第 {i} 篇）',
+                'author': 1,
+                'excerpt': '本文介绍联合索引的最左前缀原则、覆盖索引与索引下推，并结合慢查询日志分析常见的索引失效场景。' * 3,
+                'status': 'published',
+                'created_time': (now - timedelta(days=i)).strftime('%Y-%m-%d %H:%M:%S'),
+                'published_time': (now - timedelta(days=i, minutes=i)).isoformat().replace('+00:00', 'Z'),
+                'category': '数据库',
+                'tags': ['MySQL', '索引', '性能优化'][: i % 3 + 1],
+                'views': 1234 + i * 7,
+                'stars': 56 + i,
+                'comments': i % 9,
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def dashboard_payload() -> Dict[str, Any]:
+    """仪表盘统计、流量统计与图表数据"""
+    today = date(2025, 6, 1)
+    days = [today - timedelta(days=i) for i in range(29, -1, -1)]
+    return {
+        'statistics': {'total': 128, 'views': 98765, 'published': 120, 'comments': 2345, 'stars': 3456},
+        'traffic': {
+            'todayViews': 321, 'todayTrend': Decimal('12.50'), 'weekViews': 2100, 'weekTrend': Decimal('-3.20'),
+            'monthViews': 9800, 'monthTrend': Decimal('8.00'), 'totalViews': 98765,
+            'todayVisitors': 150, 'todayVisitorsTrend': 4.7, 'updatedAt': datetime(2025, 6, 1, 8, 30, tzinfo=timezone.utc),
+        },
+        'chartData': {
+            'day': {'dates': [f'{day.month}/{day.day}' for day in days], 'values': [300 + i * 5 for i in range(30)]},
+            'week': {'dates': [f'第{i}周' for i in range(1, 13)], 'values': [2000 + i * 50 for i in range(12)]},
+            'month': {'dates': [f'{i}月' for i in range(1, 13)], 'values': [9000 + i * 300 for i in range(12)]},
+            'raw': [{'date': day, 'views': 300 + i * 5} for i, day in enumerate(days)],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--page-size', type=int, default=20, help='列表负载的文章数')
+    parser.add_argument('--number', type=int, default=5000, help='每组测量的编码次数')
+    parser.add_argument('--repeat', type=int, default=5, help='测量组数，取最快一组')
+    args = parser.parse_args()
+
+    import django
+
+    django.setup()
+
+    from rest_framework.renderers import JSONRenderer
+    from rest_framework.response import Response
+
+    from utils.renderers import ApiRenderer, MessagePackRenderer, envelope
+
+    baseline = JSONRenderer()
+
+    def drf_render(data, accepted_media_type=None, renderer_context=None):
+        """改造前的 ApiRenderer：封装外层字典后交给 DRF 的 JSONRenderer"""
+        return baseline.render(envelope(data, 200), accepted_media_type, renderer_context)
+
+    encoders = [
+        ('drf json', drf_render),
+        ('orjson', ApiRenderer().render),
+        ('msgpack', MessagePackRenderer().render),
+    ]
+    context = {'response': Response(status=200)}
+    payloads = {f'list ({args.page_size})': list_payload(args.page_size), 'dashboard': dashboard_payload()}
+
+    rows: List[Dict[str, str]] = []
+    for payload_name, payload in payloads.items():
+        base_us = None
+        for encoder_name, render in encoders:
+            size = len(render(payload, None, context))
+            best = min(timeit.repeat(
+                lambda: render(payload, None, context), number=args.number, repeat=args.repeat
+            )) / args.number * 1e6
+            base_us = base_us or best
+            rows.append({
+                'payload': payload_name, 'encoder': encoder_name, 'us/op': f'{best:.1f}',
+                'speedup': f'{base_us / best:.2f}x', 'bytes': str(size),
+            })
+
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(row[column]) for row in rows)) for column in columns}
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(row[column].ljust(widths[column]) for column in columns))
+
+
+if __name__ == '__main__':
+    main()
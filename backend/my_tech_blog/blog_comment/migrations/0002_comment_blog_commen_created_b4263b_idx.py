@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('anonymous_users', '0001_initial'),
+        ('blog_comment', '0001_initial'),
+        ('blog_post', '0004_post_blog_post_p_created_d1d322_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['created_time', 'id'], name='blog_commen_created_b4263b_idx'),
+        ),
+    ]
@@ -19,6 +19,8 @@ class Comment(models.Model):
         verbose_name_plural = "评论"
         # 评论按时间正序排列
         ordering = ['created_time']
+        # 游标分页按 (created_time, id) 定位
+        indexes = [models.Index(fields=['created_time', 'id'])]
 
     def __str__(self):
         return f'Comment by {self.author} on {self.post.title}'
\ No newline at end of file
@@ -4,10 +4,12 @@ from rest_framework import permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from anonymous_users.models import AnonymousUser
+from anonymous_users.resolver import resolve_visitor_id
 from blog_comment.models import Comment
 from blog_post.models import Post
 from my_tech_blog import SensitiveWordCheckInstance
+from utils.pagination import MAX_PAGE_SIZE, KeysetPaginator, InvalidCursor
+from utils.response_cache import cache_response
 
 
 class CommentPostView(APIView):
@@ -34,20 +36,19 @@ class CommentPostView(APIView):
             return Response({'detail': '评论违规！出现违禁词！'}, status=status.HTTP_400_BAD_REQUEST)
 
         # 查询文章
-        post = Post.objects.filter(id=post_id).first()
-        if not post:
+        if not Post.objects.filter(id=post_id).exists():
             return Response({'detail': '文章不存在！'}, status=status.HTTP_400_BAD_REQUEST)
 
         # 查询访客
-        anonymous_user = AnonymousUser.objects.filter(browser_fingerprint=fingerprint).first()
-        if not anonymous_user:
+        visitor_id = resolve_visitor_id(request)
+        if not visitor_id:
             return Response({'detail': '访客不存在！'}, status=status.HTTP_400_BAD_REQUEST)
 
-        comment = Comment.objects.filter(post=post, author=anonymous_user)
+        comment = Comment.objects.filter(post_id=post_id, author_id=visitor_id)
         if comment.exists():
            return Response({'detail': '不能重复评论！'}, status=status.HTTP_400_BAD_REQUEST)
 
-        new_comment = Comment.objects.create(post=post, author=anonymous_user, content=content)
+        new_comment = Comment.objects.create(post_id=post_id, author_id=visitor_id, content=content)
         new_comment.save()
 
         return Response({'detail': '评论成功！'}, status=status.HTTP_200_OK)
@@ -58,9 +59,11 @@ class CommentListView(APIView):
 
     permission_classes = [permissions.AllowAny]
 
+    @cache_response('comments')
     def get(self, request, *args, **kwargs):
         """
         获取评论的列表
+        传入 cursor 参数（首页为空值）时使用游标分页，返回 next 游标，total=estimate 时返回估算总数
         :param request: Request
         :param args: Arguments
         :param kwargs: Kwargs
@@ -72,8 +75,24 @@ class CommentListView(APIView):
             size = int(request.GET.get('size', 10))
         except ValueError:
             return Response({'detail': '参数错误！'}, status=status.HTTP_400_BAD_REQUEST)
+        if size < 1:
+            return Response({'detail': 'size 需大于 0'}, status=status.HTTP_400_BAD_REQUEST)
+        size = min(size, MAX_PAGE_SIZE)
+
+        comment = Comment.objects.select_related('author')
+
+        # 游标模式：按 (created_time, id) 翻页，不计算精确总数
+        if 'cursor' in request.GET:
+            paginator = KeysetPaginator(comment, size, descending=False)
+            try:
+                items, next_cursor = paginator.page(request.GET.get('cursor'))
+            except InvalidCursor:
+                return Response({'detail': 'cursor 无效'}, status=status.HTTP_400_BAD_REQUEST)
+            return Response(
+                paginator.response_data(self._serialize(items), next_cursor, request.GET.get('total', '')),
+                status=status.HTTP_200_OK
+            )
 
-        comment = Comment.objects.all()
         # 处理页
         paginator = Paginator(comment, size)
         try:
@@ -81,13 +100,21 @@ class CommentListView(APIView):
         except EmptyPage:
             comments = paginator.page(paginator.num_pages)
 
+        return Response({
+            'total': paginator.count,
+            'list': self._serialize(comments)
+        }, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _serialize(comments):
+        """
+        格式化评论数据（作者已通过 select_related 取出）
+        :param comments: Iterable[Comment]
+        :return: list
+        """
         data = []
         for c in comments:
             item = model_to_dict(c)
-            item['author'] = model_to_dict(AnonymousUser.objects.get(id=item['author']))
+            item['author'] = model_to_dict(c.author)
             data.append(item)
-
-        return Response({
-            'total': comment.count(),
-            'list': data
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        return data
\ No newline at end of file
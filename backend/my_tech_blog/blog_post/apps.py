@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class BlogPostConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog_post'
+
+    def ready(self):
+        # 注册文章、评论等写路径上的信号
+        from blog_post import signals  # noqa: F401
@@ -0,0 +1,11 @@
+from django.urls import path
+from blog_post import async_views
+
+# 公共读接口的异步版本，需以 ASGI 方式部署才能并发处理
+urlpatterns = [
+    path('list/', async_views.AsyncPostListView.as_view(), name='async-list'),
+    path('hot/', async_views.AsyncPostHotListView.as_view(), name='async-hot'),
+    path('detail/', async_views.AsyncPostDetailView.as_view(), name='async-detail'),
+    path('category/list/', async_views.AsyncCategoryListView.as_view(), name='async-category-list'),
+    path('tags/', async_views.AsyncTagListView.as_view(), name='async-tags'),
+]
@@ -0,0 +1,254 @@
+import math
+from typing import Any, Awaitable, Callable, List, Tuple
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
+
+from blog_post.models import Category, Post, Tag
+from blog_post.related import related_posts
+from blog_post.serializers import LIST_FIELDS, PostListSerializer, parse_fields, post_list_queryset
+from blog_post.views import PostDetailView
+from blog_search.indexer import matching_post_ids
+from utils.async_limit import bounded
+from utils.conditional import etag_for_data, not_modified, set_validators
+from utils.db.routing import replica_may_be_stale
+from utils.lru import MISSING
+from utils.pagination import MAX_PAGE_SIZE
+from utils.renderers import api_response
+from utils.response_cache import get_response_cache
+
+# (响应数据, HTTP 状态码)
+Result = Tuple[Any, int]
+
+
+async def _cache_call(func: Callable, *args):
+    """进程内 LRU 直接调用；共享缓存有网络 IO，放到线程中执行"""
+    if get_response_cache().config['BACKEND'] == 'lru':
+        return func(*args)
+    return await sync_to_async(func)(*args)
+
+
+async def cached_json(request, namespaces: List[str], build: Callable[[], Awaitable[Result]],
+                      conditional: bool = True) -> HttpResponse:
+    """
+    cache_response 的异步版本：命中缓存时不访问数据库，conditional 为 True 时处理 ETag 条件请求
+    :param request: HttpRequest
+    :param namespaces: 命名空间
+    :param build: 生成 (数据, 状态码) 的协程函数
+    :param conditional: 是否处理 ETag 条件请求
+    :return: HttpResponse
+    """
+    cache = get_response_cache()
+    key = None
+    if cache.enabled:
+        key = await _cache_call(cache.make_key, request, namespaces)
+        cached = await _cache_call(cache.get, key)
+        if cached is not MISSING:
+            return _respond(request, *cached)
+
+    data, status_code = await build()
+    if status_code != status.HTTP_200_OK:
+        return api_response(data, status_code)
+    etag = etag_for_data(data) if conditional else None
+    if key and not replica_may_be_stale():
+        await _cache_call(cache.set, key, (data, etag))
+    return _respond(request, data, etag)
+
+
+def _respond(request, data: Any, etag) -> HttpResponse:
+    """按数据与 ETag 构造响应"""
+    if etag:
+        unchanged = not_modified(request, etag)
+        if unchanged is not None:
+            return unchanged
+    response = api_response(data)
+    if etag:
+        set_validators(response, etag)
+    return response
+
+
+class AsyncPostListView(View):
+    """文章列表视图（异步）"""
+
+    # 公开只读接口，读从库（见 utils.db.middleware）
+    use_replica = True
+
+    @bounded
+    async def get(self, request):
+        """
+        根据页数和页码获取文章列表，参数与返回格式同 PostListView（不支持游标分页）
+        :param request: HttpRequest
+        :return: HttpResponse
+        """
+        return await cached_json(request, ['posts'], lambda: self._list(request))
+
+    @staticmethod
+    async def _list(request) -> Result:
+        try:
+            page = int(request.GET.get('page', 1))
+            size = int(request.GET.get('size', 10))
+        except ValueError:
+            return {'detail': 'page/size 需为整数'}, status.HTTP_400_BAD_REQUEST
+        if size < 1:
+            return {'detail': 'size 需大于 0'}, status.HTTP_400_BAD_REQUEST
+        size = min(size, MAX_PAGE_SIZE)
+
+        try:
+            fields = parse_fields(request.GET.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return {'detail': f'未知字段：{e}'}, status.HTTP_400_BAD_REQUEST
+
+        posts = Post.objects.all()
+        keyword = request.GET.get('keyword', '')
+        if keyword:
+            # 只分词并构造子查询，不访问数据库
+            post_ids = matching_post_ids(keyword)
+            posts = posts.filter(title__icontains=keyword) if post_ids is None else posts.filter(id__in=post_ids)
+
+        status_param = request.GET.get('status', '')
+        if status_param in dict(Post.STATUS_CHOICES):
+            posts = posts.filter(status=status_param)
+
+        # 与 Paginator 一致：页码越界时返回最后一页
+        total = await posts.acount()
+        pages = max(math.ceil(total / size), 1)
+        if not 1 <= page <= pages:
+            page = pages
+        queryset = post_list_queryset(posts, fields)[(page - 1) * size:page * size]
+        items = [post async for post in queryset]
+
+        data = PostListSerializer(items, many=True, fields=fields).data
+        return {'total': total, 'pages': pages, 'list': data}, status.HTTP_200_OK
+
+
+class AsyncPostHotListView(View):
+    """热度榜单视图（异步）"""
+
+    # 公开只读接口，读从库（见 utils.db.middleware）
+    use_replica = True
+
+    @bounded
+    async def get(self, request):
+        """
+        获取热度榜单前10，返回格式同 PostHotListView
+        :param request: HttpRequest
+        :return: HttpResponse
+        """
+        return await cached_json(request, ['posts'], lambda: self._hot(request))
+
+    @staticmethod
+    async def _hot(request) -> Result:
+        try:
+            fields = parse_fields(request.GET.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return {'detail': f'未知字段：{e}'}, status.HTTP_400_BAD_REQUEST
+
+        queryset = post_list_queryset(Post.objects.filter(status='published'), fields).order_by('-hot_score')[:10]
+        items = [post async for post in queryset]
+        return {'list': PostListSerializer(items, many=True, fields=fields).data}, status.HTTP_200_OK
+
+
+class AsyncPostDetailView(View):
+    """文章详细内容（异步）"""
+
+    # 公开只读接口，读从库（见 utils.db.middleware）
+    use_replica = True
+
+    @bounded
+    async def get(self, request):
+        """
+        根据文章 id 获取文章详情并记录访客浏览，参数与返回格式同 PostDetailView
+        :param request: HttpRequest
+        :return: HttpResponse
+        """
+        try:
+            post_id = int(request.GET.get('id', ''))
+        except ValueError:
+            return api_response({'detail': 'id 需为整数'}, status.HTTP_400_BAD_REQUEST)
+
+        # 访客解析可能查询数据库，计数器在关闭缓冲或缓冲区写满时同步写库，都放到线程中执行
+        await sync_to_async(PostDetailView.record_view)(request, post_id)
+
+        row = await PostDetailView.validator_queryset(post_id).afirst()
+        validators = PostDetailView.validators_from_row(request, post_id, row)
+        if validators:
+            unchanged = not_modified(request, *validators)
+            if unchanged is not None:
+                return unchanged
+
+        response = await cached_json(request, [f'post:{post_id}'], lambda: self._detail(request, post_id),
+                                     conditional=False)
+        if validators and response.status_code == status.HTTP_200_OK:
+            set_validators(response, *validators)
+        return response
+
+    @staticmethod
+    async def _detail(request, post_id: int) -> Result:
+        try:
+            fields = PostDetailView.detail_fields(request)
+        except ValueError as e:
+            return {'detail': f'未知字段：{e}'}, status.HTTP_400_BAD_REQUEST
+
+        post = await post_list_queryset(Post.objects.filter(id=post_id), fields).afirst()
+        if not post:
+            return {'detail': '文章不存在！'}, status.HTTP_200_OK
+
+        data = PostListSerializer(post, fields=fields).data
+        if 'related' in fields:
+            data['related'] = await sync_to_async(related_posts)(post_id)
+        return {'data': data}, status.HTTP_200_OK
+
+
+class AsyncCategoryListView(View):
+    """分类列表视图（异步）"""
+
+    # 公开只读接口，读从库（见 utils.db.middleware）
+    use_replica = True
+
+    @bounded
+    async def get(self, request):
+        """
+        获取所有分类，返回格式同 CategoryListView
+        :param request: HttpRequest
+        :return: HttpResponse
+        """
+        return await cached_json(request, ['categories'], self._categories)
+
+    @staticmethod
+    async def _categories() -> Result:
+        data = []
+        async for item in Category.objects.values('id', 'name', 'description', 'published_count', 'draft_count'):
+            item['count'] = item['published_count'] + item['draft_count']
+            data.append(item)
+        return {'list': data}, status.HTTP_200_OK
+
+
+class AsyncTagListView(View):
+    """标签列表视图（异步）"""
+
+    # 公开只读接口，读从库（见 utils.db.middleware）
+    use_replica = True
+
+    @bounded
+    async def get(self, request):
+        """
+        获取标签及其文章数，返回格式同 TagListView
+        :param request: HttpRequest
+        :return: HttpResponse
+        """
+        return await cached_json(request, ['tags'], lambda: self._tags(request))
+
+    @staticmethod
+    async def _tags(request) -> Result:
+        try:
+            limit = int(request.GET['limit']) if request.GET.get('limit') else None
+        except ValueError:
+            return {'detail': 'limit 需为整数'}, status.HTTP_400_BAD_REQUEST
+
+        tags = Tag.objects.filter(post_count__gt=0).order_by('-post_count', 'name').values('id', 'name', 'post_count')
+        if limit:
+            tags = tags[:limit]
+        data = [{'id': tag['id'], 'name': tag['name'], 'count': tag['post_count']} async for tag in tags]
+        return {'list': data}, status.HTTP_200_OK
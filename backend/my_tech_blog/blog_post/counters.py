@@ -0,0 +1,237 @@
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Count, F, Q, Subquery, Sum
+
+from blog_comment.models import Comment
+from blog_post.models import AuthorStatistics, Category, Post
+from utils.db.routing import primary
+
+# 文章状态对应的分类计数字段
+CATEGORY_COUNT_FIELDS = {
+    'published': 'published_count',
+    'draft': 'draft_count',
+}
+
+# 计数器关心的文章字段
+TRACKED_FIELDS = ('category_id', 'status', 'author_id')
+
+# 作者统计的计数字段
+AUTHOR_COUNTER_FIELDS = ('total_posts', 'published_posts', 'views', 'stars', 'comments')
+
+
+def loaded_state(post: Post) -> Optional[Dict[str, object]]:
+    """
+    获取文章保存前在数据库中的状态
+    优先使用加载时记录的值，字段被延迟加载时回查数据库
+    :param post: Post
+    :return: dict | None（新文章）
+    """
+    if post._state.adding or post.pk is None:
+        return None
+    state = getattr(post, '_loaded_state', {})
+    if all(field in state for field in TRACKED_FIELDS):
+        return {field: state[field] for field in TRACKED_FIELDS}
+    return Post.objects.filter(pk=post.pk).values(*TRACKED_FIELDS).first()
+
+
+def remember_state(post: Post) -> None:
+    """
+    保存后刷新记录的状态，供同一实例再次保存时使用
+    :param post: Post
+    :return: None
+    """
+    state = getattr(post, '_loaded_state', {})
+    state.update({field: getattr(post, field) for field in TRACKED_FIELDS})
+    post._loaded_state = state
+
+
+def _category_key(state: Optional[Dict[str, object]]) -> Optional[Tuple[int, str]]:
+    """(分类 id, 状态)，无分类时返回 None"""
+    if not state or not state.get('category_id') or state.get('status') not in CATEGORY_COUNT_FIELDS:
+        return None
+    return state['category_id'], state['status']
+
+
+def apply_category_delta(category_id: int, status: str, delta: int) -> None:
+    """
+    调整分类下某状态的文章数
+    :param category_id: 分类 id
+    :param status: 文章状态
+    :param delta: 变化量
+    :return: None
+    """
+    field = CATEGORY_COUNT_FIELDS[status]
+    Category.objects.filter(id=category_id).update(**{field: F(field) + delta})
+
+
+def update_category_counts(before: Optional[Dict[str, object]], after: Optional[Dict[str, object]]) -> None:
+    """
+    根据文章保存/删除前后的 (分类, 状态) 调整计数
+    :param before: 变更前状态，新建时为 None
+    :param after: 变更后状态，删除时为 None
+    :return: None
+    """
+    old_key, new_key = _category_key(before), _category_key(after)
+    if old_key == new_key:
+        return
+    if old_key:
+        apply_category_delta(*old_key, -1)
+    if new_key:
+        apply_category_delta(*new_key, 1)
+
+
+def reconcile_category_counts() -> int:
+    """
+    按文章表重算所有分类的计数，修复漂移
+    :return: 被修正的分类数
+    """
+    actual = {
+        row['category']: row
+        for row in Post.objects.filter(category__isnull=False).order_by().values('category').annotate(
+            published=Count('id', filter=Q(status='published')),
+            draft=Count('id', filter=Q(status='draft')),
+        )
+    }
+
+    fixed = []
+    for category in Category.objects.only('id', 'published_count', 'draft_count'):
+        row = actual.get(category.id, {})
+        published, draft = row.get('published', 0), row.get('draft', 0)
+        if (category.published_count, category.draft_count) != (published, draft):
+            category.published_count, category.draft_count = published, draft
+            fixed.append(category)
+
+    Category.objects.bulk_update(fixed, ['published_count', 'draft_count'])
+    return len(fixed)
+
+
+def _published(state: Optional[Dict[str, object]]) -> int:
+    """状态为已发布时返回 1"""
+    return int(bool(state) and state.get('status') == 'published')
+
+
+def recount_author(author_id: int) -> AuthorStatistics:
+    """
+    按文章表和评论表完整统计一位作者，并写入统计行
+    :param author_id: 作者 id
+    :return: AuthorStatistics
+    """
+    # 统计结果要写回，从主库读取（读统计的仪表盘请求可能读从库）
+    with primary():
+        row = Post.objects.filter(author_id=author_id).aggregate(
+            total_posts=Count('id'),
+            published_posts=Count('id', filter=Q(status='published')),
+            views=Sum('views', default=0),
+            stars=Sum('stars', default=0),
+        )
+        row['comments'] = Comment.objects.filter(post__author_id=author_id).count()
+        statistics = AuthorStatistics(author_id=author_id, **row)
+        AuthorStatistics.objects.bulk_create(
+            [statistics], update_conflicts=True, unique_fields=['author'], update_fields=AUTHOR_COUNTER_FIELDS
+        )
+    return statistics
+
+
+def apply_author_delta(author_id: Optional[int], create: bool = False, **deltas: int) -> None:
+    """
+    调整作者统计
+    统计行不存在时：create=True 则完整统计一次（此时本次变化已写库，统计结果已包含它），
+    否则跳过，由读取方补算（删除作者时级联删除文章，不能再为其创建统计行）
+    :param author_id: 作者 id
+    :param create: 统计行不存在时是否创建
+    :param deltas: 字段变化量
+    :return: None
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not author_id or not deltas:
+        return
+    updated = AuthorStatistics.objects.filter(author_id=author_id).update(
+        **{field: F(field) + delta for field, delta in deltas.items()}
+    )
+    if not updated and create:
+        recount_author(author_id)
+
+
+def apply_post_author_delta(post_id: int, **deltas: int) -> None:
+    """
+    按文章调整其作者的统计（作者 id 用子查询获取，只执行一条 UPDATE）
+    :param post_id: 文章 id
+    :param deltas: 字段变化量
+    :return: None
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    AuthorStatistics.objects.filter(
+        author_id=Subquery(Post.objects.filter(id=post_id).values('author_id')[:1])
+    ).update(**{field: F(field) + delta for field, delta in deltas.items()})
+
+
+def update_author_counts(before: Optional[Dict[str, object]], after: Optional[Dict[str, object]], post: Post) -> None:
+    """
+    根据文章保存/删除前后的 (作者, 状态) 调整作者统计
+    文章删除时其评论先被级联删除，评论数由评论信号扣减，这里不再处理
+    :param before: 变更前状态，新建时为 None
+    :param after: 变更后状态，删除时为 None
+    :param post: Post
+    :return: None
+    """
+    old_author = before.get('author_id') if before else None
+    new_author = after.get('author_id') if after else None
+
+    if old_author == new_author:
+        apply_author_delta(new_author, published_posts=_published(after) - _published(before))
+        return
+
+    # 新建、删除或更换作者：文章的全部计数从旧作者转到新作者
+    comments = Comment.objects.filter(post_id=post.pk).count() if old_author and new_author else 0
+    apply_author_delta(
+        old_author, total_posts=-1, published_posts=-_published(before),
+        views=-post.views, stars=-post.stars, comments=-comments,
+    )
+    apply_author_delta(
+        new_author, create=True, total_posts=1, published_posts=_published(after),
+        views=post.views, stars=post.stars, comments=comments,
+    )
+
+
+def check_author_counts(fix: bool = False) -> List[Tuple[int, str, int, int]]:
+    """
+    按文章表和评论表重算所有作者统计，找出不一致的计数
+    :param fix: 是否写回正确的值
+    :return: [(作者 id, 字段, 当前值, 正确值)]
+    """
+    actual = {
+        row.pop('author'): row
+        for row in Post.objects.order_by().values('author').annotate(
+            total_posts=Count('id'),
+            published_posts=Count('id', filter=Q(status='published')),
+            views=Sum('views', default=0),
+            stars=Sum('stars', default=0),
+        )
+    }
+    comment_counts = dict(
+        Comment.objects.order_by().values('post__author').annotate(count=Count('id')).values_list('post__author', 'count')
+    )
+    stored = {statistics.author_id: statistics for statistics in AuthorStatistics.objects.all()}
+
+    mismatches, fixed = [], []
+    for author_id in set(actual) | set(stored):
+        expected = {**dict.fromkeys(AUTHOR_COUNTER_FIELDS, 0), **actual.get(author_id, {})}
+        expected['comments'] = comment_counts.get(author_id, 0)
+        statistics = stored.get(author_id) or AuthorStatistics(author_id=author_id)
+        diff = [
+            (author_id, field, getattr(statistics, field), expected[field])
+            for field in AUTHOR_COUNTER_FIELDS if getattr(statistics, field) != expected[field]
+        ]
+        if diff or author_id not in stored:
+            mismatches.extend(diff)
+            for field in AUTHOR_COUNTER_FIELDS:
+                setattr(statistics, field, expected[field])
+            fixed.append(statistics)
+
+    if fix and fixed:
+        AuthorStatistics.objects.bulk_create(
+            fixed, update_conflicts=True, unique_fields=['author'], update_fields=AUTHOR_COUNTER_FIELDS
+        )
+    return sorted(mismatches)
@@ -0,0 +1,85 @@
+import csv
+import json
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, Optional
+
+from blog_post.models import PostLikeRecord, PostViewRecord
+from blog_post.traffic import day_start
+
+# 可导出的记录：(模型, 时间字段)
+EXPORT_KINDS = {
+    'views': (PostViewRecord, 'viewed_at'),
+    'likes': (PostLikeRecord, 'liked_at'),
+}
+
+# 导出格式对应的 Content-Type
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+# 导出列
+EXPORT_COLUMNS = ('id', 'post_id', 'visitor_id', 'time')
+
+
+def iter_records(kind: str, start: Optional[date] = None, end: Optional[date] = None,
+                 post_id: Optional[int] = None, after: int = 0, limit: Optional[int] = None,
+                 chunk_size: int = 2000) -> Iterator[Dict[str, Any]]:
+    """
+    按 id 升序逐批读取浏览/点赞记录
+    每批都是一次 id > 上一批最后 id 的查询，数据库驱动不会一次缓冲整个结果集，内存占用与导出总量无关；
+    导出中断时用已收到的最后一个 id 作为 after 即可续传
+    :param kind: views / likes
+    :param start: 起始日期（包含）
+    :param end: 结束日期（包含）
+    :param post_id: 只导出某篇文章
+    :param after: 只导出 id 大于它的记录
+    :param limit: 最多导出条数
+    :param chunk_size: 每批读取条数
+    :return: 记录字典的迭代器
+    """
+    model, time_field = EXPORT_KINDS[kind]
+    queryset = model.objects.all()
+    if start:
+        queryset = queryset.filter(**{f'{time_field}__gte': day_start(start)})
+    if end:
+        queryset = queryset.filter(**{f'{time_field}__lt': day_start(end + timedelta(days=1))})
+    if post_id:
+        queryset = queryset.filter(post_id=post_id)
+    queryset = queryset.order_by('id').values_list('id', 'post_id', 'visitor_id', time_field)
+
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        rows = list(queryset.filter(id__gt=after)[:size])
+        for record_id, record_post_id, visitor_id, time in rows:
+            yield {'id': record_id, 'post_id': record_post_id, 'visitor_id': visitor_id, 'time': time.isoformat()}
+        if len(rows) < size:
+            return
+        after = rows[-1][0]
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+class _LineBuffer:
+    """csv.writer 的写入目标，直接返回写入的行"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def render_records(records: Iterator[Dict[str, Any]], export_format: str) -> Iterator[str]:
+    """
+    把记录逐行编码为 CSV 或 NDJSON
+    :param records: 记录迭代器
+    :param export_format: csv / ndjson
+    :return: 文本行的迭代器
+    """
+    if export_format == 'csv':
+        writer = csv.writer(_LineBuffer())
+        yield writer.writerow(EXPORT_COLUMNS)
+        for record in records:
+            yield writer.writerow([record[column] for column in EXPORT_COLUMNS])
+    else:
+        for record in records:
+            yield json.dumps(record, ensure_ascii=False) + '\n'
@@ -0,0 +1,198 @@
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import F, Max, Value
+from django.db.models.functions import Coalesce, Floor
+from django.http import HttpResponse
+from django.utils import feedgenerator
+
+from blog_post.models import Post
+from utils.conditional import make_etag, not_modified, set_validators
+from utils.db.routing import replica_may_be_stale
+from utils.lru import MISSING
+from utils.response_cache import LocMemBackend, ResponseCache, get_response_cache
+
+# 默认配置，可在 settings.FEEDS 中覆盖
+DEFAULT_CONFIG = {
+    # 前端站点地址，站点地图和订阅中的文章链接以它为前缀
+    'SITE_URL': 'http://localhost:5173',
+    # 前端文章页路径
+    'POST_PATH': '/article?id={id}',
+    'TITLE': 'My Tech Blog',
+    'DESCRIPTION': '',
+    # 订阅输出的最新文章数
+    'FEED_SIZE': 20,
+    # 每个站点地图分片按文章 id 划分的区间大小（协议上限 50000 条）
+    'SITEMAP_SHARD_SIZE': 10000,
+    # 文档缓存秒数，文章变化时通过命名空间版本号立即失效（只对共享缓存生效，见 document_ttl）
+    'CACHE_TTL': 86400,
+}
+
+SITEMAP_CONTENT_TYPE = 'application/xml; charset=utf-8'
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+# 订阅格式：(生成器, Content-Type)
+FEED_FORMATS = {
+    'rss': (feedgenerator.Rss201rev2Feed, 'application/rss+xml; charset=utf-8'),
+    'atom': (feedgenerator.Atom1Feed, 'application/atom+xml; charset=utf-8'),
+}
+
+# (文档, 最后修改时间)
+Document = Tuple[bytes, Optional[datetime]]
+
+
+def get_config() -> Dict[str, Any]:
+    """
+    读取 settings.FEEDS 覆盖后的配置
+    :return: dict
+    """
+    return {**DEFAULT_CONFIG, **getattr(settings, 'FEEDS', {})}
+
+
+def site_url(path: str) -> str:
+    """前端站点上的完整地址"""
+    return get_config()['SITE_URL'].rstrip('/') + path
+
+
+def post_url(post_id: int) -> str:
+    """文章页的完整地址"""
+    return site_url(get_config()['POST_PATH'].format(id=post_id))
+
+
+def shard_of(post_id: int) -> int:
+    """文章所在的站点地图分片"""
+    return post_id // get_config()['SITEMAP_SHARD_SIZE']
+
+
+def feed_namespaces(post_id: int) -> List[str]:
+    """
+    已发布文章新增、修改、下线或删除后需要失效的命名空间：订阅、站点地图索引和文章所在分片
+    :param post_id: 文章 id
+    :return: 命名空间列表
+    """
+    return ['feeds', 'sitemap', f'sitemap:{shard_of(post_id)}']
+
+
+def _published():
+    return Post.objects.filter(status='published')
+
+
+def _w3c(value: datetime) -> str:
+    """站点地图使用的 W3C 时间格式"""
+    return value.isoformat(timespec='seconds')
+
+
+def build_sitemap_index(shard_url: Callable[[int], str]) -> Document:
+    """
+    生成站点地图索引：按 id 区间分组，每个有已发布文章的分片一条，lastmod 为分片内最后更新时间
+    :param shard_url: 由分片序号得到分片地址
+    :return: (文档, 最后修改时间)
+    """
+    size = get_config()['SITEMAP_SHARD_SIZE']
+    shards = _published().annotate(shard=Floor(F('id') / Value(size))).values('shard').annotate(
+        lastmod=Max('updated_time')
+    ).order_by('shard')
+
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<sitemapindex xmlns="{SITEMAP_NS}">']
+    last_modified = None
+    for row in shards:
+        location = escape(shard_url(int(row['shard'])))
+        lines.append(f'<sitemap><loc>{location}</loc><lastmod>{_w3c(row["lastmod"])}</lastmod></sitemap>')
+        last_modified = max(filter(None, (last_modified, row['lastmod'])))
+    lines.append('</sitemapindex>')
+    return '\n'.join(lines).encode('utf-8'), last_modified
+
+
+def build_sitemap(shard: int) -> Document:
+    """
+    生成一个站点地图分片，按 id 区间读取，只读取 id 和更新时间两列
+    :param shard: 分片序号
+    :return: (文档, 最后修改时间)
+    """
+    size = get_config()['SITEMAP_SHARD_SIZE']
+    rows = _published().filter(id__gte=shard * size, id__lt=(shard + 1) * size).order_by('id').values_list(
+        'id', 'updated_time'
+    )
+
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>', f'<urlset xmlns="{SITEMAP_NS}">']
+    last_modified = None
+    for post_id, updated_time in rows.iterator():
+        lines.append(f'<url><loc>{escape(post_url(post_id))}</loc><lastmod>{_w3c(updated_time)}</lastmod></url>')
+        last_modified = max(filter(None, (last_modified, updated_time)))
+    lines.append('</urlset>')
+    return '\n'.join(lines).encode('utf-8'), last_modified
+
+
+def build_feed(feed_format: str, feed_url: str) -> Document:
+    """
+    生成最新文章的 RSS / Atom 订阅（只读取摘要，不读取正文列）
+    :param feed_format: rss / atom
+    :param feed_url: 订阅自身的地址
+    :return: (文档, 最后修改时间)
+    """
+    config = get_config()
+    feed_cls, _ = FEED_FORMATS[feed_format]
+    posts = _published().select_related('category').only(
+        'id', 'title', 'excerpt', 'created_time', 'published_time', 'updated_time', 'category__name'
+    ).annotate(
+        publish_time=Coalesce('published_time', 'created_time')
+    ).order_by('-publish_time', '-id')[:config['FEED_SIZE']]
+
+    feed = feed_cls(
+        title=config['TITLE'], link=site_url('/'), description=config['DESCRIPTION'] or config['TITLE'],
+        language='zh-cn', feed_url=feed_url,
+    )
+    last_modified = None
+    for post in posts:
+        link = post_url(post.id)
+        feed.add_item(
+            title=post.title, link=link, description=post.excerpt, unique_id=link,
+            pubdate=post.publish_time, updateddate=post.updated_time,
+            categories=[post.category.name] if post.category else None,
+        )
+        last_modified = max(filter(None, (last_modified, post.updated_time)))
+    return feed.writeString('utf-8').encode('utf-8'), last_modified
+
+
+def document_ttl(cache: ResponseCache) -> int:
+    """
+    文档缓存秒数
+    进程内 LRU 的命名空间版本号只在本进程递增，其他工作进程和管理命令（如 import_posts）的写入无法让它失效，
+    此时不超过响应缓存的 TTL；共享缓存（django 后端）的版本号全局可见，才使用 CACHE_TTL
+    :param cache: 响应缓存
+    :return: 秒数
+    """
+    ttl = get_config()['CACHE_TTL']
+    if cache.backend.name == LocMemBackend.name:
+        return min(ttl, cache.config['TTL'])
+    return ttl
+
+
+def document_response(request, namespaces: Iterable[str], build: Callable[[], Document],
+                      content_type: str) -> HttpResponse:
+    """
+    返回缓存的 XML 文档，未命中时生成并缓存；支持 If-None-Match / If-Modified-Since
+    缓存键包含命名空间版本号，文章变化时版本号递增，文档在下次请求时重新生成
+    :param request: Request
+    :param namespaces: 文档所属的命名空间
+    :param build: 生成文档的函数
+    :param content_type: Content-Type
+    :return: HttpResponse
+    """
+    cache = get_response_cache()
+    key = cache.make_key(request, list(namespaces)) if cache.enabled else None
+    cached = cache.get(key) if key else MISSING
+    if cached is MISSING:
+        body, last_modified = build()
+        cached = (body, make_etag(body.decode('utf-8')), last_modified)
+        if key and not replica_may_be_stale():
+            cache.set(key, cached, document_ttl(cache))
+
+    body, etag, last_modified = cached
+    response = not_modified(request, etag, last_modified)
+    if response is None:
+        response = HttpResponse(body, content_type=content_type)
+        set_validators(response, etag, last_modified)
+    return response
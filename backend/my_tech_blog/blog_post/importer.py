@@ -0,0 +1,219 @@
+import hashlib
+import re
+from datetime import datetime, time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from blog_post.models import Category, Post, Tag
+from blog_post.ranking import compute_hot_score, refresh_hot_score
+from blog_post.rendering import RENDERED_FIELDS, apply_rendering
+from blog_post.tags import clean_tag_names, resolve_names
+
+# --- 包裹的 front matter
+FRONT_MATTER = re.compile(r'\A---[ \t]*\r?\n(.*?)\r?\n(?:---|\.\.\.)[ \t]*(?:\r?\n|\Z)', re.S)
+# 正文中的一级标题，front matter 没有 title 时作为标题
+HEADING = re.compile(r'^#[ \t]+(.+?)[ \t#]*$', re.M)
+
+# 更新已导入文章时写回的字段（bulk_update 不处理 auto_now，修改时间由导入时显式设置）
+UPDATE_FIELDS = (
+    'title', 'content_markdown', 'status', 'category', 'created_time', 'published_time', 'updated_time',
+    'source_hash', *RENDERED_FIELDS,
+)
+
+
+class ImportItem(NamedTuple):
+    """一篇待导入的文章"""
+
+    source_key: str
+    source_hash: str
+    title: str
+    content_markdown: str
+    category: Optional[str]
+    tags: List[str]
+    status: str
+    created_time: Optional[datetime]
+
+
+def _parse_scalar(raw: str) -> str:
+    """去掉引号"""
+    raw = raw.strip()
+    if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in '\'"':
+        return raw[1:-1]
+    return raw
+
+
+def parse_front_matter(text: str) -> Tuple[Dict[str, Any], str]:
+    """
+    解析 Markdown 开头的 front matter（key: value，支持 [a, b] 和 - a 两种列表写法）
+    :param text: 文件内容
+    :return: (元数据, 正文)
+    """
+    text = text.lstrip('\ufeff')
+    match = FRONT_MATTER.match(text)
+    if not match:
+        return {}, text
+
+    meta: Dict[str, Any] = {}
+    key = None
+    for line in match.group(1).splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if stripped.startswith('- ') and key:
+            if not isinstance(meta.get(key), list):
+                meta[key] = []
+            meta[key].append(_parse_scalar(stripped[2:]))
+            continue
+        if ':' not in line:
+            continue
+        key, value = line.split(':', 1)
+        key, value = key.strip().lower(), value.strip()
+        if value.startswith('[') and value.endswith(']'):
+            meta[key] = [_parse_scalar(item) for item in value[1:-1].split(',') if item.strip()]
+        else:
+            meta[key] = _parse_scalar(value)
+    return meta, text[match.end():]
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    """解析日期或日期时间，无时区时按当前时区处理"""
+    if not value:
+        return None
+    value = str(value)
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'无法解析日期: {value}')
+        parsed = datetime.combine(day, time.min)
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+def _parse_tags(value: Any) -> List[str]:
+    """标签可以是列表或逗号分隔的字符串"""
+    if isinstance(value, str):
+        value = re.split(r'[,，]', value)
+    return clean_tag_names(value or ())
+
+
+def load_item(path: Path, root: Path, default_status: str = 'draft') -> ImportItem:
+    """
+    读取一个 Markdown 文件
+    :param path: 文件路径
+    :param root: 导入目录，来源键为相对它的路径
+    :param default_status: front matter 未指定状态时使用的状态
+    :return: ImportItem
+    :raise ValueError: 文件无法解析
+    """
+    raw = path.read_bytes()
+    try:
+        text = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        raise ValueError('文件不是 UTF-8 编码')
+    meta, body = parse_front_matter(text)
+
+    title = meta.get('title')
+    if not title:
+        heading = HEADING.search(body)
+        title = heading.group(1) if heading else path.stem
+
+    category = meta.get('category') or meta.get('categories') or None
+    if isinstance(category, list):
+        category = category[0] if category else None
+
+    status = meta.get('status', default_status)
+    if str(meta.get('draft', '')).lower() in ('true', 'yes', '1'):
+        status = 'draft'
+    if status not in dict(Post.STATUS_CHOICES):
+        raise ValueError(f'未知状态: {status}')
+
+    return ImportItem(
+        source_key=path.relative_to(root).as_posix(),
+        source_hash=hashlib.sha256(raw).hexdigest(),
+        title=str(title)[:200],
+        content_markdown=body,
+        category=category,
+        tags=_parse_tags(meta.get('tags')),
+        status=status,
+        created_time=_parse_time(meta.get('date')),
+    )
+
+
+def import_batch(items: List[ImportItem], author_id: int) -> Dict[str, Any]:
+    """
+    在一个事务中导入一批文章：未导入过的批量插入，来源哈希变化的批量更新，其余跳过
+    批量写入不触发信号，热度在此补算，索引、分类与标签计数和作者统计由调用方重算
+    :param items: 待导入的文章
+    :param author_id: 新文章的作者 id
+    :return: {'created': [...], 'updated': [...], 'skipped': int}
+    """
+    keys = [item.source_key for item in items]
+    with transaction.atomic():
+        existing = {
+            row['source_key']: row
+            for row in Post.objects.filter(source_key__in=keys).values(
+                'id', 'source_key', 'source_hash', 'created_time', 'published_time'
+            )
+        }
+        pending = [
+            item for item in items
+            if item.source_key not in existing or existing[item.source_key]['source_hash'] != item.source_hash
+        ]
+        result = {'created': [], 'updated': [], 'skipped': len(items) - len(pending)}
+        if not pending:
+            return result
+
+        category_ids = resolve_names(Category, (item.category for item in pending if item.category))
+        tag_ids = resolve_names(Tag, (tag for item in pending for tag in item.tags))
+
+        now = timezone.now()
+        new_posts, changed_posts = [], []
+        for item in pending:
+            row = existing.get(item.source_key)
+            created_time = item.created_time or (row['created_time'] if row else now)
+            published_time = row['published_time'] if row else None
+            if item.status == 'published' and not published_time:
+                published_time = item.created_time or now
+            post = Post(
+                id=row['id'] if row else None,
+                author_id=author_id,
+                title=item.title,
+                content_markdown=item.content_markdown,
+                status=item.status,
+                category_id=category_ids.get(item.category),
+                created_time=created_time,
+                published_time=published_time,
+                updated_time=now,
+                source_key=item.source_key,
+                source_hash=item.source_hash,
+            )
+            apply_rendering(post, force=True)
+            if row:
+                changed_posts.append(post)
+            else:
+                post.hot_score = compute_hot_score(0, 0, 0, published_time or created_time)
+                new_posts.append(post)
+
+        Post.objects.bulk_create(new_posts, batch_size=50)
+        Post.objects.bulk_update(changed_posts, UPDATE_FIELDS, batch_size=50)
+
+        # MySQL 的 bulk_create 不回填主键，按来源键查回 id
+        post_ids = dict(Post.objects.filter(source_key__in=[item.source_key for item in pending]).values_list('source_key', 'id'))
+        through = Post.tags.through
+        through.objects.filter(post_id__in=[post.id for post in changed_posts]).delete()
+        through.objects.bulk_create([
+            through(post_id=post_ids[item.source_key], tag_id=tag_ids[tag])
+            for item in pending for tag in item.tags
+        ], batch_size=1000, ignore_conflicts=True)
+
+        result['created'] = [post_ids[post.source_key] for post in new_posts]
+        result['updated'] = [post.id for post in changed_posts]
+
+    # 更新的文章保留阅读量等计数，按新的发布时间重算热度
+    for post_id in result['updated']:
+        refresh_hot_score(post_id)
+    return result
@@ -0,0 +1,88 @@
+from typing import Dict, Iterable, List
+
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from anonymous_users.models import AnonymousUser
+from blog_post.counters import apply_post_author_delta
+from blog_post.models import Post, PostLikeRecord
+from blog_post.ranking import refresh_hot_score
+from utils.response_cache import bump, namespaces_for_post
+
+# 点赞结果
+LIKED = 'liked'
+DUPLICATE = 'duplicate'
+MISSING = 'missing'
+
+
+class VisitorNotFound(Exception):
+    """点赞的访客不存在（如解析缓存中的访客已被删除）"""
+
+
+def _insert_like(connection, visitor_id: int, post_id: int) -> bool:
+    """
+    访客和文章都存在且未点赞过时插入点赞记录，重复点赞由 (visitor, post) 唯一约束忽略
+    从访客表和文章表 SELECT 插入，访客或文章不存在时插入 0 行，不会违反外键约束
+    :param connection: 写入使用的数据库连接
+    :param visitor_id: 访客 id
+    :param post_id: 文章 id
+    :return: 是否插入了记录
+    """
+    qn = connection.ops.quote_name
+    visitor, post, liked_at = (qn(PostLikeRecord._meta.get_field(name).column) for name in ('visitor', 'post', 'liked_at'))
+    visitor_pk, post_pk = qn(AnonymousUser._meta.pk.column), qn(Post._meta.pk.column)
+    mysql = connection.vendor == 'mysql'
+    sql = (
+        f"INSERT {'IGNORE ' if mysql else ''}INTO {qn(PostLikeRecord._meta.db_table)} "
+        f"({visitor}, {post}, {liked_at}) "
+        f"SELECT v.{visitor_pk}, p.{post_pk}, %s "
+        f"FROM {qn(AnonymousUser._meta.db_table)} v, {qn(Post._meta.db_table)} p "
+        f"WHERE v.{visitor_pk} = %s AND p.{post_pk} = %s"
+    )
+    if not mysql:
+        sql += f" ON CONFLICT ({visitor}, {post}) DO NOTHING"
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [now, visitor_id, post_id])
+        return cursor.rowcount == 1
+
+
+def like_posts(visitor_id: int, post_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    访客点赞文章，不先查询是否点赞过：按插入点赞记录影响的行数判断，插入成功才累加 stars 和作者统计
+    未插入时再区分文章不存在、访客不存在与重复点赞
+    :param visitor_id: 访客 id
+    :param post_ids: 文章 id 列表
+    :return: {文章 id: liked / duplicate / missing}
+    :raise VisitorNotFound: 访客不存在
+    """
+    post_ids = list(dict.fromkeys(post_ids))
+    connection = connections[router.db_for_write(PostLikeRecord)]
+    results = {}
+    with transaction.atomic(using=connection.alias):
+        for post_id in post_ids:
+            if _insert_like(connection, visitor_id, post_id):
+                Post.objects.filter(id=post_id).update(stars=F('stars') + 1)
+                apply_post_author_delta(post_id, stars=1)
+                results[post_id] = LIKED
+            elif not Post.objects.filter(id=post_id).exists():
+                results[post_id] = MISSING
+            elif not AnonymousUser.objects.filter(id=visitor_id).exists():
+                raise VisitorNotFound(visitor_id)
+            else:
+                results[post_id] = DUPLICATE
+
+        liked = [post_id for post_id, result in results.items() if result == LIKED]
+        if liked:
+            transaction.on_commit(lambda: _after_like(liked), using=connection.alias)
+    return results
+
+
+def _after_like(post_ids: List[int]) -> None:
+    """点赞数变化后刷新热度并使相关缓存失效"""
+    namespaces = set()
+    for post_id in post_ids:
+        refresh_hot_score(post_id)
+        namespaces.update(namespaces_for_post(post_id))
+    bump(*namespaces)
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_post.snapshots import SnapshotBuilder, SnapshotError
+from utils.pagination import MAX_PAGE_SIZE
+
+
+class Command(BaseCommand):
+    """导出公共页面的静态 JSON 快照"""
+
+    help = '把文章列表、热榜、分类、标签和已发布文章详情的接口响应写成 JSON 及 gzip 文件，默认只重写上次构建后变化的文章'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='输出目录（由静态服务器或 CDN 提供）')
+        parser.add_argument('--full', action='store_true', help='忽略上次构建状态，重写全部快照')
+        parser.add_argument('--page-size', type=int, default=10, help=f'列表每页文章数（不超过 {MAX_PAGE_SIZE}）')
+
+    def handle(self, *args, **options):
+        page_size = min(max(options['page_size'], 1), MAX_PAGE_SIZE)
+        builder = SnapshotBuilder(Path(options['directory']).resolve(), page_size)
+        try:
+            result = builder.build(full=options['full'])
+        except SnapshotError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"快照构建完成：文章详情 {result['details']} 篇，列表 {result['pages']} 页，"
+            f"写入 {result['written']} 个，未变化 {result['unchanged']} 个，删除 {result['removed']} 个"
+        ))
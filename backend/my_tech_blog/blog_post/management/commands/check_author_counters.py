@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from blog_post.counters import check_author_counts
+
+
+class Command(BaseCommand):
+    """检查作者统计"""
+
+    help = '按文章表和评论表重新统计作者的文章数、浏览量、点赞数和评论数，报告不一致（--fix 写回）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='写回正确的统计值')
+
+    def handle(self, *args, **options):
+        mismatches = check_author_counts(fix=options['fix'])
+        for author_id, field, stored, expected in mismatches:
+            self.stdout.write(f'作者 {author_id} 的 {field}: 当前 {stored}，应为 {expected}')
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS('作者统计一致'))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f'已修正 {len(mismatches)} 项'))
+        else:
+            self.stdout.write(self.style.WARNING(f'发现 {len(mismatches)} 项不一致，使用 --fix 修正'))
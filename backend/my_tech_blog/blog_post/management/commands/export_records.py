@@ -0,0 +1,39 @@
+import sys
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_post.export import EXPORT_FORMATS, EXPORT_KINDS, iter_records, render_records
+
+
+class Command(BaseCommand):
+    """导出浏览/点赞记录"""
+
+    help = '按 id 升序流式导出浏览或点赞记录（CSV / NDJSON），中断后用 --after 最后一个 id 续传'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORT_KINDS), help='导出的记录类型')
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='csv')
+        parser.add_argument('--start', type=date.fromisoformat, help='起始日期 YYYY-MM-DD（包含）')
+        parser.add_argument('--end', type=date.fromisoformat, help='结束日期 YYYY-MM-DD（包含）')
+        parser.add_argument('--post', type=int, help='只导出某篇文章的记录')
+        parser.add_argument('--after', type=int, default=0, help='只导出 id 大于它的记录')
+        parser.add_argument('--limit', type=int, help='最多导出条数')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='每批读取条数')
+        parser.add_argument('--output', '-o', help='输出文件，默认输出到标准输出')
+
+    def handle(self, *args, **options):
+        records = iter_records(
+            options['kind'], start=options['start'], end=options['end'], post_id=options['post'],
+            after=options['after'], limit=options['limit'], chunk_size=options['chunk_size'],
+        )
+        lines = render_records(records, options['export_format'])
+        try:
+            output = open(options['output'], 'w', encoding='utf-8', newline='') if options['output'] else sys.stdout
+        except OSError as e:
+            raise CommandError(f'无法写入 {options["output"]}: {e}')
+        try:
+            output.writelines(lines)
+        finally:
+            if output is not sys.stdout:
+                output.close()
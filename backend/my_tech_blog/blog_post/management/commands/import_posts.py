@@ -0,0 +1,73 @@
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from blog_post.counters import recount_author, reconcile_category_counts
+from blog_post.feeds import feed_namespaces
+from blog_post.importer import import_batch, load_item
+from blog_post.related import rebuild_related_posts
+from blog_post.tags import reconcile_tag_counts
+from blog_search.indexer import index_posts
+from utils.response_cache import bump
+
+
+class Command(BaseCommand):
+    """批量导入 Markdown 文章"""
+
+    help = '导入目录下带 front matter 的 Markdown 文件（按相对路径去重，文件未变化时跳过，变化时更新）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Markdown 文件所在目录（递归查找 *.md）')
+        parser.add_argument('--author', required=True, help='新文章的作者用户名')
+        parser.add_argument('--status', choices=['draft', 'published'], default='draft',
+                            help='front matter 未指定状态时使用的状态')
+        parser.add_argument('--batch-size', type=int, default=100, help='每个事务导入的文章数')
+
+    def handle(self, *args, **options):
+        root = Path(options['directory']).resolve()
+        if not root.is_dir():
+            raise CommandError(f'目录不存在: {root}')
+        try:
+            author = get_user_model().objects.get(username=options['author'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f'用户不存在: {options["author"]}')
+
+        paths = sorted(root.rglob('*.md'))
+        total = len(paths)
+        created = updated = skipped = failed = 0
+        updated_ids, changed_ids = [], []
+        batch_size = max(options['batch_size'], 1)
+
+        for start in range(0, total, batch_size):
+            items = []
+            for path in paths[start:start + batch_size]:
+                try:
+                    items.append(load_item(path, root, options['status']))
+                except (OSError, ValueError) as e:
+                    failed += 1
+                    self.stderr.write(f'跳过 {path.relative_to(root)}: {e}')
+
+            result = import_batch(items, author.id)
+            # 批量写入不触发信号，逐批补建全文索引
+            index_posts(result['created'] + result['updated'])
+            created += len(result['created'])
+            updated += len(result['updated'])
+            updated_ids.extend(result['updated'])
+            changed_ids.extend(result['created'] + result['updated'])
+            skipped += result['skipped']
+            self.stdout.write(
+                f'[{min(start + batch_size, total)}/{total}] 新增 {created}，更新 {updated}，未变化 {skipped}，失败 {failed}'
+            )
+
+        if created or updated:
+            reconcile_category_counts()
+            reconcile_tag_counts()
+            recount_author(author.id)
+            # 批量导入改变了标签权重，全量重建相关文章
+            rebuild_related_posts()
+            bump('posts', 'categories', 'tags', *(f'post:{post_id}' for post_id in updated_ids))
+            bump(*{namespace for post_id in changed_ids for namespace in feed_namespaces(post_id)})
+        self.stdout.write(self.style.SUCCESS(
+            f'导入完成：共 {total} 个文件，新增 {created}，更新 {updated}，未变化 {skipped}，失败 {failed}'
+        ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog_post.related import rebuild_related_posts
+
+
+class Command(BaseCommand):
+    """全量重建相关文章索引"""
+
+    help = '按标签加权 Jaccard 相似度和分类重新计算每篇文章的相关文章'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='每批写入的文章数')
+
+    def handle(self, *args, **options):
+        changed = rebuild_related_posts(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'已更新 {changed} 篇文章的相关文章'))
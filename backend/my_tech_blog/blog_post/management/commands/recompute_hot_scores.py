@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog_post.ranking import recompute_hot_scores
+
+
+class Command(BaseCommand):
+    """全量重算文章热度"""
+
+    help = '按当前热度参数重算所有文章的热度分（建议定时执行以修正漂移）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='每批更新的文章数')
+
+    def handle(self, *args, **options):
+        total = recompute_hot_scores(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'已重算 {total} 篇文章的热度'))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog_post.counters import reconcile_category_counts
+
+
+class Command(BaseCommand):
+    """修复分类文章数"""
+
+    help = '按文章表重新统计各分类的已发布/草稿文章数，修复计数漂移'
+
+    def handle(self, *args, **options):
+        fixed = reconcile_category_counts()
+        self.stdout.write(self.style.SUCCESS(f'已修正 {fixed} 个分类的文章数'))
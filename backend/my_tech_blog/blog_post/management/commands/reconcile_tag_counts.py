@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog_post.tags import reconcile_tag_counts
+
+
+class Command(BaseCommand):
+    """修复标签文章数"""
+
+    help = '按标签关联表重新统计各标签的文章数，修复计数漂移'
+
+    def handle(self, *args, **options):
+        fixed = reconcile_tag_counts()
+        self.stdout.write(self.style.SUCCESS(f'已修正 {fixed} 个标签的文章数'))
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from blog_post.models import Post
+from blog_post.rendering import RENDERED_FIELDS, apply_rendering
+
+
+class Command(BaseCommand):
+    """批量重新渲染文章"""
+
+    help = '重新渲染内容哈希已失效的文章（修改 MARKDOWN_RENDERER 配置后执行）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='忽略内容哈希，重新渲染全部文章')
+        parser.add_argument('--batch-size', type=int, default=100, help='每批读取的文章数')
+
+    def handle(self, *args, **options):
+        queryset = Post.objects.only('id', 'content_markdown', 'content_hash').order_by('id')
+        total = rendered = 0
+        for post in queryset.iterator(chunk_size=options['batch_size']):
+            total += 1
+            if apply_rendering(post, force=options['force']):
+                # 同时更新修改时间，使详情的 ETag 失效，客户端不会继续使用旧的 HTML
+                post.save(update_fields=(*RENDERED_FIELDS, 'updated_time'))
+                rendered += 1
+        self.stdout.write(self.style.SUCCESS(f'共 {total} 篇文章，重新渲染 {rendered} 篇'))
@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from blog_post.traffic import first_view_date, rollup_traffic
+
+
+class Command(BaseCommand):
+    """按浏览记录重算每日访问量汇总"""
+
+    help = '重算最近几天的每日访问量汇总，访客草图与已有的合并（--backfill 从第一条浏览记录开始重算全部历史并覆盖草图）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=2, help='重算最近多少天（含今天）')
+        parser.add_argument('--backfill', action='store_true', help='重算全部历史')
+        parser.add_argument('--chunk-days', type=int, default=31, help='回填时每批重算的天数')
+
+    def handle(self, *args, **options):
+        end = timezone.localdate()
+        if options['backfill']:
+            start = first_view_date()
+            if start is None:
+                self.stdout.write(self.style.SUCCESS('没有浏览记录'))
+                return
+        else:
+            start = end - timedelta(days=max(options['days'], 1) - 1)
+
+        total = 0
+        chunk_start = start
+        while chunk_start <= end:
+            chunk_end = min(chunk_start + timedelta(days=options['chunk_days'] - 1), end)
+            total += rollup_traffic(chunk_start, chunk_end, replace_sketches=options['backfill'])
+            chunk_start = chunk_end + timedelta(days=1)
+        self.stdout.write(self.style.SUCCESS(f'已重算 {start} 至 {end} 共 {total} 天的访问量'))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_post', '0003_delete_comment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['created_time', 'id'], name='blog_post_p_created_d1d322_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:00
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def fill_category_counts(apps, schema_editor):
+    """按现有文章初始化分类计数"""
+    Category = apps.get_model('blog_post', 'Category')
+    Post = apps.get_model('blog_post', 'Post')
+    rows = Post.objects.filter(category__isnull=False).order_by().values('category').annotate(
+        published=Count('id', filter=Q(status='published')),
+        draft=Count('id', filter=Q(status='draft')),
+    )
+    for row in rows:
+        Category.objects.filter(id=row['category']).update(
+            published_count=row['published'], draft_count=row['draft']
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_post', '0005_post_hot_score_post_blog_post_p_status_9e4c53_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='draft_count',
+            field=models.IntegerField(default=0, verbose_name='草稿文章数'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='published_count',
+            field=models.IntegerField(default=0, verbose_name='已发布文章数'),
+        ),
+        migrations.RunPython(fill_category_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:10
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_daily_traffic(apps, schema_editor):
+    """按现有浏览记录回填每日访问量"""
+    DailyTrafficRollup = apps.get_model('blog_post', 'DailyTrafficRollup')
+    PostViewRecord = apps.get_model('blog_post', 'PostViewRecord')
+    rows = PostViewRecord.objects.annotate(day=TruncDate('viewed_at')).values('day').annotate(
+        count=Count('id')
+    ).order_by('day')
+    DailyTrafficRollup.objects.bulk_create(
+        [DailyTrafficRollup(date=row['day'], views=row['count']) for row in rows], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('anonymous_users', '0001_initial'),
+        ('blog_post', '0007_post_content_hash_post_content_html_post_content_toc'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTrafficRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True, verbose_name='日期')),
+                ('views', models.PositiveIntegerField(default=0, verbose_name='访问量')),
+                ('updated_time', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '每日访问量',
+                'verbose_name_plural': '每日访问量',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postviewrecord',
+            index=models.Index(fields=['viewed_at'], name='blog_post_p_viewed__c664a3_idx'),
+        ),
+        migrations.RunPython(fill_daily_traffic, migrations.RunPython.noop),
+    ]
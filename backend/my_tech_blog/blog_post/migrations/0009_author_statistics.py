@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def fill_author_statistics(apps, schema_editor):
+    """按现有文章和评论初始化作者统计"""
+    AuthorStatistics = apps.get_model('blog_post', 'AuthorStatistics')
+    Post = apps.get_model('blog_post', 'Post')
+    Comment = apps.get_model('blog_comment', 'Comment')
+    comments = dict(
+        Comment.objects.order_by().values('post__author').annotate(count=Count('id')).values_list('post__author', 'count')
+    )
+    rows = Post.objects.order_by().values('author').annotate(
+        total_posts=Count('id'),
+        published_posts=Count('id', filter=Q(status='published')),
+        views=Sum('views', default=0),
+        stars=Sum('stars', default=0),
+    )
+    AuthorStatistics.objects.bulk_create([
+        AuthorStatistics(
+            author_id=row['author'], total_posts=row['total_posts'], published_posts=row['published_posts'],
+            views=row['views'], stars=row['stars'], comments=comments.get(row['author'], 0),
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_post', '0008_daily_traffic_rollup'),
+        ('blog_user', '0005_alter_bloguser_birth_date'),
+        ('blog_comment', '0002_comment_blog_commen_created_b4263b_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorStatistics',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_statistics', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='作者')),
+                ('total_posts', models.IntegerField(default=0, verbose_name='文章数')),
+                ('published_posts', models.IntegerField(default=0, verbose_name='已发布文章数')),
+                ('views', models.BigIntegerField(default=0, verbose_name='浏览量')),
+                ('stars', models.BigIntegerField(default=0, verbose_name='点赞数')),
+                ('comments', models.IntegerField(default=0, verbose_name='评论数')),
+            ],
+            options={
+                'verbose_name': '作者统计',
+                'verbose_name_plural': '作者统计',
+            },
+        ),
+        migrations.RunPython(fill_author_statistics, migrations.RunPython.noop),
+    ]
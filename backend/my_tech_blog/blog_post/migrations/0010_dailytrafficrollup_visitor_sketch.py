@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_post', '0009_author_statistics'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailytrafficrollup',
+            name='visitor_sketch',
+            field=models.BinaryField(blank=True, default=b'', verbose_name='访客草图'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_post', '0010_dailytrafficrollup_visitor_sketch'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='source_hash',
+            field=models.CharField(blank=True, max_length=64, verbose_name='来源哈希'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='source_key',
+            field=models.CharField(blank=True, max_length=255, null=True, unique=True, verbose_name='导入来源'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:16
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_tag_counts(apps, schema_editor):
+    """按现有标签关联初始化标签文章数"""
+    Tag = apps.get_model('blog_post', 'Tag')
+    Post = apps.get_model('blog_post', 'Post')
+    rows = Post.tags.through.objects.order_by().values('tag_id').annotate(count=Count('id'))
+    for row in rows:
+        Tag.objects.filter(id=row['tag_id']).update(post_count=row['count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_post', '0011_post_source_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='post_count',
+            field=models.IntegerField(default=0, verbose_name='文章数'),
+        ),
+        migrations.RunPython(fill_tag_counts, migrations.RunPython.noop),
+    ]
@@ -3,6 +3,7 @@ from django.utils import timezone
 from django.db import models
 
 from anonymous_users.models import AnonymousUser
+from blog_post.rendering import RENDERED_FIELDS, apply_rendering
 
 User = get_user_model()
 
@@ -12,6 +13,9 @@ class Category(models.Model):
 
     name = models.CharField(max_length=100, unique=True, verbose_name="分类名称")
     description = models.TextField(blank=True, verbose_name="分类描述")
+    # 文章数（由 blog_post.counters 随文章写入维护）
+    published_count = models.IntegerField(default=0, verbose_name="已发布文章数")
+    draft_count = models.IntegerField(default=0, verbose_name="草稿文章数")
 
     class Meta:
         verbose_name = "分类"
@@ -26,6 +30,8 @@ class Tag(models.Model):
     """文章标签"""
 
     name = models.CharField(max_length=100, unique=True, verbose_name="标签名称")
+    # 文章数（由 blog_post.signals 随标签关联变化维护）
+    post_count = models.IntegerField(default=0, verbose_name="文章数")
 
     class Meta:
         verbose_name = "标签"
@@ -50,6 +56,10 @@ class Post(models.Model):
     author = models.ForeignKey(User, on_delete=models.CASCADE, related_name='blog_posts', verbose_name="作者")
     # 存储原始 Markdown 内容
     content_markdown = models.TextField(verbose_name="Markdown 内容")
+    # 服务端渲染结果（见 blog_post.rendering），content_hash 不变时不重新渲染
+    content_html = models.TextField(blank=True, verbose_name="HTML 内容")
+    content_toc = models.JSONField(default=list, blank=True, verbose_name="目录")
+    content_hash = models.CharField(max_length=64, blank=True, verbose_name="内容哈希")
     # 摘要
     excerpt = models.TextField(blank=True, max_length=300, verbose_name="摘要")
     # 状态
@@ -70,20 +80,44 @@ class Post(models.Model):
     views = models.PositiveIntegerField(default=0, verbose_name="阅读量")
     # 点赞数
     stars = models.PositiveIntegerField(default=0, verbose_name="点赞数")
+    # 热度（互动量与发布时间综合得分，见 blog_post.ranking）
+    hot_score = models.FloatField(default=0, verbose_name="热度")
+    # 批量导入的来源（相对路径）和来源文件哈希，重复导入时据此跳过或更新
+    source_key = models.CharField(max_length=255, null=True, blank=True, unique=True, verbose_name="导入来源")
+    source_hash = models.CharField(max_length=64, blank=True, verbose_name="来源哈希")
 
     class Meta:
         verbose_name = "文章"
         verbose_name_plural = "文章"
         # 默认按创建时间倒序排列
         ordering = ['-created_time']
+        indexes = [
+            # 游标分页按 (created_time, id) 定位
+            models.Index(fields=['created_time', 'id']),
+            # 热榜按热度取前 N
+            models.Index(fields=['status', '-hot_score']),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # 记录从数据库加载时的值，保存时据此计算计数器的变化
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_state = dict(zip(field_names, values))
+        return instance
+
     def save(self, *args, **kwargs):
         # 如果状态变为 published 且 published_time 为空，则设置发布时间
         if self.status == 'published' and not self.published_time:
             self.published_time = timezone.now()
+
+        # Markdown 内容变化时重新渲染 HTML、目录和摘要，并更新修改时间（详情的 ETag 依据）
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content_markdown' in update_fields:
+            if apply_rendering(self) and update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {*RENDERED_FIELDS, 'updated_time'}
         super().save(*args, **kwargs)
 
 
@@ -98,13 +132,33 @@ class PostViewRecord(models.Model):
         verbose_name_plural = "浏览记录"
         # 保证每人每篇文章只有一条记录
         unique_together = ['visitor', 'post']
-        # 加速 exists 查询
-        indexes = [models.Index(fields=['visitor', 'post'])]
+        indexes = [
+            # 加速 exists 查询
+            models.Index(fields=['visitor', 'post']),
+            # 按时间范围重算流量汇总
+            models.Index(fields=['viewed_at']),
+        ]
 
     def __str__(self):
         return f"{self.visitor.nickname} 浏览了 {self.post.title}"
 
 
+class DailyTrafficRollup(models.Model):
+    """每日访问量汇总（由 blog_post.traffic 在浏览记录写入时累加，仪表盘直接读取）"""
+    date = models.DateField(unique=True, verbose_name="日期")
+    views = models.PositiveIntegerField(default=0, verbose_name="访问量")
+    # 当天访客的 HyperLogLog 草图（见 utils.hyperloglog），合并后估算任意日期范围的独立访客数
+    visitor_sketch = models.BinaryField(default=b'', blank=True, verbose_name="访客草图")
+    updated_time = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        verbose_name = "每日访问量"
+        verbose_name_plural = "每日访问量"
+
+    def __str__(self):
+        return f"{self.date}: {self.views}"
+
+
 class PostLikeRecord(models.Model):
     """文章点赞记录（唯一约束防重复点赞）"""
     visitor = models.ForeignKey(AnonymousUser, on_delete=models.CASCADE, related_name='liked_posts')
@@ -120,3 +174,37 @@ class PostLikeRecord(models.Model):
 
     def __str__(self):
         return f"{self.visitor.nickname} 点赞了 {self.post.title}"
+
+
+class AuthorStatistics(models.Model):
+    """作者统计（由 blog_post.counters 随文章、评论、浏览、点赞写入维护，仪表盘按主键读取）"""
+    author = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True,
+                                  related_name='post_statistics', verbose_name="作者")
+    total_posts = models.IntegerField(default=0, verbose_name="文章数")
+    published_posts = models.IntegerField(default=0, verbose_name="已发布文章数")
+    views = models.BigIntegerField(default=0, verbose_name="浏览量")
+    stars = models.BigIntegerField(default=0, verbose_name="点赞数")
+    comments = models.IntegerField(default=0, verbose_name="评论数")
+
+    class Meta:
+        verbose_name = "作者统计"
+        verbose_name_plural = "作者统计"
+
+    def __str__(self):
+        return f"{self.author} 的统计"
+
+
+class RelatedPosts(models.Model):
+    """相关文章索引（由 blog_post.related 按标签和分类相似度预先计算，详情接口按主键读取）"""
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True,
+                                related_name='related_index', verbose_name="文章")
+    # 按相似度从高到低排列的已发布文章 id
+    related_ids = models.JSONField(default=list, blank=True, verbose_name="相关文章")
+    updated_time = models.DateTimeField(auto_now=True, verbose_name="更新时间")
+
+    class Meta:
+        verbose_name = "相关文章"
+        verbose_name_plural = "相关文章"
+
+    def __str__(self):
+        return f"{self.post_id} 的相关文章"
@@ -0,0 +1,91 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Count
+
+from blog_post.models import Post
+
+# 热度计算的默认参数，可在 settings.HOT_RANK 中覆盖
+DEFAULT_HOT_RANK = {
+    # 浏览、点赞、评论的权重
+    'VIEW_WEIGHT': 1.0,
+    'STAR_WEIGHT': 5.0,
+    'COMMENT_WEIGHT': 10.0,
+    # 发布时间每晚这么多秒，需要 10 倍的互动量才能持平
+    'DECAY_SECONDS': 7 * 24 * 3600,
+}
+
+# 时间项的起点，只影响分数的绝对值，不影响排序
+HOT_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _config() -> dict:
+    """合并默认参数与 settings.HOT_RANK"""
+    return {**DEFAULT_HOT_RANK, **getattr(settings, 'HOT_RANK', {})}
+
+
+def compute_hot_score(views: int, stars: int, comments: int, published_time: datetime) -> float:
+    """
+    计算热度分：log10(加权互动量) + 发布时间 / 衰减周期
+    时间项随发布时间单调增长，等价于让旧文章的热度按周期衰减，
+    且分数只在互动量变化时才需要更新，可以直接存库并建索引
+    :param views: 阅读量
+    :param stars: 点赞数
+    :param comments: 评论数
+    :param published_time: 发布时间（未发布时用创建时间）
+    :return: float
+    """
+    config = _config()
+    interactions = (
+        views * config['VIEW_WEIGHT']
+        + stars * config['STAR_WEIGHT']
+        + comments * config['COMMENT_WEIGHT']
+    )
+    age_term = (published_time - HOT_EPOCH).total_seconds() / config['DECAY_SECONDS']
+    return round(math.log10(max(interactions, 1)) + age_term, 6)
+
+
+def refresh_hot_score(post_id: int) -> None:
+    """
+    在阅读、点赞、评论记录后重新计算单篇文章的热度
+    :param post_id: 文章 id
+    :return: None
+    """
+    row = Post.objects.filter(id=post_id).values(
+        'views', 'stars', 'published_time', 'created_time'
+    ).annotate(comment_count=Count('comments')).order_by('id').first()
+    if not row:
+        return
+
+    score = compute_hot_score(
+        row['views'], row['stars'], row['comment_count'], row['published_time'] or row['created_time']
+    )
+    Post.objects.filter(id=post_id).update(hot_score=score)
+
+
+def recompute_hot_scores(batch_size: int = 500) -> int:
+    """
+    全量重算热度（修正漂移或调整参数后使用）
+    :param batch_size: 每批更新的文章数
+    :return: 更新的文章数
+    """
+    queryset = Post.objects.only(
+        'id', 'views', 'stars', 'published_time', 'created_time', 'hot_score'
+    ).annotate(comment_count=Count('comments')).order_by('id')
+
+    total = 0
+    batch = []
+    for post in queryset.iterator(chunk_size=batch_size):
+        post.hot_score = compute_hot_score(
+            post.views, post.stars, post.comment_count, post.published_time or post.created_time
+        )
+        batch.append(post)
+        if len(batch) >= batch_size:
+            Post.objects.bulk_update(batch, ['hot_score'])
+            total += len(batch)
+            batch = []
+    if batch:
+        Post.objects.bulk_update(batch, ['hot_score'])
+        total += len(batch)
+    return total
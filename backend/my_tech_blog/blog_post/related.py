@@ -0,0 +1,235 @@
+import math
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from blog_post.models import Post, RelatedPosts, Tag
+from utils.response_cache import bump
+
+# 默认配置，可在 settings.RELATED_POSTS 中覆盖
+DEFAULT_CONFIG = {
+    # 每篇文章保存的相关文章数（多存一些，文章下线或删除后仍有足够的候选）
+    'SIZE': 10,
+    # 详情接口返回的相关文章数
+    'LIMIT': 5,
+    # 同分类的加分
+    'CATEGORY_BONUS': 0.2,
+    # 没有共同标签时，按分类补充的最新文章数
+    'CATEGORY_CANDIDATES': 20,
+    # 标签变化后最多重算这么多篇共享标签的文章，其余等待全量重建
+    'MAX_AFFECTED': 200,
+}
+
+
+def get_config() -> Dict[str, Any]:
+    """
+    读取 settings.RELATED_POSTS 覆盖后的配置
+    :return: dict
+    """
+    return {**DEFAULT_CONFIG, **getattr(settings, 'RELATED_POSTS', {})}
+
+
+class _Graph:
+    """计算相似度所需的数据：文章的标签集合、分类、标签权重和候选文章"""
+
+    def __init__(self):
+        self.tags_of: Dict[int, Set[int]] = defaultdict(set)
+        self.category_of: Dict[int, Optional[int]] = {}
+        # 标签 -> 带有该标签的已发布文章
+        self.posts_by_tag: Dict[int, Set[int]] = defaultdict(set)
+        # 分类 -> 该分类最新的已发布文章
+        self.recent_by_category: Dict[int, List[int]] = {}
+        self.weights: Dict[int, float] = {}
+
+    def set_weights(self, tag_counts: Dict[int, int], total: int) -> None:
+        """
+        按逆文档频率计算标签权重，越少见的标签对相似度贡献越大
+        :param tag_counts: {标签 id: 文章数}
+        :param total: 文章总数
+        :return: None
+        """
+        total = max(total, 1)
+        self.weights = {tag_id: math.log(1 + total / max(count, 1)) for tag_id, count in tag_counts.items()}
+
+    def score(self, post_id: int, other_id: int, bonus: float) -> float:
+        """
+        加权 Jaccard 相似度：共同标签权重之和 / 全部标签权重之和，同分类再加 bonus
+        :param post_id: 文章 id
+        :param other_id: 候选文章 id
+        :param bonus: 同分类加分
+        :return: float
+        """
+        tags, other = self.tags_of.get(post_id, set()), self.tags_of.get(other_id, set())
+        union = sum(self.weights.get(tag_id, 0.0) for tag_id in tags | other)
+        score = sum(self.weights.get(tag_id, 0.0) for tag_id in tags & other) / union if union else 0.0
+        category = self.category_of.get(post_id)
+        if category is not None and self.category_of.get(other_id) == category:
+            score += bonus
+        return score
+
+    def rank(self, post_id: int, config: Dict[str, Any]) -> List[int]:
+        """
+        计算一篇文章的相关文章
+        :param post_id: 文章 id
+        :param config: 配置
+        :return: 按相似度从高到低排列的文章 id，相似度相同时新文章在前
+        """
+        candidates = set()
+        for tag_id in self.tags_of.get(post_id, ()):
+            candidates.update(self.posts_by_tag.get(tag_id, ()))
+        candidates.update(self.recent_by_category.get(self.category_of.get(post_id), ()))
+        candidates.discard(post_id)
+
+        scored = []
+        for other_id in candidates:
+            score = self.score(post_id, other_id, config['CATEGORY_BONUS'])
+            if score > 0:
+                scored.append((score, other_id))
+        scored.sort(key=lambda item: (-item[0], -item[1]))
+        return [other_id for _, other_id in scored[:config['SIZE']]]
+
+
+def _published():
+    return Post.objects.filter(status='published')
+
+
+def _recent_by_category(category_ids: Iterable[Optional[int]], size: int) -> Dict[int, List[int]]:
+    """每个分类最新的 size 篇已发布文章"""
+    return {
+        category_id: list(_published().filter(category_id=category_id).order_by('-created_time').values_list('id', flat=True)[:size])
+        for category_id in set(category_ids) if category_id is not None
+    }
+
+
+def _save(results: Dict[int, List[int]], batch_size: int = 500) -> int:
+    """
+    写入相关文章索引，只写有变化的行，并使这些文章的详情缓存失效
+    :param results: {文章 id: 相关文章 id}
+    :param batch_size: 每批写入条数
+    :return: 变化的文章数
+    """
+    existing = dict(RelatedPosts.objects.filter(post_id__in=list(results)).values_list('post_id', 'related_ids'))
+    changed = [
+        RelatedPosts(post_id=post_id, related_ids=related_ids)
+        for post_id, related_ids in results.items()
+        if existing.get(post_id) != related_ids
+    ]
+    RelatedPosts.objects.bulk_create(
+        changed, batch_size=batch_size,
+        update_conflicts=True, unique_fields=['post'], update_fields=['related_ids', 'updated_time']
+    )
+    if changed:
+        bump(*(f'post:{row.post_id}' for row in changed))
+    return len(changed)
+
+
+def refresh_related(post_ids: Iterable[int]) -> int:
+    """
+    重算指定文章的相关文章，只读取与它们共享标签或分类的文章
+    :param post_ids: 文章 id（已删除的文章会被跳过）
+    :return: 索引有变化的文章数
+    """
+    config = get_config()
+    post_ids = set(post_ids)
+    if not post_ids:
+        return 0
+    through = Post.tags.through
+    graph = _Graph()
+
+    for post_id, tag_id in through.objects.filter(post_id__in=post_ids).values_list('post_id', 'tag_id'):
+        graph.tags_of[post_id].add(tag_id)
+    source_tags = set().union(*graph.tags_of.values()) if graph.tags_of else set()
+
+    # 共享标签的已发布文章，再读取它们的全部标签用于计算并集
+    for post_id, tag_id in through.objects.filter(tag_id__in=source_tags, post__status='published').values_list('post_id', 'tag_id'):
+        graph.posts_by_tag[tag_id].add(post_id)
+    candidate_ids = set().union(*graph.posts_by_tag.values()) if graph.posts_by_tag else set()
+
+    categories = dict(Post.objects.filter(id__in=post_ids).values_list('id', 'category_id'))
+    graph.recent_by_category = _recent_by_category(categories.values(), config['CATEGORY_CANDIDATES'])
+    for ids in graph.recent_by_category.values():
+        candidate_ids.update(ids)
+
+    candidate_ids -= post_ids
+    for post_id, tag_id in through.objects.filter(post_id__in=candidate_ids).values_list('post_id', 'tag_id'):
+        graph.tags_of[post_id].add(tag_id)
+    graph.category_of = {**dict(Post.objects.filter(id__in=candidate_ids).values_list('id', 'category_id')), **categories}
+
+    all_tags = set().union(*graph.tags_of.values()) if graph.tags_of else set()
+    graph.set_weights(dict(Tag.objects.filter(id__in=all_tags).values_list('id', 'post_count')), Post.objects.count())
+
+    return _save({post_id: graph.rank(post_id, config) for post_id in categories})
+
+
+def affected_posts(post_ids: Iterable[int], tag_ids: Iterable[int]) -> List[int]:
+    """
+    文章的标签、分类或状态变化后需要重算的文章：它们自己和共享这些标签的最新文章
+    :param post_ids: 变化的文章 id
+    :param tag_ids: 变化前后涉及的标签 id
+    :return: 文章 id
+    """
+    post_ids = list(post_ids)
+    neighbours = Post.tags.through.objects.filter(tag_id__in=set(tag_ids)).exclude(post_id__in=post_ids).values_list(
+        'post_id', flat=True
+    ).order_by('-post_id').distinct()
+    return [*post_ids, *neighbours[:get_config()['MAX_AFFECTED']]]
+
+
+def schedule_refresh(post_ids: Iterable[int], tag_ids: Iterable[int]) -> None:
+    """
+    事务提交后重算受影响文章的相关文章
+    :param post_ids: 变化的文章 id
+    :param tag_ids: 变化前后涉及的标签 id
+    :return: None
+    """
+    post_ids, tag_ids = list(post_ids), list(tag_ids)
+    transaction.on_commit(lambda: refresh_related(affected_posts(post_ids, tag_ids)))
+
+
+def rebuild_related_posts(batch_size: int = 500) -> int:
+    """
+    全量重建相关文章索引：一次读入全部标签关联，在内存中计算后分批写入
+    标签权重随文章数变化，增量更新只覆盖共享标签的文章，建议定时全量重建
+    :param batch_size: 每批写入条数
+    :return: 索引有变化的文章数
+    """
+    config = get_config()
+    graph = _Graph()
+    posts = list(Post.objects.values_list('id', 'category_id', 'status'))
+    published = {post_id for post_id, _, status in posts if status == 'published'}
+    graph.category_of = {post_id: category_id for post_id, category_id, _ in posts}
+
+    for post_id, tag_id in Post.tags.through.objects.values_list('post_id', 'tag_id').iterator():
+        graph.tags_of[post_id].add(tag_id)
+        if post_id in published:
+            graph.posts_by_tag[tag_id].add(post_id)
+    graph.recent_by_category = _recent_by_category(graph.category_of.values(), config['CATEGORY_CANDIDATES'])
+    graph.set_weights(dict(Tag.objects.values_list('id', 'post_count')), len(posts))
+
+    changed = 0
+    for start in range(0, len(posts), batch_size):
+        batch = posts[start:start + batch_size]
+        changed += _save({post_id: graph.rank(post_id, config) for post_id, _, _ in batch}, batch_size)
+    return changed
+
+
+def related_posts(post_id: int) -> List[Dict[str, Any]]:
+    """
+    读取文章的相关文章（两次主键查询，过滤已下线或删除的文章）
+    :param post_id: 文章 id
+    :return: [{'id', 'title', 'created_time'}]
+    """
+    related_ids = RelatedPosts.objects.filter(post_id=post_id).values_list('related_ids', flat=True).first()
+    if not related_ids:
+        return []
+    posts = {
+        post['id']: post
+        for post in _published().filter(id__in=related_ids).values('id', 'title', 'created_time')
+    }
+    return [
+        {'id': post['id'], 'title': post['title'], 'created_time': timezone.localtime(post['created_time']).strftime('%Y-%m-%d %H:%M:%S')}
+        for post in (posts.get(related_id) for related_id in related_ids) if post
+    ][:get_config()['LIMIT']]
@@ -0,0 +1,112 @@
+import hashlib
+import html
+import json
+import re
+from typing import Any, Dict, List, NamedTuple
+
+import markdown
+import nh3
+from django.conf import settings
+from markdown.extensions.toc import slugify_unicode
+
+# 渲染逻辑变化时递增，使所有文章的内容哈希失效
+RENDERER_VERSION = 1
+
+# 默认配置，可在 settings.MARKDOWN_RENDERER 中覆盖
+DEFAULT_CONFIG = {
+    # Python-Markdown 扩展
+    'EXTENSIONS': ['extra', 'toc', 'sane_lists'],
+    'EXTENSION_CONFIGS': {},
+    # 纯文本摘要长度
+    'EXCERPT_LENGTH': 300,
+}
+
+# 渲染结果对应的文章字段
+RENDERED_FIELDS = ('content_html', 'content_toc', 'content_hash', 'excerpt')
+
+
+class RenderedContent(NamedTuple):
+    """Markdown 渲染结果"""
+
+    html: str
+    toc: List[Dict[str, Any]]
+    text: str
+
+
+def _config() -> Dict[str, Any]:
+    """合并默认配置与 settings.MARKDOWN_RENDERER"""
+    return {**DEFAULT_CONFIG, **getattr(settings, 'MARKDOWN_RENDERER', {})}
+
+
+def _allowed_attributes() -> Dict[str, set]:
+    """在 nh3 默认白名单基础上允许标题锚点和代码语言类名"""
+    attributes = {tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()}
+    for tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+        attributes.setdefault(tag, set()).add('id')
+    for tag in ('code', 'pre', 'span', 'div'):
+        attributes.setdefault(tag, set()).add('class')
+    return attributes
+
+
+def content_hash(markdown_text: str) -> str:
+    """
+    计算内容哈希（包含渲染器版本和配置，配置变化后哈希随之变化）
+    :param markdown_text: Markdown 原文
+    :return: sha256 十六进制字符串
+    """
+    signature = json.dumps([RENDERER_VERSION, _config()], sort_keys=True, default=str)
+    return hashlib.sha256(f'{signature}\n{markdown_text}'.encode('utf-8')).hexdigest()
+
+
+def _simplify_toc(tokens: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """只保留目录中前端需要的字段"""
+    return [
+        {
+            'id': token['id'],
+            'name': html.unescape(token['name']),
+            'level': token['level'],
+            'children': _simplify_toc(token.get('children', [])),
+        }
+        for token in tokens
+    ]
+
+
+def render_markdown(markdown_text: str) -> RenderedContent:
+    """
+    渲染 Markdown，输出净化后的 HTML、目录和纯文本摘要
+    :param markdown_text: Markdown 原文
+    :return: RenderedContent
+    """
+    config = _config()
+    extension_configs = dict(config['EXTENSION_CONFIGS'])
+    # 中文标题默认生成的锚点不可读，改用保留 Unicode 的 slug
+    extension_configs['toc'] = {'slugify': slugify_unicode, **extension_configs.get('toc', {})}
+    md = markdown.Markdown(extensions=config['EXTENSIONS'], extension_configs=extension_configs)
+    raw_html = md.convert(markdown_text or '')
+    safe_html = nh3.clean(raw_html, attributes=_allowed_attributes())
+
+    # 去掉全部标签得到纯文本
+    text = html.unescape(nh3.clean(safe_html, tags=set()))
+    text = re.sub(r'\s+', ' ', text).strip()
+
+    toc = _simplify_toc(getattr(md, 'toc_tokens', []))
+    return RenderedContent(safe_html, toc, text[:config['EXCERPT_LENGTH']])
+
+
+def apply_rendering(post, force: bool = False) -> bool:
+    """
+    内容哈希变化时重新渲染文章，并同步更新摘要
+    :param post: Post
+    :param force: 忽略哈希强制渲染
+    :return: 是否重新渲染
+    """
+    digest = content_hash(post.content_markdown)
+    if not force and post.content_hash == digest:
+        return False
+
+    rendered = render_markdown(post.content_markdown)
+    post.content_html = rendered.html
+    post.content_toc = rendered.toc
+    post.excerpt = rendered.text
+    post.content_hash = digest
+    return True
@@ -0,0 +1,125 @@
+from typing import Iterable, Optional, Tuple
+
+from django.db.models import Count, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+from rest_framework import serializers
+
+from blog_comment.models import Comment
+from blog_post.models import Post
+
+# 序列化字段对应需要读取的数据库列（tags 走预取，comments 走注解，related 由详情接口读取索引，不占用列）
+FIELD_COLUMNS = {
+    'id': ('id',),
+    'title': ('title',),
+    'author': ('author',),
+    'content_markdown': ('content_markdown',),
+    'content_html': ('content_html',),
+    'toc': ('content_toc',),
+    'excerpt': ('excerpt',),
+    'status': ('status',),
+    'created_time': ('created_time',),
+    'published_time': ('published_time',),
+    'category': ('category', 'category__name'),
+    'tags': (),
+    'views': ('views',),
+    'stars': ('stars',),
+    'comments': (),
+    'related': (),
+}
+
+# 正文类的大字段
+BODY_FIELDS = ('content_markdown', 'content_html', 'toc')
+
+# 只在详情接口提供的字段（不经过序列化器）
+DETAIL_ONLY_FIELDS = ('related',)
+# 序列化器字段，列表类接口只接受这些字段
+SERIALIZER_FIELDS = tuple(field for field in FIELD_COLUMNS if field not in DETAIL_ONLY_FIELDS)
+
+# 列表接口默认不返回正文
+LIST_FIELDS = tuple(field for field in SERIALIZER_FIELDS if field not in BODY_FIELDS)
+# 详情接口默认返回 Markdown 原文和相关文章
+DETAIL_FIELDS = LIST_FIELDS + ('content_markdown', 'related')
+
+
+def parse_fields(param: Optional[str], default: Tuple[str, ...],
+                 allowed: Iterable[str] = SERIALIZER_FIELDS) -> Tuple[str, ...]:
+    """
+    解析 fields 查询参数
+    :param param: 逗号分隔的字段名，为空时使用默认字段
+    :param default: 接口默认字段
+    :param allowed: 接口可用的字段
+    :return: 字段元组
+    :raise ValueError: 存在未知字段
+    """
+    if not param:
+        return default
+    fields = tuple(dict.fromkeys(f.strip() for f in param.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(','.join(unknown))
+    return fields
+
+
+def post_list_queryset(queryset: QuerySet = None, fields: Iterable[str] = DETAIL_FIELDS) -> QuerySet:
+    """
+    为文章列表准备查询集：一次 JOIN 取分类，一次预取标签，评论数用相关子查询注解
+    无论分页大小，列表接口的查询次数都是固定的；只读取 fields 需要的列，未请求正文时不读正文列
+    :param queryset: QuerySet
+    :param fields: 需要序列化的字段
+    :return: QuerySet
+    """
+    if queryset is None:
+        queryset = Post.objects.all()
+    fields = set(fields)
+
+    # id 和 created_time 供排序与游标分页使用，始终读取
+    columns = {'id', 'created_time'}
+    for field in fields:
+        columns.update(FIELD_COLUMNS[field])
+    queryset = queryset.only(*sorted(columns))
+
+    if 'category' in fields:
+        queryset = queryset.select_related('category')
+    if 'tags' in fields:
+        queryset = queryset.prefetch_related('tags')
+    if 'comments' in fields:
+        # 相关子查询统计评论数，避免对文章表 GROUP BY
+        comment_count = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post').annotate(
+            count=Count('*')
+        ).values('count')
+        queryset = queryset.annotate(comment_count=Coalesce(Subquery(comment_count), 0))
+    return queryset
+
+
+class PostListSerializer(serializers.ModelSerializer):
+    """文章序列化器（配合 post_list_queryset 使用，fields 参数指定输出字段）"""
+
+    # 分类名称
+    category = serializers.SerializerMethodField()
+    # 标签名称列表
+    tags = serializers.SlugRelatedField(many=True, read_only=True, slug_field='name')
+    # 创建时间
+    created_time = serializers.DateTimeField(format='%Y-%m-%d %H:%M:%S')
+    # 评论数
+    comments = serializers.IntegerField(source='comment_count', read_only=True, default=0)
+    # 目录
+    toc = serializers.JSONField(source='content_toc', read_only=True)
+
+    class Meta:
+        model = Post
+        fields = SERIALIZER_FIELDS
+        read_only_fields = fields
+
+    def __init__(self, *args, fields: Iterable[str] = DETAIL_FIELDS, **kwargs):
+        super().__init__(*args, **kwargs)
+        # 只保留需要输出的字段
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+
+    def get_category(self, obj: Post) -> str:
+        """
+        获取分类名称
+        :param obj: Post
+        :return: str
+        """
+        return obj.category.name if obj.category else ''
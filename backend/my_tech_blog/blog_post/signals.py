@@ -0,0 +1,192 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from blog_comment.models import Comment
+from blog_post.counters import (
+    apply_post_author_delta, loaded_state, remember_state, update_author_counts, update_category_counts
+)
+from blog_post.feeds import feed_namespaces
+from blog_post.models import Category, Post, Tag
+from blog_post.ranking import compute_hot_score, refresh_hot_score
+from blog_post.related import schedule_refresh
+from blog_post.tags import apply_tag_delta
+from utils.response_cache import bump, namespaces_for_post
+
+# 影响分类计数和作者统计的字段
+COUNTER_FIELDS = frozenset(('category', 'status', 'author'))
+
+
+@receiver(pre_save, sender=Post)
+def update_hot_score(sender, instance: Post, update_fields=None, **kwargs):
+    """完整保存文章前同步计算热度（只更新部分字段时由调用方使用 refresh_hot_score）"""
+    if update_fields is not None:
+        return
+
+    comments = instance.comments.count() if instance.pk else 0
+    instance.hot_score = compute_hot_score(
+        instance.views, instance.stars, comments, instance.published_time or instance.created_time
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def update_hot_score_on_comment(sender, instance: Comment, **kwargs):
+    """评论新增或删除后更新文章热度"""
+    refresh_hot_score(instance.post_id)
+
+
+@receiver(post_save, sender=Comment)
+def count_author_comment(sender, instance: Comment, created: bool = False, **kwargs):
+    """新评论计入文章作者的评论数"""
+    if created:
+        apply_post_author_delta(instance.post_id, comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def uncount_author_comment(sender, instance: Comment, **kwargs):
+    """删除的评论从文章作者的评论数中扣除"""
+    apply_post_author_delta(instance.post_id, comments=-1)
+
+
+def _touches_counters(update_fields) -> bool:
+    """本次保存是否可能改变计数器相关字段"""
+    return update_fields is None or bool(COUNTER_FIELDS.intersection(update_fields))
+
+
+@receiver(pre_save, sender=Post)
+def capture_post_state(sender, instance: Post, update_fields=None, **kwargs):
+    """保存前记下文章原来的分类、状态和作者"""
+    if _touches_counters(update_fields):
+        instance._state_before_save = loaded_state(instance)
+
+
+@receiver(post_save, sender=Post)
+def update_counters_on_save(sender, instance: Post, update_fields=None, **kwargs):
+    """文章新建、改分类、改状态或改作者后调整分类计数和作者统计"""
+    if not _touches_counters(update_fields):
+        return
+    before = getattr(instance, '_state_before_save', None)
+    after = {'category_id': instance.category_id, 'status': instance.status, 'author_id': instance.author_id}
+    update_category_counts(before, after)
+    update_author_counts(before, after, instance)
+    remember_state(instance)
+
+
+@receiver(post_delete, sender=Post)
+def update_counters_on_delete(sender, instance: Post, **kwargs):
+    """文章删除后调整分类计数和作者统计"""
+    before = {'category_id': instance.category_id, 'status': instance.status, 'author_id': instance.author_id}
+    update_category_counts(before, None)
+    update_author_counts(before, None, instance)
+
+
+@receiver(pre_delete, sender=Post)
+def update_tag_counts_on_delete(sender, instance: Post, **kwargs):
+    """文章删除前扣减其标签的文章数（关联行随后被级联删除，不会发出 m2m_changed）"""
+    tag_ids = Post.tags.through.objects.filter(post_id=instance.pk).values_list('tag_id', flat=True)
+    apply_tag_delta(list(tag_ids), -1)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def update_tag_counts(sender, instance, action: str, reverse: bool, pk_set=None, **kwargs):
+    """标签关联增删后调整标签的文章数"""
+    through = Post.tags.through
+    if action == 'pre_clear':
+        # 清空前记下现有关联，post_clear 时据此扣减
+        field = 'post_id' if not reverse else 'tag_id'
+        instance._cleared_ids = list(through.objects.filter(**{field: instance.pk}).values_list(
+            'tag_id' if not reverse else 'post_id', flat=True
+        ))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    delta = 1 if action == 'post_add' else -1
+    related_ids = list(getattr(instance, '_cleared_ids', ())) if action == 'post_clear' else list(pk_set or ())
+    if not reverse:
+        apply_tag_delta(related_ids, delta)
+    else:
+        apply_tag_delta([instance.pk], delta * len(related_ids))
+
+
+@receiver(post_save, sender=Post)
+def refresh_related_on_save(sender, instance: Post, update_fields=None, **kwargs):
+    """文章改分类或改状态后重算它和共享标签文章的相关文章（新文章还没有标签，由标签信号处理）"""
+    before = getattr(instance, '_state_before_save', None)
+    if not _touches_counters(update_fields) or before is None:
+        return
+    if before['category_id'] == instance.category_id and before['status'] == instance.status:
+        return
+    tag_ids = Post.tags.through.objects.filter(post_id=instance.pk).values_list('tag_id', flat=True)
+    schedule_refresh([instance.pk], list(tag_ids))
+
+
+@receiver(pre_delete, sender=Post)
+def refresh_related_on_delete(sender, instance: Post, **kwargs):
+    """文章删除后重算共享标签文章的相关文章（被删除文章自己的索引行随之级联删除）"""
+    tag_ids = list(Post.tags.through.objects.filter(post_id=instance.pk).values_list('tag_id', flat=True))
+    if tag_ids:
+        schedule_refresh([], tag_ids)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def refresh_related_on_tags(sender, instance, action: str, reverse: bool, pk_set=None, **kwargs):
+    """标签关联增删后重算涉及文章和共享这些标签文章的相关文章"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    related_ids = list(getattr(instance, '_cleared_ids', ())) if action == 'post_clear' else list(pk_set or ())
+    if not reverse:
+        schedule_refresh([instance.pk], related_ids)
+    else:
+        schedule_refresh(related_ids, [instance.pk])
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post_cache(sender, instance: Post, **kwargs):
+    """文章写入后使列表、详情、分类计数和标签计数的缓存失效"""
+    namespaces = (*namespaces_for_post(instance.pk), 'categories', 'tags')
+    transaction.on_commit(lambda: bump(*namespaces))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_feed_cache(sender, instance: Post, **kwargs):
+    """已发布的文章（或刚下线的文章）写入后使订阅和所在站点地图分片失效，草稿变化不影响"""
+    before = getattr(instance, '_state_before_save', None)
+    if instance.status != 'published' and not (before and before['status'] == 'published'):
+        return
+    namespaces = feed_namespaces(instance.pk)
+    transaction.on_commit(lambda: bump(*namespaces))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def invalidate_post_tags_cache(sender, instance, action: str, reverse: bool, pk_set=None, **kwargs):
+    """文章标签变化后使相关缓存失效"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    post_ids = [instance.pk] if not reverse else list(pk_set or ())
+    namespaces = ['posts', 'tags'] + [f'post:{post_id}' for post_id in post_ids]
+    transaction.on_commit(lambda: bump(*namespaces))
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tag_cache(sender, instance: Tag, **kwargs):
+    """标签变化后使标签列表和文章列表（含标签名）的缓存失效"""
+    transaction.on_commit(lambda: bump('tags', 'posts'))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_category_cache(sender, instance: Category, **kwargs):
+    """分类变化后使分类列表、文章列表和订阅（含分类名）的缓存失效"""
+    transaction.on_commit(lambda: bump('categories', 'posts', 'feeds'))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_cache(sender, instance: Comment, **kwargs):
+    """评论变化后使评论列表和文章列表（含评论数）的缓存失效"""
+    transaction.on_commit(lambda: bump('comments', *namespaces_for_post(instance.post_id)))
@@ -0,0 +1,161 @@
+import gzip
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from blog_comment.models import Comment
+from blog_post import views
+from blog_post.models import Post, RelatedPosts
+
+# 记录上次构建时间和已导出文章的状态文件
+STATE_FILE = '.snapshot-state.json'
+
+
+class SnapshotError(Exception):
+    """接口未返回 200"""
+
+
+def render_api(name: str, view_cls, query: Optional[Dict[str, Any]] = None) -> bytes:
+    """
+    在进程内调用接口视图，得到与线上请求完全一致的 JSON（经过同样的渲染器和响应缓存）
+    :param name: 路由名（blog_post 的 URL 名称）
+    :param view_cls: 视图类
+    :param query: 查询参数
+    :return: 响应体
+    :raise SnapshotError: 接口未返回 200
+    """
+    request = RequestFactory().get(reverse(name), query or {})
+    response = view_cls.as_view()(request)
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        raise SnapshotError(f'{request.get_full_path()} 返回 {response.status_code}')
+    return response.content
+
+
+def _atomic_write(path: Path, content: bytes) -> None:
+    """先写临时文件再替换，静态服务器不会读到写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+class SnapshotBuilder:
+    """
+    把公共读接口的响应写成 JSON 文件及其 gzip 预压缩版本，供静态服务器或 CDN 直接提供
+    目录结构：list/<页码>.json、hot.json、categories.json、tags.json、detail/<文章 id>.json
+    """
+
+    def __init__(self, root: Path, page_size: int = 10):
+        self.root = Path(root)
+        self.page_size = page_size
+        self.stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+
+    def write(self, relative: str, content: bytes) -> None:
+        """
+        写入一个快照及其 .gz 版本，内容未变化时不改动文件（保持 mtime 和 CDN 缓存）
+        :param relative: 相对路径
+        :param content: JSON 内容
+        :return: None
+        """
+        path = self.root / relative
+        if path.exists() and path.read_bytes() == content:
+            self.stats['unchanged'] += 1
+            return
+        # mtime=0 使相同内容的压缩结果一致
+        _atomic_write(path.with_name(path.name + '.gz'), gzip.compress(content, compresslevel=9, mtime=0))
+        _atomic_write(path, content)
+        self.stats['written'] += 1
+
+    def remove(self, relative: str) -> None:
+        """
+        删除一个快照及其 .gz 版本
+        :param relative: 相对路径
+        :return: None
+        """
+        for path in (self.root / relative, self.root / (relative + '.gz')):
+            if path.exists():
+                path.unlink()
+                self.stats['removed'] += 1
+
+    def load_state(self) -> Optional[Dict[str, Any]]:
+        """读取上次构建的状态，不存在时返回 None"""
+        path = self.root / STATE_FILE
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def save_state(self, built_at: datetime, post_ids: Set[int], pages: int) -> None:
+        """保存本次构建的状态"""
+        state = {'built_at': built_at.isoformat(), 'page_size': self.page_size, 'posts': sorted(post_ids), 'pages': pages}
+        _atomic_write(self.root / STATE_FILE, json.dumps(state).encode('utf-8'))
+
+    def build_lists(self, previous_pages: int = 0) -> int:
+        """
+        重写已发布文章的分页列表、热榜、分类和标签
+        :param previous_pages: 上次的列表页数，多出的页会被删除
+        :return: 列表页数
+        """
+        first = render_api('list', views.PostListView, {'page': 1, 'size': self.page_size, 'status': 'published'})
+        pages = max(json.loads(first)['data']['pages'], 1)
+        self.write('list/1.json', first)
+        for page in range(2, pages + 1):
+            self.write(f'list/{page}.json', render_api(
+                'list', views.PostListView, {'page': page, 'size': self.page_size, 'status': 'published'}
+            ))
+        for page in range(pages + 1, previous_pages + 1):
+            self.remove(f'list/{page}.json')
+
+        self.write('hot.json', render_api('hot', views.PostHotListView))
+        self.write('categories.json', render_api('category-list', views.CategoryListView))
+        self.write('tags.json', render_api('tags', views.TagListView))
+        return pages
+
+    def build(self, full: bool = False) -> Dict[str, int]:
+        """
+        构建快照
+        增量模式只重写上次构建后更新过、有新评论或相关文章变化的文章详情，删除已下线文章的详情；
+        有任何变化时重写列表类页面。阅读量、点赞数只通过计数器更新，不会触发增量重写，需定期 full 构建
+        :param full: 忽略上次状态，重写全部快照
+        :return: 统计
+        """
+        state = self.load_state() or {}
+        # 页大小变化后列表分页全部不同，按全量构建
+        full = full or not state or state.get('page_size') != self.page_size
+        # 先记下开始时间，构建期间发生的修改留给下一次
+        built_at = timezone.now()
+        published = dict(Post.objects.filter(status='published').values_list('id', 'updated_time'))
+        previous = set(state.get('posts', ()))
+        previous_pages = state.get('pages', 0)
+
+        if full:
+            changed = set(published)
+        else:
+            since = parse_datetime(state['built_at'])
+            # 评论数和相关文章不会更新文章的 updated_time，单独查询
+            touched = set(Comment.objects.filter(created_time__gt=since).values_list('post_id', flat=True))
+            touched.update(RelatedPosts.objects.filter(updated_time__gt=since).values_list('post_id', flat=True))
+            changed = {
+                post_id for post_id, updated_time in published.items()
+                if post_id not in previous or updated_time > since or post_id in touched
+            }
+        removed = previous - set(published)
+
+        for post_id in sorted(changed):
+            self.write(f'detail/{post_id}.json', render_api('detail', views.PostDetailView, {'id': post_id}))
+        for post_id in removed:
+            self.remove(f'detail/{post_id}.json')
+
+        pages = previous_pages
+        if full or changed or removed:
+            pages = self.build_lists(previous_pages)
+        self.save_state(built_at, set(published), pages)
+        return {**self.stats, 'details': len(changed), 'pages': pages}
@@ -0,0 +1,79 @@
+from typing import Dict, Iterable, List
+
+from django.db.models import Count, F
+
+from blog_post.models import Post, Tag
+
+
+def resolve_names(model, names: Iterable[str]) -> Dict[str, int]:
+    """
+    按名称批量获取或创建分类/标签：一次查询已有的，一次批量插入缺少的
+    :param model: Category / Tag
+    :param names: 名称
+    :return: {名称: id}
+    """
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(model.objects.filter(name__in=names).values_list('name', 'id'))
+    missing = names - set(ids)
+    if missing:
+        # 并发创建时忽略已存在的名称，再查一次拿到 id
+        model.objects.bulk_create([model(name=name) for name in missing], ignore_conflicts=True)
+        ids.update(model.objects.filter(name__in=missing).values_list('name', 'id'))
+    return ids
+
+
+def clean_tag_names(names: Iterable[str]) -> List[str]:
+    """
+    去掉空白和重复的标签名，保持原顺序
+    :param names: 标签名
+    :return: list
+    """
+    return list(dict.fromkeys(str(name).strip() for name in names if str(name).strip()))
+
+
+def set_post_tags(post: Post, names: Iterable[str]) -> None:
+    """
+    把文章的标签设置为 names，只增删有变化的关联（标签未变化时不写库）
+    增删走 post.tags.add/remove，标签计数、缓存和索引由 m2m_changed 信号维护
+    :param post: Post
+    :param names: 标签名
+    :return: None
+    """
+    target = set(resolve_names(Tag, clean_tag_names(names)).values())
+    current = set(Post.tags.through.objects.filter(post_id=post.pk).values_list('tag_id', flat=True))
+    if current - target:
+        post.tags.remove(*(current - target))
+    if target - current:
+        post.tags.add(*(target - current))
+
+
+def apply_tag_delta(tag_ids: Iterable[int], delta: int) -> None:
+    """
+    调整标签的文章数
+    :param tag_ids: 标签 id
+    :param delta: 变化量
+    :return: None
+    """
+    tag_ids = list(tag_ids)
+    if tag_ids and delta:
+        Tag.objects.filter(id__in=tag_ids).update(post_count=F('post_count') + delta)
+
+
+def reconcile_tag_counts() -> int:
+    """
+    按关联表重算所有标签的文章数，修复漂移
+    :return: 被修正的标签数
+    """
+    actual = dict(
+        Post.tags.through.objects.order_by().values('tag_id').annotate(count=Count('id')).values_list('tag_id', 'count')
+    )
+    fixed = []
+    for tag in Tag.objects.only('id', 'post_count'):
+        count = actual.get(tag.id, 0)
+        if tag.post_count != count:
+            tag.post_count = count
+            fixed.append(tag)
+    Tag.objects.bulk_update(fixed, ['post_count'])
+    return len(fixed)
@@ -1,3 +1,108 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
 
-# Create your tests here.
+from anonymous_users import resolver
+from anonymous_users.models import AnonymousUser
+from blog_post import view_counter
+from blog_post.models import Category, Post, PostLikeRecord, PostViewRecord
+
+
+class AsyncPostDetailViewCountTest(TestCase):
+    """异步文章详情记录已注册访客的浏览"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = get_user_model().objects.create_user('author', password='password')
+        category = Category.objects.create(name='数据库')
+        cls.post = Post.objects.create(title='标题', content_markdown='正文', author=author,
+                                       status='published', category=category)
+        cls.visitor = AnonymousUser.objects.create(browser_fingerprint='fingerprint', nickname='访客')
+
+    async def _view(self, config):
+        """按给定计数器配置访问一次详情，返回响应"""
+        counter = view_counter.ViewCounter({**view_counter.DEFAULT_CONFIG, **config})
+        with mock.patch.object(view_counter, '_instance', counter):
+            return await self.async_client.get(
+                '/api/async/posts/detail/', {'id': self.post.id}, headers={'X-Fingerprint': 'fingerprint'}
+            )
+
+    async def test_counter_disabled_writes_immediately(self):
+        response = await self._view({'ENABLED': False})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(await PostViewRecord.objects.filter(post=self.post, visitor=self.visitor).aexists())
+
+    async def test_counter_full_buffer_flushes(self):
+        response = await self._view({'ENABLED': True, 'MAX_PENDING': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(await PostViewRecord.objects.filter(post=self.post, visitor=self.visitor).aexists())
+
+
+class LikePostTest(TestCase):
+    """点赞按插入结果判断重复，访客或文章不存在时返回 400"""
+
+    @classmethod
+    def setUpTestData(cls):
+        author = get_user_model().objects.create_user('author', password='password')
+        category = Category.objects.create(name='数据库')
+        cls.post = Post.objects.create(title='标题', content_markdown='正文', author=author,
+                                       status='published', category=category)
+        cls.visitor = AnonymousUser.objects.create(browser_fingerprint='fingerprint', nickname='访客')
+
+    def setUp(self):
+        # 每个用例使用独立的访客解析缓存
+        patcher = mock.patch.object(resolver, '_instance', resolver.VisitorResolver(resolver.DEFAULT_CONFIG))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _like(self, post_id):
+        return self.client.post('/api/posts/like/', {'id': post_id}, content_type='application/json',
+                                headers={'X-Fingerprint': 'fingerprint'})
+
+    def _stars(self):
+        return Post.objects.values_list('stars', flat=True).get(id=self.post.id)
+
+    def test_first_like(self):
+        response = self._like(self.post.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._stars(), 1)
+        self.assertTrue(PostLikeRecord.objects.filter(post=self.post, visitor=self.visitor).exists())
+
+    def test_repeated_like(self):
+        self._like(self.post.id)
+        response = self._like(self.post.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['msg'], '不能重复点赞')
+        self.assertEqual(self._stars(), 1)
+
+    def test_batch_reports_missing_post(self):
+        self._like(self.post.id)
+        response = self.client.post('/api/posts/like/batch/', {'ids': [self.post.id, 999999]},
+                                    content_type='application/json', headers={'X-Fingerprint': 'fingerprint'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'], {'liked': [], 'duplicate': [self.post.id], 'missing': [999999]})
+        self.assertEqual(self._stars(), 1)
+
+    def _stale_visitor(self):
+        """访客在其他进程被删除，本进程的解析缓存中仍有它的 id"""
+        AnonymousUser.objects.filter(id=self.visitor.id).delete()
+        resolver.get_visitor_resolver()._cache.set('fingerprint', self.visitor.id, 600)
+
+    def test_stale_visitor(self):
+        self._stale_visitor()
+        response = self._like(self.post.id)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['msg'], '访客不存在！')
+        self.assertEqual(self._stars(), 0)
+        self.assertFalse(PostLikeRecord.objects.exists())
+        # 解析缓存已清除，再次请求按未注册处理
+        self.assertIsNone(resolver.get_visitor_resolver().resolve('fingerprint'))
+
+    def test_stale_visitor_batch(self):
+        self._stale_visitor()
+        response = self.client.post('/api/posts/like/batch/', {'ids': [self.post.id]},
+                                    content_type='application/json', headers={'X-Fingerprint': 'fingerprint'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self._stars(), 0)
+        self.assertFalse(PostLikeRecord.objects.exists())
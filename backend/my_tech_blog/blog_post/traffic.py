@@ -0,0 +1,153 @@
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from blog_post.models import DailyTrafficRollup, PostViewRecord
+from utils.hyperloglog import HyperLogLog
+
+
+def add_daily_views(day: date, count: int) -> None:
+    """
+    新的浏览记录写入后累加当日访问量
+    :param day: 日期（当前时区）
+    :param count: 新增访问量
+    :return: None
+    """
+    if count <= 0:
+        return
+    if DailyTrafficRollup.objects.filter(date=day).update(views=F('views') + count):
+        return
+    try:
+        # 当天第一次写入，并发时由唯一约束保证只有一行
+        with transaction.atomic():
+            DailyTrafficRollup.objects.create(date=day, views=count)
+    except IntegrityError:
+        DailyTrafficRollup.objects.filter(date=day).update(views=F('views') + count)
+
+
+def add_daily_visitors(day: date, visitor_ids: Iterable[int]) -> None:
+    """
+    把访客加入当日的独立访客草图（需在事务中调用，锁定当日汇总行后合并写回）
+    :param day: 日期（当前时区）
+    :param visitor_ids: 访客 id
+    :return: None
+    """
+    visitor_ids = set(visitor_ids)
+    if not visitor_ids:
+        return
+    rollup = DailyTrafficRollup.objects.select_for_update().filter(date=day).first()
+    if rollup is None:
+        try:
+            with transaction.atomic():
+                rollup = DailyTrafficRollup.objects.create(date=day)
+        except IntegrityError:
+            rollup = DailyTrafficRollup.objects.select_for_update().get(date=day)
+
+    sketch = HyperLogLog.from_bytes(rollup.visitor_sketch)
+    before = sketch.to_bytes()
+    sketch.update(visitor_ids)
+    if sketch.to_bytes() != before:
+        rollup.visitor_sketch = sketch.to_bytes()
+        rollup.save(update_fields=['visitor_sketch', 'updated_time'])
+
+
+def day_start(day: date) -> datetime:
+    """当前时区某天零点"""
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def rollup_traffic(start: date, end: date, replace_sketches: bool = False) -> int:
+    """
+    按浏览记录重算 [start, end] 每天的访问量和访客草图并写入汇总表
+    按 viewed_at 的时间范围过滤，可以使用索引
+    浏览记录只保留每位访客对每篇文章的首次浏览，重建的草图不包含回访的访客，
+    因此默认与已有草图按寄存器取最大值合并（保留 add_daily_visitors 实时记录的回访访客），只有回填时才覆盖
+    :param start: 起始日期
+    :param end: 结束日期（包含）
+    :param replace_sketches: 是否用重建的草图覆盖已有草图
+    :return: 写入的天数
+    """
+    records = PostViewRecord.objects.filter(
+        viewed_at__gte=day_start(start), viewed_at__lt=day_start(end + timedelta(days=1))
+    )
+    counts = {
+        row['day']: row['count']
+        for row in records.annotate(day=TruncDate('viewed_at')).values('day').annotate(count=Count('id')).order_by()
+    }
+    # 草图只能由访客 id 重建（浏览记录每人每篇文章只有一条，重建结果只包含当天首次浏览的访客）
+    sketches = {}
+    for day, visitor_id in records.annotate(day=TruncDate('viewed_at')).values_list('day', 'visitor_id').iterator():
+        sketches.setdefault(day, HyperLogLog()).add(visitor_id)
+
+    with transaction.atomic():
+        if not replace_sketches:
+            # 锁定已有汇总行，避免与 add_daily_visitors 的合并写回交错
+            stored = DailyTrafficRollup.objects.select_for_update().filter(date__gte=start, date__lte=end)
+            for day, data in stored.values_list('date', 'visitor_sketch'):
+                if not data:
+                    continue
+                if day in sketches:
+                    sketches[day].merge(HyperLogLog.from_bytes(data))
+                else:
+                    sketches[day] = HyperLogLog.from_bytes(data)
+
+        rows = []
+        day = start
+        while day <= end:
+            sketch = sketches.get(day)
+            rows.append(DailyTrafficRollup(
+                date=day, views=counts.get(day, 0), visitor_sketch=sketch.to_bytes() if sketch else b''
+            ))
+            day += timedelta(days=1)
+        DailyTrafficRollup.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=['date'], update_fields=['views', 'visitor_sketch', 'updated_time']
+        )
+    return len(rows)
+
+
+def first_view_date() -> Optional[date]:
+    """
+    最早一条浏览记录的日期
+    :return: date，没有记录时返回 None
+    """
+    first = PostViewRecord.objects.order_by('viewed_at').values_list('viewed_at', flat=True).first()
+    return timezone.localdate(first) if first else None
+
+
+def daily_views(start: date, end: date) -> Dict[date, int]:
+    """
+    读取 [start, end] 的每日访问量
+    :param start: 起始日期
+    :param end: 结束日期（包含）
+    :return: {日期: 访问量}，没有汇总行的日期不在结果中
+    """
+    return dict(DailyTrafficRollup.objects.filter(date__range=(start, end)).values_list('date', 'views'))
+
+
+def daily_sketches(start: date, end: date) -> Dict[date, bytes]:
+    """
+    读取 [start, end] 每天的访客草图
+    :param start: 起始日期
+    :param end: 结束日期（包含）
+    :return: {日期: 草图}
+    """
+    return {
+        day: bytes(sketch)
+        for day, sketch in DailyTrafficRollup.objects.filter(date__range=(start, end)).values_list('date', 'visitor_sketch')
+        if sketch
+    }
+
+
+def unique_visitors(sketches: Dict[date, bytes], start: date, end: date) -> int:
+    """
+    合并日期范围内的草图，估算独立访客数
+    :param sketches: daily_sketches 的结果
+    :param start: 起始日期
+    :param end: 结束日期（包含）
+    :return: int
+    """
+    return HyperLogLog.union(sketch for day, sketch in sketches.items() if start <= day <= end).count()
@@ -13,7 +13,11 @@ urlpatterns = [
     path('category/list/', views.CategoryListView.as_view(), name='category-list'),
     path('category/add/', views.CategoryAddView.as_view(), name='category-add'),
     path('category/delete/', views.CategoryDeleteView.as_view(), name='category-delete'),
+    path('tags/', views.TagListView.as_view(), name='tags'),
     path('like/', views.LikePostView.as_view(), name='like'),
+    path('like/batch/', views.LikePostBatchView.as_view(), name='like-batch'),
     path('traffic-statistics/', views.TrafficStatisticsPostView.as_view(), name='traffic-statistics'),
     path('chart-data/', views.PostChartDataView.as_view(), name='chart-data'),
+    path('export/', views.RecordExportView.as_view(), name='export'),
+    path('metrics/', views.RuntimeMetricsView.as_view(), name='metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,197 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from blog_post.counters import apply_author_delta
+from blog_post.models import Post, PostViewRecord
+from blog_post.ranking import refresh_hot_score
+from blog_post.traffic import add_daily_views, add_daily_visitors
+from utils.db.routing import primary
+from utils.response_cache import bump
+
+logger = logging.getLogger(__name__)
+
+# 默认配置，可在 settings.VIEW_COUNTER 中覆盖
+DEFAULT_CONFIG = {
+    # 关闭后每次浏览同步写库
+    'ENABLED': True,
+    # 缓冲区达到这么多条（去重后）立即写库
+    'MAX_PENDING': 500,
+    # 缓冲区最多保留这么多秒
+    'FLUSH_INTERVAL': 5.0,
+}
+
+# (访客 id, 文章 id)
+ViewEvent = Tuple[int, int]
+
+
+class ViewCounter:
+    """
+    写后缓冲的阅读计数器
+    浏览事件先在内存中去重，按数量或时间批量写入浏览记录，并按文章聚合成一条 UPDATE
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.enabled = bool(config['ENABLED'])
+        self._pending: Set[ViewEvent] = set()
+        self._lock = threading.Lock()
+        # 同一时间只允许一个线程写库，保证去重查询和插入之间不被交错
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._stats = {
+            'enqueued': 0, 'duplicates': 0, 'flushes': 0,
+            'recorded': 0, 'skipped': 0, 'failures': 0,
+        }
+
+    def record(self, visitor_id: int, post_id: int) -> None:
+        """
+        记录一次浏览（每位访客每篇文章只计一次）
+        :param visitor_id: 访客 id
+        :param post_id: 文章 id
+        :return: None
+        """
+        if not self.enabled:
+            with primary():
+                self._write({(visitor_id, post_id)})
+            return
+
+        with self._lock:
+            event = (visitor_id, post_id)
+            if event in self._pending:
+                self._stats['duplicates'] += 1
+                return
+            self._pending.add(event)
+            self._stats['enqueued'] += 1
+            full = len(self._pending) >= self.config['MAX_PENDING']
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.config['FLUSH_INTERVAL'], self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        把缓冲区写入数据库
+        :return: 新增的浏览记录数
+        """
+        with self._flush_lock:
+            with self._lock:
+                events, self._pending = self._pending, set()
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not events:
+                return 0
+
+            try:
+                # 去重查询读主库；计数写入不让请求固定到主库
+                with primary():
+                    return self._write(events)
+            except Exception:
+                # 写库失败时放回缓冲区，等待下次重试
+                logger.exception('写入浏览记录失败，%d 条事件等待重试', len(events))
+                with self._lock:
+                    self._stats['failures'] += 1
+                    self._pending |= events
+                return 0
+
+    def _flush_on_timer(self) -> None:
+        """定时器线程中写库，结束后关闭本线程的数据库连接"""
+        try:
+            self.flush()
+        finally:
+            connections.close_all()
+
+    def _write(self, events: Set[ViewEvent]) -> int:
+        """
+        批量写入浏览记录，按文章聚合累加阅读量，并更新当日访问量、访客草图和作者浏览量
+        :param events: 去重后的浏览事件
+        :return: 新增的浏览记录数
+        """
+        post_ids = {post_id for _, post_id in events}
+        visitor_ids = {visitor_id for visitor_id, _ in events}
+
+        # 过滤已删除的文章和已有的浏览记录
+        post_authors = dict(Post.objects.filter(id__in=post_ids).values_list('id', 'author_id'))
+        recorded = set(PostViewRecord.objects.filter(
+            post_id__in=post_authors, visitor_id__in=visitor_ids
+        ).values_list('visitor_id', 'post_id'))
+        new_events = [
+            (visitor_id, post_id) for visitor_id, post_id in events
+            if post_id in post_authors and (visitor_id, post_id) not in recorded
+        ]
+
+        per_post = Counter(post_id for _, post_id in new_events)
+        # 重复浏览不计阅读量，但仍是当天的访客
+        visitors = {visitor_id for visitor_id, post_id in events if post_id in post_authors}
+        with transaction.atomic():
+            if per_post:
+                PostViewRecord.objects.bulk_create(
+                    [PostViewRecord(visitor_id=visitor_id, post_id=post_id) for visitor_id, post_id in new_events],
+                    ignore_conflicts=True,
+                )
+                for post_id, count in per_post.items():
+                    Post.objects.filter(id=post_id).update(views=F('views') + count)
+                add_daily_views(timezone.localdate(), len(new_events))
+                # 按作者聚合累加作者统计
+                per_author = Counter()
+                for post_id, count in per_post.items():
+                    per_author[post_authors[post_id]] += count
+                for author_id, count in per_author.items():
+                    apply_author_delta(author_id, views=count)
+            add_daily_visitors(timezone.localdate(), visitors)
+        if per_post:
+            self._after_write(per_post)
+
+        with self._lock:
+            self._stats['flushes'] += 1
+            self._stats['recorded'] += len(new_events)
+            self._stats['skipped'] += len(events) - len(new_events)
+        return len(new_events)
+
+    @staticmethod
+    def _after_write(post_ids: Iterable[int]) -> None:
+        """阅读量变化后刷新热度并使文章详情缓存失效"""
+        for post_id in post_ids:
+            refresh_hot_score(post_id)
+        bump(*(f'post:{post_id}' for post_id in post_ids))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        当前进程的计数器状态
+        :return: dict
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        stats['enabled'] = self.enabled
+        return stats
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_view_counter() -> ViewCounter:
+    """
+    获取按 settings.VIEW_COUNTER 创建的全局计数器实例
+    :return: ViewCounter
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ViewCounter({**DEFAULT_CONFIG, **getattr(settings, 'VIEW_COUNTER', {})})
+                # 进程正常退出前写入剩余的浏览事件
+                atexit.register(_instance.flush)
+    return _instance
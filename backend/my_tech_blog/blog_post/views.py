@@ -1,25 +1,48 @@
-from datetime import timedelta
+from collections import defaultdict
+from datetime import date, timedelta
 
 from django.core.paginator import Paginator, EmptyPage
 from django.db import IntegrityError
-from django.db.models import Sum, F, Count
-from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
-from django.forms import model_to_dict
+from django.db.models import Q, Sum, Count, Max, OuterRef, Subquery
+from django.http import StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
+from django.views import View
 from rest_framework import status, permissions
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from anonymous_users.models import AnonymousUser
+from anonymous_users.resolver import get_visitor_resolver, resolve_visitor_id
 from blog_comment.models import Comment
-from blog_post.models import Post, Category, Tag, PostViewRecord, PostLikeRecord
+from blog_post.counters import recount_author
+from blog_post.export import EXPORT_FORMATS, EXPORT_KINDS, iter_records, render_records
+from blog_post.feeds import (
+    FEED_FORMATS, SITEMAP_CONTENT_TYPE, build_feed, build_sitemap, build_sitemap_index, document_response
+)
+from blog_post.likes import DUPLICATE, LIKED, MISSING, VisitorNotFound, like_posts
+from blog_post.models import Post, Category, Tag, DailyTrafficRollup, AuthorStatistics, RelatedPosts
+from blog_post.serializers import DETAIL_FIELDS, FIELD_COLUMNS, LIST_FIELDS, PostListSerializer, parse_fields, post_list_queryset
+from blog_post.related import related_posts
+from blog_post.tags import set_post_tags
+from blog_post.traffic import daily_sketches, daily_views, unique_visitors
+from blog_post.view_counter import get_view_counter
+from blog_search.indexer import matching_post_ids
+from utils.async_limit import stats as async_view_stats
+from utils.conditional import make_etag, not_modified, representation_etag, set_validators
+from utils.db.pool import stats as db_pool_stats
+from utils.db.routing import stats as db_routing_stats
+from utils.pagination import MAX_PAGE_SIZE, KeysetPaginator, InvalidCursor
+from utils.renderers import api_response
+from utils.response_cache import cache_response, get_response_cache
 
 
 class StatisticsView(APIView):
     """统计文章视图"""
 
     permission_classes = [permissions.IsAuthenticated]
+    # 仪表盘统计读从库（见 utils.db.middleware）
+    use_replica = True
 
     def get(self, request):
         """
@@ -27,23 +50,16 @@ class StatisticsView(APIView):
         :param request: Request
         :return: Response
         """
-        user_posts = Post.objects.filter(author=request.user)
-        # 浏览量
-        views = user_posts.aggregate(total_views_sum=Sum('views')).get('total_views_sum') or 0
-        # 已发布
-        published = user_posts.filter(status='published').count()
-        # 评论数
-        comments = Comment.objects.filter(post__in=user_posts).count()
-        # 点赞数
-        stars = user_posts.aggregate(total_stars_sum=Sum('stars')).get('total_stars_sum') or 0
+        # 作者统计由写路径维护，按主键读取；统计行不存在时完整统计一次
+        statistics = AuthorStatistics.objects.filter(pk=request.user.pk).first() or recount_author(request.user.pk)
 
         # 构造返回数据
         data = {
-            'total': user_posts.count(),
-            'views': views,
-            'published': published,
-            'comments': comments,
-            'stars': stars,
+            'total': statistics.total_posts,
+            'views': statistics.views,
+            'published': statistics.published_posts,
+            'comments': statistics.comments,
+            'stars': statistics.stars,
         }
 
         return Response(data, status=status.HTTP_200_OK)
@@ -60,13 +76,13 @@ class RecentView(APIView):
         :param request: Request
         :return: Response
         """
-        user_posts = Post.objects.filter(author=request.user)
-        data = []
-        for i in user_posts.order_by('-created_time')[:3]:
-            item = model_to_dict(i)
-            item['tags'] = [t.name for t in i.tags.all()]
-            item['created_time'] = i.created_time.strftime('%Y-%m-%d %H:%M:%S')
-            data.append(item)
+        try:
+            fields = parse_fields(request.GET.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return Response({'detail': f'未知字段：{e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        user_posts = post_list_queryset(Post.objects.filter(author=request.user), fields)
+        data = PostListSerializer(user_posts.order_by('-created_time')[:3], many=True, fields=fields).data
         return Response({'recentArticles': data}, status=status.HTTP_200_OK)
 
 
@@ -75,9 +91,11 @@ class PostListView(APIView):
 
     permission_classes = [permissions.AllowAny]
 
+    @cache_response('posts')
     def get(self, request):
         """
         根据页数和页码获取文章列表
+        传入 cursor 参数（首页为空值）时使用游标分页，返回 next 游标，total=estimate 时返回估算总数
         :param request: Request
         :return: Response
         """
@@ -87,36 +105,57 @@ class PostListView(APIView):
             size = int(request.GET.get('size', 10))
         except ValueError:
             return Response({'detail': 'page/size 需为整数'}, status=status.HTTP_400_BAD_REQUEST)
+        if size < 1:
+            return Response({'detail': 'size 需大于 0'}, status=status.HTTP_400_BAD_REQUEST)
+        size = min(size, MAX_PAGE_SIZE)
+
+        # 返回字段，默认不含正文
+        try:
+            fields = parse_fields(request.GET.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return Response({'detail': f'未知字段：{e}'}, status=status.HTTP_400_BAD_REQUEST)
 
         # 搜索关键字
         keyword = request.GET.get('keyword', '')
 
         post = Post.objects.all()
         if len(keyword) > 0:
-            post = post.filter(title__icontains=keyword)
+            # 通过全文索引匹配（子查询），关键字无法分词时退回标题模糊匹配
+            post_ids = matching_post_ids(keyword)
+            if post_ids is None:
+                post = post.filter(title__icontains=keyword)
+            else:
+                post = post.filter(id__in=post_ids)
 
         # 状态
         status_param = request.GET.get('status', '')
         if len(status_param) > 0 and status_param in [i for i, j in Post.STATUS_CHOICES]:
             post = post.filter(status=status_param)
 
+        # 游标模式：按 (created_time, id) 翻页，不计算精确总数
+        if 'cursor' in request.GET:
+            paginator = KeysetPaginator(post_list_queryset(post, fields), size)
+            try:
+                items, next_cursor = paginator.page(request.GET.get('cursor'))
+            except InvalidCursor:
+                return Response({'detail': 'cursor 无效'}, status=status.HTTP_400_BAD_REQUEST)
+            data = PostListSerializer(items, many=True, fields=fields).data
+            return Response(
+                paginator.response_data(data, next_cursor, request.GET.get('total', '')),
+                status=status.HTTP_200_OK
+            )
+
         # 处理页
-        paginator = Paginator(post, size)
+        paginator = Paginator(post_list_queryset(post, fields), size)
         try:
             posts = paginator.page(page)
         except EmptyPage:
             posts = paginator.page(paginator.num_pages)
 
-        data = []
-        for p in posts:
-            item = model_to_dict(p)
-            item['tags'] = [t.name for t in p.tags.all()]
-            item['created_time'] = p.created_time.strftime('%Y-%m-%d %H:%M:%S')
-            item['category'] = Category.objects.get(id=p.category.id).name
-            data.append(item)
+        data = PostListSerializer(posts, many=True, fields=fields).data
 
         return Response({
-            'total': post.count(),
+            'total': paginator.count,
             'pages': paginator.num_pages,
             'list': data
         }, status=status.HTTP_200_OK)
@@ -127,25 +166,24 @@ class PostHotListView(APIView):
 
     permission_classes = [permissions.AllowAny]
 
+    @cache_response('posts')
     def get(self, request):
         """
-        获取热度榜单（自动只返回已发布文章，按浏览量 > 点赞数，返回前10）
+        获取热度榜单（自动只返回已发布文章，按预先计算的热度排序，返回前10）
         :param request: Request
         :return: Response (格式与PostListView完全一致)
         """
-        # 热度榜单默认只返回 status='published' 的文章
-        posts_queryset = Post.objects.filter(
-            status='published').order_by('-views', '-stars')[:10]
+        try:
+            fields = parse_fields(request.GET.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return Response({'detail': f'未知字段：{e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 热度榜单默认只返回 status='published' 的文章，走 (status, -hot_score) 索引
+        posts_queryset = post_list_queryset(Post.objects.filter(
+            status='published'), fields).order_by('-hot_score')[:10]
 
         # 数据格式化
-        data = []
-        for p in posts_queryset:
-            item = model_to_dict(p)
-            item['tags'] = [t.name for t in p.tags.all()]
-            item['created_time'] = p.created_time.strftime('%Y-%m-%d %H:%M:%S')
-            item['category'] = p.category.name if p.category else ''
-            item['comments'] = Comment.objects.filter(post=p).count()
-            data.append(item)
+        data = PostListSerializer(posts_queryset, many=True, fields=fields).data
 
         # 返回
         return Response({'list': data}, status=status.HTTP_200_OK)
@@ -158,7 +196,8 @@ class PostDetailView(APIView):
 
     def get(self, request):
         """
-        根据页数和页码获取文章列表
+        根据文章 id 获取文章详情，并记录访客浏览
+        format=html 时返回渲染后的 HTML 和目录
         :param request: Request
         :return: Response
         """
@@ -168,34 +207,114 @@ class PostDetailView(APIView):
         except ValueError:
             return Response({'detail': 'id 需为整数'}, status=status.HTTP_400_BAD_REQUEST)
 
-        fingerprint = request.headers.get('X-Fingerprint', None)
-        anonymous_user = None
-        if fingerprint:
-            # 查询访客
-            anonymous_user = AnonymousUser.objects.filter(browser_fingerprint=fingerprint)
-            if anonymous_user.exists():
-                anonymous_user = anonymous_user.first()
-
-        post = Post.objects.filter(id=id_param).first()
-        if not post:
-            return Response({'detail': '文章不存在！'}, status=status.HTTP_200_OK)
+        # 浏览记录在缓存之外处理，命中缓存时也会计数
+        self.record_view(request, id_param)
+
+        # 条件请求：只查询更新时间、计数器和评论状态，未变化时直接返回 304
+        validators = self._validators(request, id_param)
+        if validators:
+            unchanged = not_modified(request, *validators)
+            if unchanged is not None:
+                return unchanged
+
+        response = self._detail(request, id_param)
+        if validators and response.status_code == 200:
+            set_validators(response, *validators)
+        return response
+
+    @staticmethod
+    def validator_queryset(post_id: int):
+        """
+        读取计算 ETag 所需的更新时间、计数器和评论状态（不读取正文列）
+        :param post_id: 文章 id
+        :return: QuerySet
+        """
+        comments = Comment.objects.filter(post=OuterRef('pk')).order_by().values('post')
+        return Post.objects.filter(id=post_id).values('updated_time', 'views', 'stars').annotate(
+            comment_count=Subquery(comments.annotate(count=Count('*')).values('count')),
+            last_comment_time=Subquery(comments.annotate(latest=Max('created_time')).values('latest')),
+            related_time=Subquery(RelatedPosts.objects.filter(post=OuterRef('pk')).values('updated_time')),
+        )
+
+    @staticmethod
+    def validators_from_row(request, post_id: int, row):
+        """
+        由 validator_queryset 的结果计算 ETag 和最后修改时间
+        :param request: Request
+        :param post_id: 文章 id
+        :param row: 查询结果，文章不存在时为 None
+        :return: (etag, last_modified)，文章不存在时返回 None
+        """
+        if not row:
+            return None
+
+        # 查询参数不同，返回的表示不同
+        variant = '&'.join(f'{k}={v}' for k, v in sorted(request.GET.items()))
+        etag = representation_etag(request, make_etag(
+            post_id, row['updated_time'].isoformat(), row['views'], row['stars'],
+            row['comment_count'] or 0, row['last_comment_time'], row['related_time'], variant
+        ))
+        last_modified = max(filter(None, (row['updated_time'], row['last_comment_time'], row['related_time'])))
+        return etag, last_modified
+
+    def _validators(self, request, post_id: int):
+        """
+        计算文章详情的 ETag 和最后修改时间
+        :param request: Request
+        :param post_id: 文章 id
+        :return: (etag, last_modified)，文章不存在时返回 None
+        """
+        return self.validators_from_row(request, post_id, self.validator_queryset(post_id).first())
+
+    @staticmethod
+    def detail_fields(request):
+        """
+        解析详情接口的返回字段，format=html 时默认返回服务端渲染的 HTML 和目录，替代 Markdown 原文
+        :param request: Request
+        :return: 字段元组
+        :raise ValueError: 存在未知字段
+        """
+        default_fields = DETAIL_FIELDS
+        if request.GET.get('format') == 'html':
+            default_fields = LIST_FIELDS + ('content_html', 'toc', 'related')
+        return parse_fields(request.GET.get('fields'), default_fields, FIELD_COLUMNS)
+
+    @staticmethod
+    def record_view(request, post_id: int) -> None:
+        """
+        记录访客浏览（每位访客每篇文章只计一次），由计数器缓冲后批量写库
+        :param request: Request
+        :param post_id: 文章 id
+        :return: None
+        """
+        # 解析访客（无指纹或未注册时不计数）
+        visitor_id = resolve_visitor_id(request)
+        if not visitor_id:
+            return
 
-        # 查询当前文章是否被访客查看过
-        if anonymous_user:
-            record = PostViewRecord.objects.filter(visitor=anonymous_user, post=post).first()
-            if not record:
-                # 保存浏览记录
-                record = PostViewRecord.objects.create(visitor=anonymous_user, post=post)
-                record.save()
+        get_view_counter().record(visitor_id, post_id)
 
-                # 更新views
-                Post.objects.filter(id=id_param).update(views=F('views') + 1)
+    @cache_response(lambda request: f"post:{int(request.GET['id'])}", conditional=False)
+    def _detail(self, request, post_id: int):
+        """
+        组装文章详情数据
+        :param request: Request
+        :param post_id: 文章 id
+        :return: Response
+        """
+        try:
+            fields = self.detail_fields(request)
+        except ValueError as e:
+            return Response({'detail': f'未知字段：{e}'}, status=status.HTTP_400_BAD_REQUEST)
 
-        data = model_to_dict(Post.objects.get(id=id_param))
-        data['tags'] = [t.name for t in post.tags.all()]
-        data['created_time'] = post.created_time.strftime('%Y-%m-%d %H:%M:%S')
-        data['category'] = Category.objects.get(id=post.category.id).name
-        data['views'] = data['views']
+        post = post_list_queryset(Post.objects.filter(id=post_id), fields).first()
+        if not post:
+            return Response({'detail': '文章不存在！'}, status=status.HTTP_200_OK)
+
+        data = PostListSerializer(post, fields=fields).data
+        if 'related' in fields:
+            # 相关文章由索引预先计算，这里只按主键读取
+            data['related'] = related_posts(post_id)
 
         return Response({
             'data': data
@@ -207,21 +326,46 @@ class CategoryListView(APIView):
 
     permission_classes = [permissions.AllowAny]
 
+    @cache_response('categories')
     def get(self, request):
         """
-        获取所有分类
+        获取所有分类（文章数来自分类表上维护的计数，一次查询）
         :param request: Request
         :return: Response
         """
         data = []
-        for i in Category.objects.all():
-            item = model_to_dict(i)
-            item['count'] = Post.objects.filter(category=i).count()
+        for item in Category.objects.values('id', 'name', 'description', 'published_count', 'draft_count'):
+            item['count'] = item['published_count'] + item['draft_count']
             data.append(item)
 
         return Response({'list': data}, status=status.HTTP_200_OK)
 
 
+class TagListView(APIView):
+    """标签列表视图"""
+
+    permission_classes = [permissions.AllowAny]
+
+    @cache_response('tags')
+    def get(self, request):
+        """
+        获取标签及其文章数（标签云），按文章数倒序
+        :param request: Request
+        :return: Response
+        """
+        try:
+            limit = int(request.GET['limit']) if request.GET.get('limit') else None
+        except ValueError:
+            return Response({'detail': 'limit 需为整数'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 文章数由标签关联的信号维护，直接读取计数列
+        tags = Tag.objects.filter(post_count__gt=0).order_by('-post_count', 'name').values('id', 'name', 'post_count')
+        if limit:
+            tags = tags[:limit]
+        data = [{'id': tag['id'], 'name': tag['name'], 'count': tag['post_count']} for tag in tags]
+        return Response({'list': data}, status=status.HTTP_200_OK)
+
+
 class CategoryAddView(APIView):
     """分类新增视图"""
 
@@ -294,24 +438,18 @@ class PostAddView(APIView):
 
         # 提取category，如果不存在直接返回404
         category = get_object_or_404(Category, name=data['category']) if data.get('category') else None
-        # 提取tag
-        tag_objs = []
-        if data.get('tags'):
-            # get_or_create，获取到tag或者创建tag
-            tag_objs = [Tag.objects.get_or_create(name=t)[0] for t in data['tags']]
 
         # 创建文章
         post = Post.objects.create(
             title=data['title'],
             content_markdown=data['content_markdown'],
-            excerpt=data.get('content_markdown', '')[:10],
             status=data.get('status', 'draft'),
             category=category,
             author=request.user
         )
-        if tag_objs:
-            for tag in tag_objs:
-                post.tags.add(tag)
+        # 标签：一次查询已有标签，批量创建缺少的，一次写入关联
+        if data.get('tags'):
+            set_post_tags(post, data['tags'])
 
         return Response({'id': post.id, 'detail': '创建成功'}, status=status.HTTP_201_CREATED)
 
@@ -361,25 +499,19 @@ class PostUpdateView(APIView):
             if not data.get(field):
                 return Response({'detail': f'{field} 不能为空'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 摘要
-        excerpt = data['content_markdown'][:300]
-
         # 处理分类（如果提供新分类则更新）
         category = None
         if data.get('category'):
             category = get_object_or_404(Category, name=data['category'])
 
-        # 处理标签：清除旧标签，添加新标签
+        # 处理标签：只增删有变化的关联
         if data.get('tags'):
-            post.tags.clear()  # 清除所有现有标签
-            tag_objs = [Tag.objects.get_or_create(name=t)[0] for t in data['tags']]
-            for tag in tag_objs:
-                post.tags.add(tag)
+            set_post_tags(post, data['tags'])
 
         # 更新文章内容
         post.title = data['title']
+        # 摘要在保存时由渲染流程根据正文生成
         post.content_markdown = data['content_markdown']
-        post.excerpt = excerpt
         post.status = data.get('status', post.status)  # 保留原状态（如果未提供）
         if category:
             post.category = category
@@ -405,40 +537,86 @@ class LikePostView(APIView):
         fingerprint = request.headers.get('X-Fingerprint', None)
         if not post_id or not fingerprint:
             return Response({'detail': '参数残缺'}, status=status.HTTP_400_BAD_REQUEST)
-
-        # 查询文章
-        post = Post.objects.filter(id=post_id).first()
-        if not post:
-            return Response({'detail': '文章不存在！'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            post_id = int(post_id)
+        except (TypeError, ValueError):
+            return Response({'detail': 'id 需为整数'}, status=status.HTTP_400_BAD_REQUEST)
 
         # 查询访客
-        anonymous_user = AnonymousUser.objects.filter(browser_fingerprint=fingerprint).first()
-        if not anonymous_user:
+        visitor_id = resolve_visitor_id(request)
+        if not visitor_id:
             return Response({'detail': '访客不存在！'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 查询当前文章是否被访客点赞过
-        record = PostLikeRecord.objects.filter(visitor=anonymous_user, post=post)
-        if record.exists():
+        # 插入点赞记录，由唯一约束判断是否重复点赞，插入成功才累加 stars
+        try:
+            result = like_posts(visitor_id, [post_id])[post_id]
+        except VisitorNotFound:
+            # 解析缓存中的访客已被删除
+            get_visitor_resolver().invalidate(fingerprint)
+            return Response({'detail': '访客不存在！'}, status=status.HTTP_400_BAD_REQUEST)
+        if result == MISSING:
+            return Response({'detail': '文章不存在！'}, status=status.HTTP_400_BAD_REQUEST)
+        if result == DUPLICATE:
             return Response({'detail': '不能重复点赞'}, status=status.HTTP_400_BAD_REQUEST)
 
-        # 保存点赞记录
-        record = PostLikeRecord.objects.create(visitor=anonymous_user, post=post)
-        record.save()
+        return Response({'detail': '成功!'}, status=status.HTTP_200_OK)
 
-        # 更新stars
-        Post.objects.filter(id=post_id).update(stars=F('stars') + 1)
 
-        return Response({'detail': '成功!'}, status=status.HTTP_200_OK)
+class LikePostBatchView(APIView):
+    """批量点赞文章视图"""
+
+    permission_classes = [permissions.AllowAny]
+
+    # 单次请求最多点赞的文章数
+    max_batch_size = 50
+
+    def post(self, request, *args, **kwargs):
+        """
+        一次点赞多篇文章，返回每篇文章的点赞结果
+        :param request: Request
+        :param args: Arguments
+        :param kwargs: Kwargs
+        :return: Response
+        """
+        ids = request.data.get('ids', None)
+        fingerprint = request.headers.get('X-Fingerprint', None)
+        if not ids or not fingerprint or not isinstance(ids, list):
+            return Response({'detail': '参数残缺'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.max_batch_size:
+            return Response({'detail': f'单次最多点赞 {self.max_batch_size} 篇文章'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            post_ids = [int(post_id) for post_id in ids]
+        except (TypeError, ValueError):
+            return Response({'detail': 'ids 需为整数列表'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 查询访客
+        visitor_id = resolve_visitor_id(request)
+        if not visitor_id:
+            return Response({'detail': '访客不存在！'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = like_posts(visitor_id, post_ids)
+        except VisitorNotFound:
+            # 解析缓存中的访客已被删除
+            get_visitor_resolver().invalidate(fingerprint)
+            return Response({'detail': '访客不存在！'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'liked': [post_id for post_id, result in results.items() if result == LIKED],
+            'duplicate': [post_id for post_id, result in results.items() if result == DUPLICATE],
+            'missing': [post_id for post_id, result in results.items() if result == MISSING],
+        }, status=status.HTTP_200_OK)
 
 
 class TrafficStatisticsPostView(APIView):
     """流量数据统计视图"""
 
     permission_classes = [permissions.IsAuthenticated]
+    # 仪表盘统计读从库（见 utils.db.middleware）
+    use_replica = True
 
     def get(self, request):
         """
-        获取今日/本周/本月/总计访问量及环比趋势
+        获取今日/本周/本月/总计访问量、独立访客数（估算）及环比趋势
         :param request: Request
         :return: Response
         """
@@ -467,36 +645,42 @@ class TrafficStatisticsPostView(APIView):
             start_of_last_month = today.replace(month=today.month - 1, day=1)
 
         # ================ 查询统计 ================
-        # 今日访问
-        today_views = PostViewRecord.objects.filter(viewed_at__date=today).count()
-
-        # 昨日访问（用于环比）
-        yesterday_views = PostViewRecord.objects.filter(viewed_at__date=yesterday).count()
-
-        # 本周访问
-        this_week_views = PostViewRecord.objects.filter(
-            viewed_at__date__gte=start_of_this_week
-        ).count()
-
-        # 上周访问
-        last_week_views = PostViewRecord.objects.filter(
-            viewed_at__date__gte=start_of_last_week,
-            viewed_at__date__lt=start_of_this_week  # 不包含本周
-        ).count()
-
-        # 本月访问
-        this_month_views = PostViewRecord.objects.filter(
-            viewed_at__date__gte=start_of_this_month
-        ).count()
-
-        # 上月访问
-        last_month_views = PostViewRecord.objects.filter(
-            viewed_at__date__gte=start_of_last_month,
-            viewed_at__date__lt=start_of_this_month  # 不包含本月
-        ).count()
-
-        # 总访问（全站累计）
-        total_views = PostViewRecord.objects.count()
+        # 从每日汇总表一次读取全部区间（按日期过滤，行数与记录总数无关）
+        def days(start, end=today):
+            return Sum('views', filter=Q(date__gte=start, date__lte=end), default=0)
+
+        stats = DailyTrafficRollup.objects.aggregate(
+            # 今日访问
+            today_views=days(today),
+            # 昨日访问（用于环比）
+            yesterday_views=days(yesterday, yesterday),
+            # 本周访问
+            this_week_views=days(start_of_this_week),
+            # 上周访问（不包含本周）
+            last_week_views=days(start_of_last_week, start_of_this_week - timedelta(days=1)),
+            # 本月访问
+            this_month_views=days(start_of_this_month),
+            # 上月访问（不包含本月）
+            last_month_views=days(start_of_last_month, start_of_this_month - timedelta(days=1)),
+            # 总访问（全站累计）
+            total_views=Sum('views', default=0),
+        )
+        today_views = stats['today_views']
+        yesterday_views = stats['yesterday_views']
+        this_week_views = stats['this_week_views']
+        last_week_views = stats['last_week_views']
+        this_month_views = stats['this_month_views']
+        last_month_views = stats['last_month_views']
+        total_views = stats['total_views']
+
+        # 独立访客：合并每日访客草图估算（最多读取两个月的汇总行）
+        sketches = daily_sketches(min(start_of_last_month, start_of_last_week), today)
+        today_visitors = unique_visitors(sketches, today, today)
+        yesterday_visitors = unique_visitors(sketches, yesterday, yesterday)
+        this_week_visitors = unique_visitors(sketches, start_of_this_week, today)
+        last_week_visitors = unique_visitors(sketches, start_of_last_week, start_of_this_week - timedelta(days=1))
+        this_month_visitors = unique_visitors(sketches, start_of_this_month, today)
+        last_month_visitors = unique_visitors(sketches, start_of_last_month, start_of_this_month - timedelta(days=1))
 
         # ================ 环比计算 ================
         def calculate_trend(current, previous):
@@ -516,7 +700,16 @@ class TrafficStatisticsPostView(APIView):
             'monthViews': this_month_views,
             'monthTrend': calculate_trend(this_month_views, last_month_views),
 
-            'totalViews': total_views
+            'totalViews': total_views,
+
+            'todayVisitors': today_visitors,
+            'todayVisitorsTrend': calculate_trend(today_visitors, yesterday_visitors),
+
+            'weekVisitors': this_week_visitors,
+            'weekVisitorsTrend': calculate_trend(this_week_visitors, last_week_visitors),
+
+            'monthVisitors': this_month_visitors,
+            'monthVisitorsTrend': calculate_trend(this_month_visitors, last_month_visitors),
         }
 
         return Response(data, status=status.HTTP_200_OK)
@@ -529,6 +722,8 @@ class PostChartDataView(APIView):
     """
 
     permission_classes = [permissions.IsAuthenticated]
+    # 仪表盘统计读从库（见 utils.db.middleware）
+    use_replica = True
 
     def get(self, request):
         """
@@ -538,12 +733,15 @@ class PostChartDataView(APIView):
         """
         try:
             now = timezone.now()
+            # 一次读取最近一年的每日汇总，三个维度都由它计算
+            end_date = now.date()
+            views_by_date = daily_views(end_date - timedelta(days=365), end_date)
 
             # 生成三个维度的数据
             chart_data = {
-                'day': self._get_daily_data(now),
-                'week': self._get_weekly_data(now),
-                'month': self._get_monthly_data(now)
+                'day': self._get_daily_data(now, views_by_date),
+                'week': self._get_weekly_data(now, views_by_date),
+                'month': self._get_monthly_data(now, views_by_date)
             }
 
             return Response({
@@ -559,23 +757,10 @@ class PostChartDataView(APIView):
                 'msg': f'获取图表数据失败: {str(e)}'
             })
 
-    def _get_daily_data(self, now):
+    def _get_daily_data(self, now, views_by_date):
         """获取最近30天的访问数据"""
         end_date = now.date()
-        start_date = end_date - timedelta(days=29)
-
-        # 查询每日访问记录数
-        daily_stats = PostViewRecord.objects.filter(
-            viewed_at__date__gte=start_date,
-            viewed_at__date__lte=end_date
-        ).annotate(
-            date=TruncDate('viewed_at')
-        ).values('date').annotate(
-            count=Count('id')
-        ).order_by('date')
-
-        # 转换为字典便于查找
-        stats_dict = {stat['date']: stat['count'] for stat in daily_stats}
+        stats_dict = views_by_date
 
         # 生成完整的日期和数值列表（与前端mock格式一致）
         dates = []
@@ -587,22 +772,16 @@ class PostChartDataView(APIView):
 
         return {'dates': dates, 'values': values}
 
-    def _get_weekly_data(self, now):
+    def _get_weekly_data(self, now, views_by_date):
         """获取最近12周的访问数据"""
         end_date = now.date()
         start_date = end_date - timedelta(weeks=11)
 
-        # 按周统计，TruncWeek返回当周周一
-        weekly_stats = PostViewRecord.objects.filter(
-            viewed_at__date__gte=start_date
-        ).annotate(
-            week=TruncWeek('viewed_at')
-        ).values('week').annotate(
-            count=Count('id')
-        ).order_by('week')
-
-        # 转换为字典
-        stats_dict = {stat['week'].date(): stat['count'] for stat in weekly_stats}
+        # 按周累加，键为当周周一
+        stats_dict = defaultdict(int)
+        for date, count in views_by_date.items():
+            if date >= start_date:
+                stats_dict[date - timedelta(days=date.weekday())] += count
 
         dates = []
         values = []
@@ -616,24 +795,14 @@ class PostChartDataView(APIView):
 
         return {'dates': dates, 'values': values}
 
-    def _get_monthly_data(self, now):
+    def _get_monthly_data(self, now, views_by_date):
         """获取最近12个月的访问数据"""
         end_date = now.date()
 
-        # 查询最近12个月的数据
-        monthly_stats = PostViewRecord.objects.filter(
-            viewed_at__date__gte=end_date - timedelta(days=365)
-        ).annotate(
-            month=TruncMonth('viewed_at')
-        ).values('month').annotate(
-            count=Count('id')
-        ).order_by('month')
-
-        # 转换为(year, month)元组作为key
-        stats_dict = {
-            (stat['month'].year, stat['month'].month): stat['count']
-            for stat in monthly_stats
-        }
+        # 按月累加，(year, month)元组作为key
+        stats_dict = defaultdict(int)
+        for date, count in views_by_date.items():
+            stats_dict[(date.year, date.month)] += count
 
         month_names = ['1月', '2月', '3月', '4月', '5月', '6月', '7月', '8月', '9月', '10月', '11月', '12月']
         dates = []
@@ -653,3 +822,114 @@ class PostChartDataView(APIView):
             values.append(stats_dict.get((year, month), 0))
 
         return {'dates': dates, 'values': values}
+
+
+class RecordExportView(APIView):
+    """浏览/点赞记录导出视图"""
+
+    permission_classes = [permissions.IsAuthenticated]
+    # 仪表盘统计读从库（见 utils.db.middleware）
+    use_replica = True
+
+    def get(self, request):
+        """
+        流式导出浏览或点赞记录（CSV / NDJSON），按 id 升序，传入 after 续传
+        :param request: Request
+        :return: StreamingHttpResponse
+        """
+        kind = request.GET.get('kind', 'views')
+        export_format = request.GET.get('format', 'csv')
+        if kind not in EXPORT_KINDS or export_format not in EXPORT_FORMATS:
+            return Response({'detail': 'kind 需为 views/likes，format 需为 csv/ndjson'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            start = date.fromisoformat(request.GET['start']) if request.GET.get('start') else None
+            end = date.fromisoformat(request.GET['end']) if request.GET.get('end') else None
+            post_id = int(request.GET['post']) if request.GET.get('post') else None
+            after = int(request.GET.get('after', 0))
+            limit = int(request.GET['limit']) if request.GET.get('limit') else None
+        except ValueError:
+            return Response({'detail': '参数错误！'}, status=status.HTTP_400_BAD_REQUEST)
+
+        records = iter_records(kind, start=start, end=end, post_id=post_id, after=after, limit=limit)
+        response = StreamingHttpResponse(render_records(records, export_format),
+                                         content_type=EXPORT_FORMATS[export_format])
+        response['Content-Disposition'] = f'attachment; filename="{kind}-after-{after}.{export_format}"'
+        return response
+
+
+class SitemapIndexView(View):
+    """站点地图索引视图"""
+
+    # 返回 XML 文档，不经过 DRF 的内容协商（爬虫和订阅器的 Accept 不是 JSON）；公开只读接口，读从库
+    use_replica = True
+
+    def get(self, request):
+        """
+        获取站点地图索引，每个分片一条
+        :param request: HttpRequest
+        :return: HttpResponse
+        """
+        def shard_url(shard: int) -> str:
+            return request.build_absolute_uri(reverse('sitemap', args=[shard]))
+
+        return document_response(request, ['sitemap'], lambda: build_sitemap_index(shard_url), SITEMAP_CONTENT_TYPE)
+
+
+class SitemapView(View):
+    """站点地图分片视图"""
+
+    # 返回 XML 文档，不经过 DRF 的内容协商（爬虫和订阅器的 Accept 不是 JSON）；公开只读接口，读从库
+    use_replica = True
+
+    def get(self, request, shard: int):
+        """
+        获取一个站点地图分片
+        :param request: HttpRequest
+        :param shard: 分片序号
+        :return: HttpResponse
+        """
+        return document_response(request, [f'sitemap:{shard}'], lambda: build_sitemap(shard), SITEMAP_CONTENT_TYPE)
+
+
+class PostFeedView(View):
+    """最新文章订阅视图"""
+
+    # 返回 XML 文档，不经过 DRF 的内容协商（爬虫和订阅器的 Accept 不是 JSON）；公开只读接口，读从库
+    use_replica = True
+
+    def get(self, request, feed_format: str):
+        """
+        获取最新文章的 RSS / Atom 订阅
+        :param request: HttpRequest
+        :param feed_format: rss / atom
+        :return: HttpResponse
+        """
+        if feed_format not in FEED_FORMATS:
+            return api_response({'detail': '订阅格式需为 rss/atom'}, status.HTTP_404_NOT_FOUND)
+
+        feed_url = request.build_absolute_uri(request.path)
+        _, content_type = FEED_FORMATS[feed_format]
+        return document_response(request, ['feeds'], lambda: build_feed(feed_format, feed_url), content_type)
+
+
+class RuntimeMetricsView(APIView):
+    """运行时指标视图"""
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        """
+        获取当前进程的运行时指标（响应缓存与访客解析命中率、阅读计数队列深度、数据库连接复用率等）
+        :param request: Request
+        :return: Response
+        """
+        return Response({
+            'responseCache': get_response_cache().stats(),
+            'viewCounter': get_view_counter().stats(),
+            'visitorResolver': get_visitor_resolver().stats(),
+            'asyncViews': async_view_stats(),
+            'database': db_pool_stats(),
+            'replicaRouting': db_routing_stats(),
+        }, status=status.HTTP_200_OK)
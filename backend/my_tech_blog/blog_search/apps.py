@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class BlogSearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'blog_search'
+
+    def ready(self):
+        # 注册文章变更时的增量索引信号
+        from blog_search import signals  # noqa: F401
@@ -0,0 +1,228 @@
+import math
+import re
+from collections import Counter, defaultdict
+from html import escape
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, QuerySet
+
+from blog_post.models import Post
+from blog_search.models import SearchPosting
+from blog_search.tokenizer import normalize, tokenize, tokenize_query
+
+# 各字段的权重
+FIELD_BOOSTS = {
+    'title': 5.0,
+    'tags': 4.0,
+    'excerpt': 2.0,
+    'content_markdown': 1.0,
+}
+
+# 影响索引内容的字段，update_fields 不含这些字段时无需重建
+INDEXED_FIELDS = frozenset(('title', 'excerpt', 'content_markdown'))
+
+# 词频饱和参数（BM25 中的 k1）
+SATURATION = 1.2
+
+# 摘要片段的上下文长度
+SNIPPET_RADIUS = 40
+
+
+def build_postings(post: Post, tag_names: Iterable[str]) -> Dict[str, float]:
+    """
+    计算一篇文章的词项权重
+    :param post: Post
+    :param tag_names: 标签名列表
+    :return: {词项: 权重}
+    """
+    sources = {
+        'title': post.title,
+        'tags': ' '.join(tag_names),
+        'excerpt': post.excerpt,
+        'content_markdown': post.content_markdown,
+    }
+    weights = Counter()
+    for field, text in sources.items():
+        boost = FIELD_BOOSTS[field]
+        for term, tf in Counter(tokenize(text)).items():
+            weights[term] += boost * tf
+    return dict(weights)
+
+
+def index_post(post_id: int) -> None:
+    """
+    增量更新单篇文章的索引，只写入有变化的词项
+    :param post_id: 文章 id
+    :return: None
+    """
+    post = Post.objects.filter(id=post_id).only('id', 'title', 'excerpt', 'content_markdown').first()
+    if not post:
+        return
+    postings = build_postings(post, post.tags.values_list('name', flat=True))
+
+    with transaction.atomic():
+        existing = dict(SearchPosting.objects.filter(post_id=post_id).values_list('term', 'weight'))
+        stale = [term for term in existing if term not in postings]
+        if stale:
+            SearchPosting.objects.filter(post_id=post_id, term__in=stale).delete()
+
+        changed = {term: weight for term, weight in postings.items() if existing.get(term) != weight}
+        # 权重变化的词项先删后插，避免逐行 UPDATE
+        if changed:
+            SearchPosting.objects.filter(post_id=post_id, term__in=[t for t in changed if t in existing]).delete()
+            SearchPosting.objects.bulk_create(
+                [SearchPosting(term=term, post_id=post_id, weight=weight) for term, weight in changed.items()],
+                batch_size=500
+            )
+
+
+def rebuild_index(batch_size: int = 200) -> int:
+    """
+    重建全部文章的索引
+    :param batch_size: 每批处理的文章数
+    :return: 处理的文章数
+    """
+    SearchPosting.objects.all().delete()
+    total = 0
+    queryset = Post.objects.only('id', 'title', 'excerpt', 'content_markdown').prefetch_related('tags').order_by('id')
+    batch = []
+    for post in queryset.iterator(chunk_size=batch_size):
+        tag_names = [t.name for t in post.tags.all()]
+        batch.extend(
+            SearchPosting(term=term, post_id=post.id, weight=weight)
+            for term, weight in build_postings(post, tag_names).items()
+        )
+        total += 1
+        if len(batch) >= 5000:
+            SearchPosting.objects.bulk_create(batch, batch_size=1000)
+            batch = []
+    if batch:
+        SearchPosting.objects.bulk_create(batch, batch_size=1000)
+    return total
+
+
+def index_posts(post_ids: Iterable[int]) -> int:
+    """
+    批量重建指定文章的索引（先删除旧记录再批量写入，用于批量导入等绕过信号的写入）
+    :param post_ids: 文章 id
+    :return: 处理的文章数
+    """
+    post_ids = list(post_ids)
+    queryset = Post.objects.filter(id__in=post_ids).only(
+        'id', 'title', 'excerpt', 'content_markdown'
+    ).prefetch_related('tags')
+    postings = []
+    total = 0
+    for post in queryset:
+        tag_names = [t.name for t in post.tags.all()]
+        postings.extend(
+            SearchPosting(term=term, post_id=post.id, weight=weight)
+            for term, weight in build_postings(post, tag_names).items()
+        )
+        total += 1
+    with transaction.atomic():
+        SearchPosting.objects.filter(post_id__in=post_ids).delete()
+        SearchPosting.objects.bulk_create(postings, batch_size=1000)
+    return total
+
+
+def _collect(terms: List[str], published_only: bool) -> Dict[int, Dict[str, float]]:
+    """
+    取出查询词项的全部倒排记录
+    :param terms: 词项
+    :param published_only: 是否只看已发布文章
+    :return: {文章 id: {词项: 权重}}
+    """
+    queryset = SearchPosting.objects.filter(term__in=terms)
+    if published_only:
+        queryset = queryset.filter(post__status='published')
+
+    matches = defaultdict(dict)
+    for post_id, term, weight in queryset.values_list('post_id', 'term', 'weight'):
+        matches[post_id][term] = weight
+    return matches
+
+
+def matching_post_ids(query: str) -> Optional[QuerySet]:
+    """
+    包含全部查询词项的文章 id（不区分状态），作为子查询使用（post.filter(id__in=...)），不把倒排记录取到内存
+    :param query: 查询字符串
+    :return: 文章 id 的 QuerySet；查询无法分词时返回 None
+    """
+    terms = tokenize_query(query)
+    if not terms:
+        return None
+    return SearchPosting.objects.filter(term__in=terms).values('post_id').annotate(
+        matched=Count('term', distinct=True)
+    ).filter(matched=len(terms)).values('post_id')
+
+
+def search(query: str) -> List[Tuple[int, float]]:
+    """
+    检索已发布文章并按相关度排序
+    命中词项越多越靠前，同等命中数下按 BM25 风格的 idf * 饱和词频打分
+    :param query: 查询字符串
+    :return: [(文章 id, 得分)]
+    """
+    terms = tokenize_query(query)
+    if not terms:
+        return []
+    matches = _collect(terms, True)
+    if not matches:
+        return []
+
+    total_docs = Post.objects.filter(status='published').count()
+    doc_freq = Counter(term for found in matches.values() for term in found)
+    idf = {
+        term: math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+        for term, df in doc_freq.items()
+    }
+
+    scored = []
+    for post_id, found in matches.items():
+        score = sum(idf[term] * w * (SATURATION + 1) / (w + SATURATION) for term, w in found.items())
+        scored.append((post_id, len(found), round(score, 4)))
+    scored.sort(key=lambda item: (-item[1], -item[2], -item[0]))
+    return [(post_id, score) for post_id, _, score in scored]
+
+
+def _highlight_pattern(query: str) -> Optional[re.Pattern]:
+    """
+    根据查询构造高亮用的正则
+    :param query: 查询字符串
+    :return: Pattern
+    """
+    words = sorted({w for w in normalize(query).split() if w}, key=len, reverse=True)
+    if not words:
+        return None
+    return re.compile('|'.join(re.escape(w) for w in words), re.IGNORECASE)
+
+
+def highlight(text: str, query: str, radius: int = SNIPPET_RADIUS) -> str:
+    """
+    截取首个命中位置附近的片段，并用 <mark> 标记命中词（其余内容做 HTML 转义）
+    :param text: 原文
+    :param query: 查询字符串
+    :param radius: 命中位置前后保留的字符数
+    :return: str
+    """
+    text = ' '.join((text or '').split())
+    pattern = _highlight_pattern(query)
+    match = pattern.search(text) if pattern else None
+    if not match:
+        return escape(text[:radius * 2])
+
+    start = max(match.start() - radius, 0)
+    end = min(match.end() + radius, len(text))
+    snippet = text[start:end]
+
+    parts, cursor = [], 0
+    for m in pattern.finditer(snippet):
+        parts.append(escape(snippet[cursor:m.start()]))
+        parts.append(f'<mark>{escape(m.group())}</mark>')
+        cursor = m.end()
+    parts.append(escape(snippet[cursor:]))
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(text) else ''
+    return prefix + ''.join(parts) + suffix
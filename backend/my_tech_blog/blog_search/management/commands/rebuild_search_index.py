@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from blog_search.indexer import rebuild_index
+
+
+class Command(BaseCommand):
+    """重建文章全文索引"""
+
+    help = '重建文章标题、摘要、正文和标签的全文索引'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200, help='每批读取的文章数')
+
+    def handle(self, *args, **options):
+        total = rebuild_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'已重建 {total} 篇文章的索引'))
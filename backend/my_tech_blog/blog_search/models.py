@@ -0,0 +1,20 @@
+from django.db import models
+
+from blog_post.models import Post
+
+
+class SearchPosting(models.Model):
+    """倒排索引记录：词项 -> 文章，weight 为各字段加权后的词频"""
+
+    term = models.CharField(max_length=64, verbose_name="词项")
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='search_postings', verbose_name="文章")
+    weight = models.FloatField(default=0, verbose_name="权重")
+
+    class Meta:
+        verbose_name = "搜索索引"
+        verbose_name_plural = "搜索索引"
+        # 每个词项在每篇文章中只有一条记录，联合索引同时服务按词项查询
+        unique_together = ['term', 'post']
+
+    def __str__(self):
+        return f"{self.term} -> {self.post_id}"
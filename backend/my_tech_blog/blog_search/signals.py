@@ -0,0 +1,29 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save
+from django.dispatch import receiver
+
+from blog_post.models import Post
+from blog_search.indexer import INDEXED_FIELDS, index_post
+
+
+@receiver(post_save, sender=Post)
+def reindex_saved_post(sender, instance: Post, update_fields=None, **kwargs):
+    """文章保存后增量更新索引（删除由外键级联清理）"""
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: index_post(instance.pk))
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+def reindex_post_tags(sender, instance, action: str, reverse: bool, pk_set=None, **kwargs):
+    """文章标签变化后更新索引"""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        post_ids = [instance.pk]
+    elif action == 'post_clear':
+        # 从标签一侧清空时无法得知受影响的文章，交给重建命令处理
+        return
+    else:
+        post_ids = list(pk_set or ())
+    transaction.on_commit(lambda: [index_post(post_id) for post_id in post_ids])
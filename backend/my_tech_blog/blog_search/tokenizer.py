@@ -0,0 +1,62 @@
+import re
+import unicodedata
+from typing import Iterator, List
+
+# 词项最大长度，与 SearchPosting.term 一致
+MAX_TERM_LENGTH = 64
+
+# 中日韩字符连续片段 / 拉丁字母数字单词
+_TOKEN_RE = re.compile(
+    r'(?P<cjk>[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af]+)'
+    r'|(?P<word>[0-9a-z_]+(?:[.+#][0-9a-z_]+)*[+#]*)'
+)
+
+
+def normalize(text: str) -> str:
+    """
+    归一化文本：全角转半角、转小写
+    :param text: 原始文本
+    :return: str
+    """
+    return unicodedata.normalize('NFKC', text or '').lower()
+
+
+def _segments(text: str) -> Iterator[tuple]:
+    """
+    按字符类别切分文本
+    :param text: 归一化后的文本
+    :return: (类别, 片段)
+    """
+    for match in _TOKEN_RE.finditer(text):
+        yield match.lastgroup, match.group()
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    索引分词：中日韩片段输出单字 + 相邻二元组，拉丁单词整体输出
+    :param text: 原始文本
+    :return: 词项列表（含重复，用于统计词频）
+    """
+    tokens = []
+    for kind, segment in _segments(normalize(text)):
+        if kind == 'cjk':
+            tokens.extend(segment)
+            tokens.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+        else:
+            tokens.append(segment[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def tokenize_query(text: str) -> List[str]:
+    """
+    查询分词：中日韩片段只用二元组（单字片段除外），减少单字带来的噪声
+    :param text: 查询字符串
+    :return: 去重后的词项列表（保持出现顺序）
+    """
+    tokens = []
+    for kind, segment in _segments(normalize(text)):
+        if kind == 'cjk' and len(segment) > 1:
+            tokens.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+        else:
+            tokens.append(segment[:MAX_TERM_LENGTH])
+    return list(dict.fromkeys(tokens))
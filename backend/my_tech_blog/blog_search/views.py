@@ -0,0 +1,59 @@
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from blog_post.models import Post
+from blog_post.serializers import LIST_FIELDS, PostListSerializer, parse_fields, post_list_queryset
+from blog_search.indexer import highlight, search
+
+
+class SearchView(APIView):
+    """全文搜索视图"""
+
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        """
+        按相关度搜索已发布文章，返回高亮后的标题和正文片段
+        :param request: Request
+        :return: Response
+        """
+        query = request.GET.get('q', '').strip()
+        if not query:
+            return Response({'detail': 'q 不能为空'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            page = max(int(request.GET.get('page', 1)), 1)
+            size = min(max(int(request.GET.get('size', 10)), 1), 50)
+        except ValueError:
+            return Response({'detail': 'page/size 需为整数'}, status=status.HTTP_400_BAD_REQUEST)
+
+        # 返回字段，默认不含正文
+        try:
+            fields = parse_fields(request.GET.get('fields'), LIST_FIELDS)
+        except ValueError as e:
+            return Response({'detail': f'未知字段：{e}'}, status=status.HTTP_400_BAD_REQUEST)
+
+        ranked = search(query)
+        page_items = ranked[(page - 1) * size:page * size]
+        scores = dict(page_items)
+
+        # 额外读取正文用于生成摘要片段（只读取本页文章）
+        posts = post_list_queryset(Post.objects.filter(id__in=scores), (*fields, 'title', 'content_markdown')).in_bulk()
+        data = []
+        for post_id, score in page_items:
+            post = posts.get(post_id)
+            if not post:
+                continue
+            item = PostListSerializer(post, fields=fields).data
+            item['score'] = score
+            item['highlight'] = {
+                'title': highlight(post.title, query, radius=len(post.title)),
+                'snippet': highlight(post.content_markdown, query),
+            }
+            data.append(item)
+
+        return Response({
+            'total': len(ranked),
+            'list': data
+        }, status=status.HTTP_200_OK)
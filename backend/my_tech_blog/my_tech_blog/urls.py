@@ -20,6 +20,7 @@ from django.contrib import admin
 from django.urls import path, include
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
+import blog_post.views
 import blog_user.views
 
 urlpatterns = [
@@ -31,6 +32,12 @@ urlpatterns = [
 
     # blog_post
     path('api/posts/', include('blog_post.urls'), name='blog_post'),
+    path('api/async/posts/', include('blog_post.async_urls'), name='blog_post_async'),
+
+    # 站点地图与订阅
+    path('sitemap.xml', blog_post.views.SitemapIndexView.as_view(), name='sitemap-index'),
+    path('sitemap-<int:shard>.xml', blog_post.views.SitemapView.as_view(), name='sitemap'),
+    path('feed/<str:feed_format>.xml', blog_post.views.PostFeedView.as_view(), name='feed'),
 
     # blog_user
     path('api/user/', include('blog_user.urls'), name='blog_user'),
@@ -41,4 +48,7 @@ urlpatterns = [
     # comment
     path('api/comment/', include('blog_comment.urls'), name='blog_comment'),
 
+    # search
+    path('api/search/', include('blog_search.urls'), name='blog_search'),
+
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
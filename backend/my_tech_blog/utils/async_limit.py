@@ -0,0 +1,76 @@
+import asyncio
+import functools
+import weakref
+from typing import Any, Awaitable, Callable, Dict
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from utils.renderers import api_response
+
+# 默认配置，可在 settings.ASYNC_VIEWS 中覆盖
+DEFAULT_CONFIG = {
+    # 每个进程同时处理的请求数上限（每个请求在独立线程中使用一个数据库连接，需小于数据库最大连接数）
+    'MAX_CONCURRENCY': 32,
+    # 排队等待的最长秒数，超时返回 503
+    'QUEUE_TIMEOUT': 5.0,
+}
+
+# 信号量绑定事件循环，每个事件循环一个
+_semaphores = weakref.WeakKeyDictionary()
+_stats = {'inFlight': 0, 'waiting': 0, 'served': 0, 'rejected': 0}
+
+
+def get_config() -> Dict[str, Any]:
+    """
+    读取 settings.ASYNC_VIEWS 覆盖后的配置
+    :return: dict
+    """
+    return {**DEFAULT_CONFIG, **getattr(settings, 'ASYNC_VIEWS', {})}
+
+
+def stats() -> Dict[str, Any]:
+    """
+    当前进程异步视图的并发统计
+    :return: dict
+    """
+    return {**_stats, 'maxConcurrency': get_config()['MAX_CONCURRENCY']}
+
+
+def _semaphore() -> asyncio.Semaphore:
+    """当前事件循环的信号量"""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(get_config()['MAX_CONCURRENCY'])
+    return semaphore
+
+
+def bounded(method: Callable[..., Awaitable[HttpResponse]]) -> Callable[..., Awaitable[HttpResponse]]:
+    """
+    限制异步视图的并发数：超过上限的请求在事件循环中排队（不占用线程和数据库连接），等待超时返回 503
+    :param method: 异步视图方法
+    :return: 包装后的方法
+    """
+
+    @functools.wraps(method)
+    async def wrapper(view, request, *args, **kwargs):
+        semaphore = _semaphore()
+        _stats['waiting'] += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), get_config()['QUEUE_TIMEOUT'])
+        except asyncio.TimeoutError:
+            _stats['rejected'] += 1
+            return api_response({'detail': '服务繁忙，请稍后重试'}, 503)
+        finally:
+            _stats['waiting'] -= 1
+
+        _stats['inFlight'] += 1
+        try:
+            return await method(view, request, *args, **kwargs)
+        finally:
+            _stats['inFlight'] -= 1
+            _stats['served'] += 1
+            semaphore.release()
+
+    return wrapper
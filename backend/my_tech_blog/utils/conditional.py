@@ -0,0 +1,73 @@
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from django.http import HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    由若干版本信息生成强 ETag
+    :param parts: 参与计算的值
+    :return: 带引号的 ETag
+    """
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return quote_etag(hashlib.sha1(raw.encode('utf-8')).hexdigest())
+
+
+def etag_for_data(data: Any) -> str:
+    """
+    由响应数据生成强 ETag（数据变化即变化）
+    :param data: 响应数据
+    :return: 带引号的 ETag
+    """
+    raw = json.dumps(data, cls=JSONEncoder, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return quote_etag(hashlib.sha1(raw.encode('utf-8')).hexdigest())
+
+
+def representation_etag(request, etag: str) -> str:
+    """
+    同一份数据按协商的格式（JSON / MessagePack）编码后是不同的表示，非 JSON 表示使用不同的 ETag
+    :param request: Request
+    :param etag: 按数据生成的 ETag
+    :return: 带引号的 ETag
+    """
+    media_format = getattr(getattr(request, 'accepted_renderer', None), 'format', 'json')
+    return etag if media_format == 'json' else make_etag(etag, media_format)
+
+
+def _timestamp(last_modified: Optional[datetime]) -> Optional[int]:
+    """datetime 转为秒级时间戳"""
+    return int(last_modified.timestamp()) if last_modified else None
+
+
+def not_modified(request, etag: str, last_modified: Optional[datetime] = None) -> Optional[HttpResponseBase]:
+    """
+    处理 If-None-Match / If-Modified-Since，命中时返回 304 响应
+    :param request: Request
+    :param etag: 当前 ETag
+    :param last_modified: 最后修改时间
+    :return: 304 响应或 None
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=_timestamp(last_modified))
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response: HttpResponseBase, etag: str, last_modified: Optional[datetime] = None) -> None:
+    """
+    为响应设置 ETag / Last-Modified，并要求客户端与 CDN 使用前重新验证
+    :param response: 响应
+    :param etag: ETag
+    :param last_modified: 最后修改时间
+    :return: None
+    """
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(_timestamp(last_modified))
+    patch_cache_control(response, no_cache=True)
@@ -0,0 +1,74 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from rest_framework.permissions import AllowAny
+
+from utils.db.routing import enter_request, exit_request, get_config
+
+# 可以读从库的请求方法
+READ_METHODS = ('GET', 'HEAD')
+
+
+def allows_replica(request, view_func) -> bool:
+    """
+    请求是否可以读从库：GET/HEAD 请求，且视图设置了 use_replica = True，
+    或未设置时视图只使用 AllowAny 权限（公开的只读接口）
+    :param request: HttpRequest
+    :param view_func: 视图函数
+    :return: bool
+    """
+    if request.method not in READ_METHODS:
+        return False
+    view_class = getattr(view_func, 'view_class', None)
+    use_replica = getattr(view_class, 'use_replica', None)
+    if use_replica is not None:
+        return bool(use_replica)
+    permission_classes = getattr(view_class, 'permission_classes', None)
+    return bool(permission_classes) and all(permission is AllowAny for permission in permission_classes)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    为每个请求建立读写分离的路由状态（见 utils.db.routing）
+    请求写入过数据库时设置 Cookie，客户端在 STICKY_SECONDS 内的后续请求都读主库，避免读到从库中的旧数据
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.config = get_config()
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state, token = enter_request(pinned=self.config['COOKIE_NAME'] in request.COOKIES)
+        request.db_routing = state
+        try:
+            response = self.get_response(request)
+        finally:
+            exit_request(token)
+        return self._finish(state, response)
+
+    async def __acall__(self, request):
+        state, token = enter_request(pinned=self.config['COOKIE_NAME'] in request.COOKIES)
+        request.db_routing = state
+        try:
+            response = await self.get_response(request)
+        finally:
+            exit_request(token)
+        return self._finish(state, response)
+
+    @staticmethod
+    def process_view(request, view_func, view_args, view_kwargs):
+        """URL 解析后按视图决定是否可以读从库"""
+        request.db_routing.replica_allowed = allows_replica(request, view_func)
+
+    def _finish(self, state, response):
+        """本次请求写入过时让客户端短时间内固定读主库"""
+        if state.wrote:
+            response.set_cookie(
+                self.config['COOKIE_NAME'], '1', max_age=self.config['STICKY_SECONDS'], httponly=True, samesite='Lax'
+            )
+        return response
@@ -0,0 +1,109 @@
+import time
+import weakref
+
+from django.db import OperationalError
+from django.db.backends.mysql import base as mysql_base
+
+from utils.db.pool import PoolTimeout, get_limiter
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    """
+    带连接统计与限流的 MySQL 后端（ENGINE = 'utils.db.mysql'）
+    连接复用与健康检查沿用 Django 的 CONN_MAX_AGE / CONN_HEALTH_CHECKS，每个线程持有自己的连接；
+    在此之上限制进程内同时使用连接的线程数（DATABASES[alias]['POOL']）：请求内第一次使用连接时占用名额，请求结束时归还，
+    空闲的持久连接不占名额；请求外（管理命令、后台线程）占用的名额在关闭连接时归还。并统计建连耗时、复用率和等待时间
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = get_limiter(self.alias, self.settings_dict.get('POOL'))
+        # 当前占用的名额与当前连接的计数，都是 weakref.finalize，调用一次即释放
+        self._slot = None
+        self._opened = None
+        # 本次请求是否已经使用过连接（请求开始和结束时重置）
+        self._checked_out = False
+        # 是否正在请求开始或结束时检查连接
+        self._at_boundary = False
+
+    def _acquire_slot(self):
+        """占用一个名额，等待超时抛出 OperationalError"""
+        try:
+            slot = self.limiter.acquire()
+        except PoolTimeout as e:
+            raise OperationalError(f'{e}，可调大 DB_POOL_SIZE 或减少工作线程数') from e
+        # 线程退出时没有走到请求结束的包装对象（如 ASGI 的请求线程）被回收后也归还名额
+        self._slot = weakref.finalize(self, slot.release)
+
+    def _release_slot(self):
+        """归还名额，连接保持打开"""
+        if self._slot is not None:
+            self._slot()
+            self._slot = None
+
+    def get_new_connection(self, conn_params):
+        """建连并记录建连耗时"""
+        started = time.monotonic()
+        try:
+            connection = super().get_new_connection(conn_params)
+        except Exception:
+            self.limiter.record_connect(time.monotonic() - started, ok=False)
+            raise
+        self.limiter.record_connect(time.monotonic() - started)
+
+        # 没有关闭就被回收的连接也计为关闭
+        self._opened = weakref.finalize(connection, self.limiter.record_close)
+        return connection
+
+    def _close(self):
+        """关闭连接并归还名额"""
+        try:
+            super()._close()
+        finally:
+            if self._opened is not None:
+                self._opened()
+                self._opened = None
+            self._release_slot()
+
+    def ensure_connection(self):
+        """请求内第一次使用连接时占用名额，并记录是否复用了已打开的连接"""
+        if self._at_boundary:
+            # 检查已打开的连接（如读取 autocommit）不占名额，也不算取用
+            return super().ensure_connection()
+        acquired = self._slot is None
+        if acquired:
+            self._acquire_slot()
+        # 建连时初始化连接状态也会调用这里，先标记，避免重复计数
+        first_use = not self._checked_out
+        self._checked_out = True
+        before = self.connection
+        try:
+            super().ensure_connection()
+        except Exception:
+            if acquired:
+                self._release_slot()
+            if first_use:
+                self._checked_out = False
+            raise
+        if first_use:
+            # 健康检查失败后重连的不算复用
+            self.limiter.record_checkout(reused=before is not None and self.connection is before)
+
+    def close_if_unusable_or_obsolete(self):
+        """
+        请求开始和结束时调用：关闭过期或出错的连接，归还名额（未过期的连接保持打开），之后的首次使用计为一次新的取用
+        """
+        self._at_boundary = True
+        try:
+            super().close_if_unusable_or_obsolete()
+        finally:
+            self._at_boundary = False
+            self._checked_out = False
+            self._release_slot()
+
+    def is_usable(self):
+        """健康检查，失败时计数"""
+        usable = super().is_usable()
+        if not usable:
+            self.limiter.record_health_check_failure()
+        return usable
@@ -0,0 +1,159 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# 未配置时的连接池参数，可在 DATABASES[alias]['POOL'] 中覆盖
+DEFAULT_CONFIG = {
+    # 每个进程最多同时使用连接的线程数（请求内占用，请求结束归还，空闲的持久连接不占名额），0 表示不限制
+    'SIZE': 0,
+    # 等待空闲名额的最长秒数，超时抛出 OperationalError
+    'TIMEOUT': 10.0,
+}
+
+
+class PoolTimeout(Exception):
+    """等待连接名额超时"""
+
+
+class _Slot:
+    """一次连接取用占用的名额，请求结束、关闭连接或数据库包装对象被回收时释放，只释放一次"""
+
+    def __init__(self, pool: 'ConnectionLimiter'):
+        self._pool = pool
+        self._released = False
+        self._lock = threading.Lock()
+
+    def release(self) -> None:
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._pool._release()
+
+
+class ConnectionLimiter:
+    """
+    单个数据库别名的连接计数与限流
+    Django 按线程持有连接（CONN_MAX_AGE 内复用），这里限制进程内同时使用连接的线程数：请求内第一次使用连接时占用名额，
+    请求结束时归还，连接本身保持打开供该线程下次复用；并统计打开的连接数、建连耗时、复用率和等待时间
+    """
+
+    def __init__(self, alias: str, config: Dict[str, Any]):
+        self.alias = alias
+        self.size = int(config['SIZE'])
+        self.timeout = float(config['TIMEOUT'])
+        self._semaphore = threading.BoundedSemaphore(self.size) if self.size > 0 else None
+        self._lock = threading.Lock()
+        self._stats = {
+            'open': 0, 'inUse': 0, 'connects': 0, 'connectFailures': 0, 'connectSeconds': 0.0, 'maxConnectSeconds': 0.0,
+            'checkouts': 0, 'reused': 0, 'waits': 0, 'waitSeconds': 0.0, 'maxWaitSeconds': 0.0,
+            'timeouts': 0, 'healthCheckFailures': 0,
+        }
+
+    def _add(self, **values) -> None:
+        """累加统计项"""
+        with self._lock:
+            for name, value in values.items():
+                self._stats[name] += value
+
+    def _max(self, name: str, value: float) -> None:
+        """更新最大值统计项"""
+        with self._lock:
+            self._stats[name] = max(self._stats[name], value)
+
+    def acquire(self) -> _Slot:
+        """
+        占用一个连接名额，已满时等待
+        :return: _Slot
+        :raise PoolTimeout: 等待超时
+        """
+        if self._semaphore is not None and not self._semaphore.acquire(blocking=False):
+            started = time.monotonic()
+            acquired = self._semaphore.acquire(timeout=self.timeout)
+            waited = time.monotonic() - started
+            self._add(waits=1, waitSeconds=waited)
+            self._max('maxWaitSeconds', waited)
+            if not acquired:
+                self._add(timeouts=1)
+                raise PoolTimeout(f'等待数据库连接超过 {self.timeout} 秒（{self.alias} 同时使用连接的上限 {self.size}）')
+        self._add(inUse=1)
+        return _Slot(self)
+
+    def _release(self) -> None:
+        """归还名额"""
+        self._add(inUse=-1)
+        if self._semaphore is not None:
+            self._semaphore.release()
+
+    def record_connect(self, seconds: float, ok: bool = True) -> None:
+        """
+        记录一次建连
+        :param seconds: 建连耗时（TCP + 认证）
+        :param ok: 是否成功
+        :return: None
+        """
+        if not ok:
+            self._add(connectFailures=1)
+            return
+        self._add(open=1, connects=1, connectSeconds=seconds)
+        self._max('maxConnectSeconds', seconds)
+
+    def record_close(self) -> None:
+        """记录一个连接关闭或被回收"""
+        self._add(open=-1)
+
+    def record_checkout(self, reused: bool) -> None:
+        """
+        记录一次请求内首次使用连接
+        :param reused: 是否复用了已打开的连接
+        :return: None
+        """
+        self._add(checkouts=1, reused=1 if reused else 0)
+
+    def record_health_check_failure(self) -> None:
+        """记录一次健康检查失败（连接已断开，随后重连）"""
+        self._add(healthCheckFailures=1)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        当前进程的连接统计
+        :return: dict
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['size'] = self.size
+        stats['reuseRate'] = round(stats['reused'] / stats['checkouts'], 4) if stats['checkouts'] else 0.0
+        stats['avgConnectMs'] = round(stats['connectSeconds'] / stats['connects'] * 1000, 2) if stats['connects'] else 0.0
+        stats['avgWaitMs'] = round(stats['waitSeconds'] / stats['waits'] * 1000, 2) if stats['waits'] else 0.0
+        stats['maxConnectMs'] = round(stats.pop('maxConnectSeconds') * 1000, 2)
+        stats['maxWaitMs'] = round(stats.pop('maxWaitSeconds') * 1000, 2)
+        del stats['connectSeconds'], stats['waitSeconds']
+        return stats
+
+
+_limiters: Dict[str, ConnectionLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(alias: str, config: Optional[Dict[str, Any]] = None) -> ConnectionLimiter:
+    """
+    获取数据库别名对应的进程级连接限流器（同一别名的所有线程共享）
+    :param alias: 数据库别名
+    :param config: DATABASES[alias]['POOL']
+    :return: ConnectionLimiter
+    """
+    limiter = _limiters.get(alias)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(alias)
+            if limiter is None:
+                limiter = _limiters[alias] = ConnectionLimiter(alias, {**DEFAULT_CONFIG, **(config or {})})
+    return limiter
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """
+    所有使用连接限流的数据库别名的统计
+    :return: {别名: 统计}
+    """
+    return {alias: limiter.stats() for alias, limiter in list(_limiters.items())}
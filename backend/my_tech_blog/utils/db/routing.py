@@ -0,0 +1,258 @@
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# 默认配置，可在 settings.REPLICA_ROUTING 中覆盖
+DEFAULT_CONFIG = {
+    # 从库别名（DATABASES 中的键）
+    'REPLICAS': [],
+    # 复制延迟超过这么多秒的从库不再分担读请求
+    'MAX_LAG': 5,
+    # 从库健康检查间隔秒数
+    'CHECK_INTERVAL': 5.0,
+    # 写入后客户端在这么多秒内的请求都读主库（通过 Cookie）
+    'STICKY_SECONDS': 5,
+    'COOKIE_NAME': 'db_primary',
+}
+
+
+def get_config() -> Dict[str, Any]:
+    """
+    读取 settings.REPLICA_ROUTING 覆盖后的配置
+    :return: dict
+    """
+    return {**DEFAULT_CONFIG, **getattr(settings, 'REPLICA_ROUTING', {})}
+
+
+class RoutingState:
+    """一次请求的路由状态（可变对象，在 sync_to_async 的线程中修改也对请求可见）"""
+
+    __slots__ = ('replica_allowed', 'pinned', 'wrote')
+
+    def __init__(self, pinned: bool = False):
+        # 当前视图是否允许读从库（由中间件按视图决定）
+        self.replica_allowed = False
+        # 是否固定读主库（本次请求已写入，或客户端刚写入过）
+        self.pinned = pinned
+        # 本次请求是否写入过
+        self.wrote = False
+
+
+# 请求外（管理命令、后台线程）没有路由状态，全部使用主库
+_state: ContextVar[Optional[RoutingState]] = ContextVar('db_routing_state', default=None)
+
+
+def current_state() -> Optional[RoutingState]:
+    """当前请求的路由状态"""
+    return _state.get()
+
+
+def enter_request(pinned: bool = False):
+    """
+    开始一次请求的路由状态
+    :param pinned: 是否固定读主库
+    :return: (RoutingState, token)，请求结束时用 token 调用 exit_request
+    """
+    state = RoutingState(pinned)
+    return state, _state.set(state)
+
+
+def exit_request(token) -> None:
+    """结束请求的路由状态"""
+    _state.reset(token)
+
+
+@contextmanager
+def primary():
+    """
+    块内的读写都按请求外处理：读主库，写入也不会让请求固定到主库（如请求内顺带写入的浏览计数）
+    """
+    token = _state.set(None)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+
+class ReplicaMonitor:
+    """
+    从库健康检查：定期执行一次查询并读取复制延迟，连接失败或延迟过大的从库暂时不参与读
+    检查在调用方线程中进行，同一时间只有一个线程检查，其余线程使用上次的结果
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self._status: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {'replicaReads': 0, 'primaryReads': 0, 'fallbacks': 0}
+        # 本进程最近一次请求内写入后，从库在这个时间之前可能还没有追上主库
+        self.stale_until = 0.0
+
+    def count(self, stat: str) -> None:
+        """累加统计项（只用于观测，不加锁）"""
+        self._stats[stat] += 1
+
+    def _lag(self, alias: str) -> Optional[float]:
+        """
+        读取从库的复制延迟
+        :param alias: 从库别名
+        :return: 秒数；不是 MySQL 复制从库时返回 0；复制中断返回 None
+        :raise DatabaseError: 无法连接
+        """
+        connection = connections[alias]
+        with connection.cursor() as cursor:
+            if connection.vendor != 'mysql':
+                cursor.execute('SELECT 1')
+                return 0.0
+            try:
+                cursor.execute('SHOW REPLICA STATUS')
+            except DatabaseError:
+                # MySQL 8.0.22 之前的语法
+                cursor.execute('SHOW SLAVE STATUS')
+            row = cursor.fetchone()
+            if row is None:
+                return 0.0
+            status = dict(zip((column[0] for column in cursor.description), row))
+        lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+        return None if lag is None else float(lag)
+
+    def _check(self, alias: str) -> None:
+        """检查一个从库并记录结果"""
+        try:
+            lag = self._lag(alias)
+            healthy = lag is not None and lag <= self.config['MAX_LAG']
+        except DatabaseError as e:
+            logger.warning('从库 %s 健康检查失败: %s', alias, e)
+            connections[alias].close()
+            lag, healthy = None, False
+        if not healthy and self._status.get(alias, {}).get('healthy', True):
+            logger.warning('从库 %s 暂停读取（延迟 %s 秒）', alias, lag)
+        self._status[alias] = {'healthy': healthy, 'lag': lag, 'checkedAt': time.monotonic()}
+
+    def healthy_replicas(self) -> List[str]:
+        """
+        可读的从库，检查结果过期时重新检查
+        :return: 从库别名列表
+        """
+        replicas = self.config['REPLICAS']
+        now = time.monotonic()
+        stale = [
+            alias for alias in replicas
+            if now - self._status.get(alias, {}).get('checkedAt', float('-inf')) >= self.config['CHECK_INTERVAL']
+        ]
+        if stale and self._lock.acquire(blocking=False):
+            try:
+                for alias in stale:
+                    self._check(alias)
+            finally:
+                self._lock.release()
+        return [alias for alias in replicas if self._status.get(alias, {}).get('healthy')]
+
+    def max_lag(self) -> float:
+        """健康从库中最大的复制延迟"""
+        return max((status['lag'] or 0.0 for status in self._status.values() if status['healthy']), default=0.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        从库状态与读路由统计
+        :return: dict
+        """
+        now = time.monotonic()
+        return {
+            **self._stats,
+            'replicas': {
+                alias: {
+                    'healthy': status['healthy'], 'lag': status['lag'],
+                    'checkedSecondsAgo': round(now - status['checkedAt'], 1),
+                }
+                for alias, status in list(self._status.items())
+            },
+        }
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> ReplicaMonitor:
+    """
+    获取按 settings.REPLICA_ROUTING 创建的全局从库监控实例
+    :return: ReplicaMonitor
+    """
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = ReplicaMonitor(get_config())
+    return _monitor
+
+
+class ReplicaRouter:
+    """
+    读写分离路由
+    只有中间件标记为可读从库的请求（公开的 GET 接口和仪表盘统计）才会把读查询发往从库；
+    写入、事务内的读、刚写入过的请求和客户端、请求外的代码（管理命令、后台线程）都使用主库
+    """
+
+    def db_for_read(self, model, **hints):
+        state = current_state()
+        if state is None or not state.replica_allowed:
+            return DEFAULT_DB_ALIAS
+        monitor = get_monitor()
+        if state.pinned or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            monitor.count('primaryReads')
+            return DEFAULT_DB_ALIAS
+
+        replicas = monitor.healthy_replicas()
+        if not replicas:
+            monitor.count('fallbacks')
+            return DEFAULT_DB_ALIAS
+        monitor.count('replicaReads')
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        state = current_state()
+        if state is not None:
+            # 本次请求之后的读走主库（客户端后续请求通过 Cookie 读主库，见 utils.db.middleware）
+            state.pinned = state.wrote = True
+            monitor = get_monitor()
+            if monitor.config['REPLICAS']:
+                monitor.stale_until = max(monitor.stale_until, time.monotonic() + monitor.max_lag() + 1)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 主从是同一份数据
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # 不限制：线上只对主库执行迁移，本地用两个 SQLite 模拟时可以对从库执行 migrate --database
+        return None
+
+
+def replica_may_be_stale() -> bool:
+    """
+    当前请求是否可能从尚未追上主库的从库读到旧数据：本进程刚在请求内写入过，且当前请求读从库
+    写入会递增响应缓存的版本号，这段时间内读从库的请求不写响应缓存，避免旧数据缓存在新版本号下
+    :return: bool
+    """
+    state = current_state()
+    if state is None or not state.replica_allowed or state.pinned:
+        return False
+    return time.monotonic() < get_monitor().stale_until
+
+
+def stats() -> Dict[str, Any]:
+    """
+    读写分离的运行统计
+    :return: dict
+    """
+    return get_monitor().stats()
@@ -0,0 +1,118 @@
+import hashlib
+import math
+from typing import Hashable, Iterable, Optional
+
+# 默认精度：2^10 个寄存器，每个 1 字节，标准误差约 1.04 / sqrt(1024) ≈ 3.3%
+DEFAULT_PRECISION = 10
+
+
+class HyperLogLog:
+    """
+    HyperLogLog 基数估计
+    序列化格式为 1 字节精度 + 2^p 字节寄存器，同精度的草图可以按寄存器取最大值合并
+    """
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: Optional[bytes] = None):
+        """
+        :param precision: 精度 p，寄存器数为 2^p（4 ~ 16）
+        :param registers: 已有寄存器
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError('precision 需在 4 到 16 之间')
+        self.precision = precision
+        self.size = 1 << precision
+        if registers is not None and len(registers) != self.size:
+            raise ValueError('寄存器长度与精度不符')
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+
+    @staticmethod
+    def _hash(value: Hashable) -> int:
+        """64 位哈希"""
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big')
+
+    def add(self, value: Hashable) -> None:
+        """
+        加入一个元素
+        :param value: 元素（按 str 取哈希）
+        :return: None
+        """
+        hashed = self._hash(value)
+        index = hashed >> (64 - self.precision)
+        # 剩余位中第一个 1 的位置
+        remaining_bits = 64 - self.precision
+        rest = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        """
+        加入多个元素
+        :param values: 元素
+        :return: None
+        """
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """
+        合并另一个草图（结果等价于两个集合的并集）
+        :param other: 同精度的草图
+        :return: None
+        """
+        if other.precision != self.precision:
+            raise ValueError('只能合并相同精度的草图')
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def count(self) -> int:
+        """
+        估计不同元素的个数
+        :return: int
+        """
+        m = self.size
+        if m >= 128:
+            alpha = 0.7213 / (1 + 1.079 / m)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[m]
+        estimate = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+
+        # 小基数时用线性计数修正
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """
+        序列化
+        :return: bytes
+        """
+        return bytes([self.precision]) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: Optional[bytes], precision: int = DEFAULT_PRECISION) -> 'HyperLogLog':
+        """
+        反序列化，空数据返回空草图
+        :param data: to_bytes 的结果
+        :param precision: 空数据时使用的精度
+        :return: HyperLogLog
+        """
+        if not data:
+            return cls(precision)
+        data = bytes(data)
+        return cls(data[0], data[1:])
+
+    @classmethod
+    def union(cls, sketches: Iterable[Optional[bytes]], precision: int = DEFAULT_PRECISION) -> 'HyperLogLog':
+        """
+        合并多个序列化的草图
+        :param sketches: to_bytes 的结果
+        :param precision: 精度
+        :return: HyperLogLog
+        """
+        result = cls(precision)
+        for data in sketches:
+            if data:
+                result.merge(cls.from_bytes(data))
+        return result
@@ -1,4 +1,58 @@
-from rest_framework.renderers import JSONRenderer
+import msgpack
+import orjson
+from django.http import HttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# orjson 原生编码 datetime / date / time 的结果与 DRF 的 JSONEncoder 相同（isoformat，UTC 写作 Z）
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    orjson / msgpack 不能直接编码的值（datetime、Decimal、QuerySet、惰性翻译字符串等）交给 DRF 的 JSONEncoder 转换，
+    保证各种编码格式下的值一致
+    :param obj: 待编码的值
+    :return: 可编码的值
+    """
+    return _encoder.default(obj)
+
+
+def envelope(data, status_code: int) -> dict:
+    """
+    按统一格式封装响应数据
+    :param data: 响应数据
+    :param status_code: HTTP 状态码
+    :return: {'code', 'msg', 'data'}
+    """
+    # 判断当前是否异常（DRF 会把异常放在 data.detail）
+    if 200 <= status_code < 300:
+        code, msg = 200, 'ok'
+        payload = data
+    else:
+        # 非 2xx 都当错误
+        code = status_code
+        msg = data.pop('detail', 'error') if isinstance(data, dict) else 'error'
+        payload = data
+    return {'code': code, 'msg': msg, 'data': payload}
+
+
+def render_json(data, status_code: int) -> bytes:
+    """
+    用 orjson 按统一格式编码 JSON，解析结果与 DRF 的 JSONRenderer 一致（紧凑格式、不转义中文）
+    不像 DRF 那样把 U+2028/U+2029 转义为 \\u 形式，二者都是合法的 JSON
+    :param data: 响应数据
+    :param status_code: HTTP 状态码
+    :return: bytes
+    """
+    wrapped = envelope(data, status_code)
+    try:
+        return orjson.dumps(wrapped, default=encode_default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # orjson 不支持的值（如超过 64 位的整数、非字符串的字典键）退回标准库编码
+        return JSONRenderer().render(wrapped)
 
 
 class ApiRenderer(JSONRenderer):
@@ -10,21 +64,40 @@ class ApiRenderer(JSONRenderer):
     def render(self, data, accepted_media_type=None, renderer_context=None):
         # 取出状态码
         response = renderer_context['response']
-        status_code = response.status_code
-
-        # 判断当前是否异常（DRF 会把异常放在 data.detail）
-        if 200 <= status_code < 300:
-            code, msg = 200, 'ok'
-            payload = data
-        else:
-            # 非 2xx 都当错误
-            code = status_code
-            msg = data.pop('detail', 'error') if isinstance(data, dict) else 'error'
-            payload = data
+
+        # 需要缩进时（如 Accept: application/json; indent=4）走 DRF 的编码
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(
+                envelope(data, response.status_code),
+                accepted_media_type,
+                renderer_context
+            )
 
         # 返回统一格式
-        return super().render(
-            {'code': code, 'msg': msg, 'data': payload},
-            accepted_media_type,
-            renderer_context
-        )
+        return render_json(data, response.status_code)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack 格式的统一返回（Accept: application/msgpack），结构与 ApiRenderer 相同
+    供自有客户端使用，体积更小、解码更快
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = renderer_context['response']
+        return msgpack.packb(envelope(data, response.status_code), default=encode_default)
+
+
+def api_response(data, status_code: int = 200) -> HttpResponse:
+    """
+    不经过 DRF 的视图（如异步视图）按 ApiRenderer 的统一格式返回 JSON
+    :param data: 响应数据
+    :param status_code: HTTP 状态码
+    :return: HttpResponse
+    """
+    return HttpResponse(render_json(data, status_code), content_type='application/json', status=status_code)
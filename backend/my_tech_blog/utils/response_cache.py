@@ -0,0 +1,287 @@
+import functools
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.response import Response
+
+from utils.conditional import etag_for_data, not_modified, representation_etag, set_validators
+from utils.db.routing import replica_may_be_stale
+from utils.lru import LRUCache, MISSING
+
+# 默认配置，可在 settings.RESPONSE_CACHE 中覆盖
+DEFAULT_CONFIG = {
+    # lru: 进程内 LRU；django: Django 缓存框架（CACHES 中的 CACHE_ALIAS）；none: 关闭
+    'BACKEND': 'lru',
+    # 响应过期秒数
+    'TTL': 60,
+    # LRU 最大条目数
+    'MAX_ENTRIES': 1024,
+    # django 后端使用的缓存别名
+    'CACHE_ALIAS': 'default',
+    # 键前缀
+    'KEY_PREFIX': 'resp',
+}
+
+
+class LocMemBackend:
+    """进程内 LRU 后端；命名空间版本号单独保存，不会被 LRU 淘汰"""
+
+    name = 'lru'
+
+    def __init__(self, config: Dict[str, Any]):
+        self._entries = LRUCache(max_entries=config['MAX_ENTRIES'], ttl=config['TTL'])
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """读取条目，未命中返回 MISSING"""
+        return self._entries.get(key)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """写入条目"""
+        self._entries.set(key, value, ttl)
+
+    def get_versions(self, namespaces: List[str]) -> List[int]:
+        """批量读取命名空间版本号"""
+        return [self._versions.get(ns, 0) for ns in namespaces]
+
+    def bump(self, namespace: str) -> None:
+        """递增命名空间版本号"""
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def size(self) -> Optional[int]:
+        """当前条目数"""
+        return len(self._entries)
+
+
+class DjangoCacheBackend:
+    """Django 缓存框架后端，多进程共享缓存与版本号"""
+
+    name = 'django'
+
+    def __init__(self, config: Dict[str, Any]):
+        self._cache = caches[config['CACHE_ALIAS']]
+        self._prefix = config['KEY_PREFIX']
+
+    def _version_key(self, namespace: str) -> str:
+        """命名空间版本号的缓存键"""
+        return f'{self._prefix}:ns:{namespace}'
+
+    @staticmethod
+    def _initial_version() -> int:
+        # 版本号被淘汰后以当前毫秒时间重新开始，避免回到旧版本命中过期数据
+        return int(time.time() * 1000)
+
+    def get(self, key: str) -> Any:
+        """读取条目，未命中返回 MISSING"""
+        return self._cache.get(key, MISSING)
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        """写入条目"""
+        self._cache.set(key, value, ttl)
+
+    def get_versions(self, namespaces: List[str]) -> List[int]:
+        """批量读取命名空间版本号，不存在时初始化"""
+        keys = [self._version_key(ns) for ns in namespaces]
+        found = self._cache.get_many(keys)
+        missing = {key: self._initial_version() for key in keys if key not in found}
+        for key, version in missing.items():
+            # add 保证并发初始化时只有一个值生效
+            if not self._cache.add(key, version, None):
+                version = self._cache.get(key, version)
+            found[key] = version
+        return [found[key] for key in keys]
+
+    def bump(self, namespace: str) -> None:
+        """递增命名空间版本号"""
+        key = self._version_key(namespace)
+        try:
+            self._cache.incr(key)
+        except ValueError:
+            self._cache.add(key, self._initial_version(), None)
+
+    def size(self) -> Optional[int]:
+        """共享缓存无法统计条目数"""
+        return None
+
+
+BACKENDS = {
+    LocMemBackend.name: LocMemBackend,
+    DjangoCacheBackend.name: DjangoCacheBackend,
+}
+
+
+class ResponseCache:
+    """
+    带命名空间版本号的响应缓存
+    缓存键包含相关命名空间的当前版本号，写路径递增版本号即可让旧条目失效，无需清空整个缓存
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        backend_cls = BACKENDS.get(config['BACKEND'])
+        self.backend = backend_cls(config) if backend_cls else None
+        self._stats = {'hits': 0, 'misses': 0, 'bumps': 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """是否启用缓存"""
+        return self.backend is not None and self.config['TTL'] > 0
+
+    def _count(self, stat: str) -> None:
+        """累加统计项"""
+        with self._stats_lock:
+            self._stats[stat] += 1
+
+    def make_key(self, request, namespaces: List[str]) -> str:
+        """
+        由请求路径、查询参数和命名空间版本号生成缓存键
+        :param request: Request
+        :param namespaces: 命名空间列表
+        :return: str
+        """
+        versions = self.backend.get_versions(namespaces)
+        query = '&'.join(f'{k}={v}' for k, v in sorted(request.GET.items()))
+        stamp = ','.join(f'{ns}@{v}' for ns, v in zip(namespaces, versions))
+        digest = hashlib.md5(f'{request.path}?{query}|{stamp}'.encode('utf-8')).hexdigest()
+        return f"{self.config['KEY_PREFIX']}:{digest}"
+
+    def get(self, key: str) -> Any:
+        """
+        读取缓存并记录命中情况
+        :param key: 缓存键
+        :return: 缓存值，未命中返回 MISSING
+        """
+        value = self.backend.get(key)
+        self._count('misses' if value is MISSING else 'hits')
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        写入缓存
+        :param key: 缓存键
+        :param value: 值
+        :param ttl: 过期秒数，默认使用配置
+        :return: None
+        """
+        self.backend.set(key, value, ttl or self.config['TTL'])
+
+    def bump(self, *namespaces: str) -> None:
+        """
+        递增命名空间版本号，使其下的缓存全部失效
+        :param namespaces: 命名空间
+        :return: None
+        """
+        if not self.enabled:
+            return
+        for namespace in namespaces:
+            self.backend.bump(namespace)
+            self._count('bumps')
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        当前进程的命中统计
+        :return: dict
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hitRate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        stats['backend'] = self.config['BACKEND']
+        stats['entries'] = self.backend.size() if self.backend else 0
+        return stats
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    获取按 settings.RESPONSE_CACHE 创建的全局缓存实例
+    :return: ResponseCache
+    """
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                _instance = ResponseCache({**DEFAULT_CONFIG, **getattr(settings, 'RESPONSE_CACHE', {})})
+    return _instance
+
+
+def bump(*namespaces: str) -> None:
+    """
+    递增命名空间版本号（写路径调用）
+    :param namespaces: 命名空间
+    :return: None
+    """
+    get_response_cache().bump(*namespaces)
+
+
+def cache_response(*namespaces: Union[str, Callable[[Any], str]], conditional: bool = True) -> Callable:
+    """
+    缓存 APIView 方法返回的 200 响应数据
+    conditional 为 True 时按响应数据生成 ETag，并处理条件请求（命中缓存时无需访问数据库即可返回 304）
+    :param namespaces: 命名空间，可以是字符串或接收 request 返回字符串的函数
+    :param conditional: 是否处理 ETag 条件请求
+    :return: 装饰器
+    """
+
+    def respond(request, data: Any, etag: Optional[str]):
+        """按缓存的数据与 ETag 构造响应"""
+        if etag:
+            etag = representation_etag(request, etag)
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+        response = Response(data)
+        if etag:
+            set_validators(response, etag)
+        return response
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            cache = get_response_cache()
+            use_cache = cache.enabled and request.method == 'GET'
+            key = None
+            if use_cache:
+                names = [ns(request) if callable(ns) else ns for ns in namespaces]
+                key = cache.make_key(request, names)
+                cached = cache.get(key)
+                if cached is not MISSING:
+                    return respond(request, *cached)
+
+            response = method(view, request, *args, **kwargs)
+            if response.status_code != 200 or not isinstance(response, Response):
+                return response
+
+            etag = etag_for_data(response.data) if conditional else None
+            if use_cache and not replica_may_be_stale():
+                cache.set(key, (response.data, etag))
+            if etag:
+                etag = representation_etag(request, etag)
+                unchanged = not_modified(request, etag)
+                if unchanged is not None:
+                    return unchanged
+                set_validators(response, etag)
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def namespaces_for_post(post_id: Union[int, str]) -> Iterable[str]:
+    """
+    单篇文章写入后需要失效的命名空间
+    :param post_id: 文章 id
+    :return: 命名空间列表
+    """
+    return 'posts', f'post:{post_id}'